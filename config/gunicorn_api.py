@@ -0,0 +1,20 @@
+"""
+gunicorn settings for the API-only profile: `gunicorn -c config/gunicorn_api.py`.
+
+preload_app imports (and so warms) config.wsgi_api once in the master, and
+the workers fork from it.
+"""
+import multiprocessing
+import os
+
+wsgi_app = 'config.wsgi_api:application'
+preload_app = True
+bind = os.environ.get('GUNICORN_BIND', '127.0.0.1:8000')
+workers = int(os.environ.get('GUNICORN_WORKERS', '0')) or multiprocessing.cpu_count()
+
+
+def when_ready(server):
+    """Freeze the warmed heap, so the workers' garbage collector never writes to (and copies) its pages."""
+    import gc
+
+    gc.freeze()
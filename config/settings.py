@@ -48,6 +48,8 @@ MIDDLEWARE = [
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
+    'game.middleware.ServerTimingMiddleware',
+    'game.middleware.ScoringWeightsMiddleware',
 ]
 
 ROOT_URLCONF = 'config.urls'
@@ -81,6 +83,41 @@ DATABASES = {
 }
 
 
+# Node score cache (game/cache.py): in-process LRU size, and an optional
+# CACHES alias shared by all workers (e.g. memcached or redis)
+SCORE_CACHE_SIZE = int(os.environ.get('SCORE_CACHE_SIZE', '4096'))
+SCORE_CACHE_ALIAS = os.environ.get('SCORE_CACHE_ALIAS') or None
+
+# Cache lifetime (seconds) of GET /api/scores/<code>/ responses. Clients then
+# revalidate with the ETag, which changes with the scoring weights, so keep it
+# short: a hot-loaded weights file reaches clients once this runs out
+SCORES_HTTP_MAX_AGE = int(os.environ.get('SCORES_HTTP_MAX_AGE', '60'))
+
+# Per-stage Server-Timing headers and latency histograms (game/metrics.py),
+# served to METRICS_ALLOWED_IPS at /api/metrics/
+SCORING_METRICS_ENABLED = os.environ.get('SCORING_METRICS_ENABLED', 'False') == 'True'
+METRICS_ALLOWED_IPS = os.environ.get('METRICS_ALLOWED_IPS', '127.0.0.1,::1').split(',')
+
+# Process pool behind the async API (game/workers.py): worker processes
+# (default: CPU count) and requests admitted at once before answering 503
+# (default: twice the workers)
+SCORING_POOL_WORKERS = int(os.environ.get('SCORING_POOL_WORKERS', '0')) or None
+SCORING_POOL_QUEUE = int(os.environ.get('SCORING_POOL_QUEUE', '0')) or None
+
+# Tuned scoring weights (game/tuning.py), written by `manage.py tune_weights
+# --install` and reloaded by every process within a second of changing.
+# Hot reload is opt-in: unset (or without the file) the built-in defaults are
+# used, so a tuning run in a working tree never changes the golden scores.
+SCORING_WEIGHTS_PATH = os.environ.get('SCORING_WEIGHTS_PATH') or None
+
+# Multiplayer draft sessions (game/sessions.py): sessions kept in memory per
+# process, whether to snapshot them to the database so they survive eviction
+# and restarts, and seconds between keep-alive comments on idle event streams
+DRAFT_SESSION_LIMIT = int(os.environ.get('DRAFT_SESSION_LIMIT', '1000'))
+DRAFT_SESSION_SNAPSHOTS = os.environ.get('DRAFT_SESSION_SNAPSHOTS', 'False') == 'True'
+DRAFT_EVENTS_KEEPALIVE = int(os.environ.get('DRAFT_EVENTS_KEEPALIVE', '15'))
+
+
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
 
@@ -120,6 +157,16 @@ STATIC_ROOT = os.path.join(BASE_DIR, 'static_root') # Choose a simple, new direc
 STATICFILES_DIRS = (
     os.path.join(BASE_DIR, 'static'), # Assuming your images are in 'your_project/static/'
 )
+# Fingerprinted (and, for text, precompressed) by collectstatic; see game/assets.py
+STORAGES = {
+    'default': {
+        'BACKEND': 'django.core.files.storage.FileSystemStorage',
+    },
+    'staticfiles': {
+        'BACKEND': 'game.assets.CompressedManifestStaticFilesStorage',
+    },
+}
+
 # Default primary key field type
 # https://docs.djangoproject.com/en/5.2/ref/settings/#default-auto-field
 
@@ -0,0 +1,44 @@
+"""
+API-only settings: config/settings.py without the apps and middleware the
+scoring API never uses (admin, auth, sessions, messages, static files,
+CSRF and clickjacking protection; every API view is csrf_exempt and
+answers JSON). Served by config/wsgi_api.py, which warms the scoring engine
+before gunicorn forks its workers (see config/gunicorn_api.py).
+
+The board page still renders, but without static files, so serve it from a
+full-profile process.
+"""
+from .settings import *  # noqa: F401,F403
+
+INSTALLED_APPS = [
+    'game',
+]
+
+# API clients call exact URLs, so CommonMiddleware's slash redirects are not needed
+MIDDLEWARE = [
+    'django.middleware.security.SecurityMiddleware',
+    'game.middleware.ServerTimingMiddleware',
+    'game.middleware.ScoringWeightsMiddleware',
+]
+
+ROOT_URLCONF = 'config.urls_api'
+
+TEMPLATES = [
+    {
+        'BACKEND': 'django.template.backends.django.DjangoTemplates',
+        'DIRS': [],
+        'APP_DIRS': True,
+        'OPTIONS': {
+            'context_processors': [
+                'django.template.context_processors.request',
+            ],
+        },
+    },
+]
+
+WSGI_APPLICATION = 'config.wsgi_api.application'
+
+AUTH_PASSWORD_VALIDATORS = []
+
+# The API has no translated strings
+USE_I18N = False
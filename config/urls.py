@@ -14,10 +14,16 @@ Including another URLconf
     1. Import the include() function: from django.urls import include, path
     2. Add a URL to urlpatterns:  path('blog/', include('blog.urls'))
 """
+from django.conf import settings
 from django.contrib import admin
-from django.urls import path, include
+from django.urls import path, include, re_path
+
+from game.assets import serve_asset
 
 urlpatterns = [
     path('admin/', admin.site.urls),
+    # Collected static files, for deployments without a web server in front
+    # (runserver with DEBUG serves the source files before this is reached)
+    re_path(rf'^{settings.STATIC_URL.strip("/")}/(?P<path>.+)$', serve_asset, name='static_asset'),
     path('', include('game.urls'))
 ]
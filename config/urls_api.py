@@ -0,0 +1,9 @@
+"""
+URL configuration of the API-only profile (config/settings_api.py): the
+game URLs without the admin.
+"""
+from django.urls import include, path
+
+urlpatterns = [
+    path('', include('game.urls'))
+]
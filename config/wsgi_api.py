@@ -0,0 +1,23 @@
+"""
+WSGI config of the API-only profile (config/settings_api.py).
+
+Importing this module also warms the scoring engine (see game.warmup), so
+with gunicorn's --preload every forked worker starts with the warm state,
+shared copy-on-write:
+
+    gunicorn -c config/gunicorn_api.py
+"""
+
+import os
+
+from django.core.wsgi import get_wsgi_application
+
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings_api')
+
+application = get_wsgi_application()
+
+warm_up_seconds = 0.0
+if os.environ.get('SCORING_WARM_UP', 'True') == 'True':
+    from game.warmup import warm_up
+
+    warm_up_seconds = warm_up(application)
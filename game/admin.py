@@ -1,3 +1,10 @@
 from django.contrib import admin
 
-# Register your models here.
+from .models import Board
+
+
+@admin.register(Board)
+class BoardAdmin(admin.ModelAdmin):
+    list_display = ('code', 'name', 'max_production', 'resource_spread', 'created_at')
+    search_fields = ('code', 'name')
+    exclude = ('components',)
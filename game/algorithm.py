@@ -1,4 +1,15 @@
+import base64
+import hashlib
 import random
+from dataclasses import asdict, dataclass
+from functools import cached_property, lru_cache
+
+import numpy as np
+
+from .layouts import (
+    LAYOUTS, BoardLayout, coastal_ports, compile_layout, get_layout, hex_rows, layout_for_coords, register_layout,
+)
+from .metrics import stage
 
 # --- Constants ---
 
@@ -24,343 +35,874 @@ roll_dots = {
 }
 
 # NEW: Bonus for each *new* resource type a node offers
-DIVERSITY_BONUS = 2.5 
+DIVERSITY_BONUS = 2.5
+
+# Diminishing returns for stacking the same resource on one node
+DOUBLE_R_DIM = 0.90
+TRIPLE_R_DIM = 0.75
+
+# Flat bonus for any port, plus a bonus when the node produces the port's resource
+PORT_INCREASE = 1.0
+SAME_RESOURCE_BONUS = 1.0
+
+# Node → port type
+port_map = {
+    2:"3:1", 3:"3:1",
+    5:"3:1", 6:"3:1",
+    15:"wheat", 25:"wheat",
+    36:"wood", 46:"wood",
+    52:"3:1", 53:"3:1",
+    50:"sheep", 49:"sheep",
+    48:"3:1", 47:"3:1",
+    38:"brick", 28:"brick",
+    17:"ore", 7:"ore"
+}
+
+# --- Board Topology ---
+#
+# Topology is compiled from axial hex coordinates (see game/layouts.py).
+# Hexes are numbered row by row; on the standard 3-4-5-4-3 layout:
+#
+#          0   1   2
+#        3   4   5   6
+#      7   8   9  10  11
+#       12  13  14  15
+#         16  17  18
+#
+# The 5-6 player board adds a row of six hexes in the middle (3-4-5-6-5-4-3,
+# 30 hexes), and a board_data list whose cells carry q/r coordinates is
+# scored on whatever map those coordinates describe.
+STANDARD_LAYOUT = register_layout(compile_layout("standard", hex_rows((3, 4, 5, 4, 3)), port_map))
+EXPANSION_LAYOUT = register_layout(compile_layout(
+    "expansion", hex_rows((3, 4, 5, 6, 5, 4, 3)),
+    coastal_ports(hex_rows((3, 4, 5, 6, 5, 4, 3)),
+                  ("3:1", "wheat", "3:1", "ore", "sheep", "3:1", "wood", "brick", "3:1", "sheep", "3:1")),
+))
+
+# Standard base-game tile and number-token mix
+BOARD_RESOURCES = ["wood"] * 4 + ["sheep"] * 4 + ["wheat"] * 4 + ["brick"] * 3 + ["ore"] * 3 + ["desert"]
+BOARD_ROLLS = [2, 3, 3, 4, 4, 5, 5, 6, 6, 8, 8, 9, 9, 10, 10, 11, 11, 12]
+
+# 5-6 player extension mix (30 hexes)
+EXPANSION_RESOURCES = ["wood"] * 6 + ["sheep"] * 6 + ["wheat"] * 6 + ["brick"] * 5 + ["ore"] * 5 + ["desert"] * 2
+EXPANSION_ROLLS = [2, 2, 12, 12] + [roll for roll in (3, 4, 5, 6, 8, 9, 10, 11) for _ in range(3)]
+
+# The original cellListDict listed two standard nodes' hexes out of order.
+# Hex order shows in the resource summaries, so those nodes keep it.
+_LEGACY_HEX_ORDER = {21: (5, 4, 9), 45: (18, 15)}
+STANDARD_LAYOUT.node_hexes = tuple(
+    _LEGACY_HEX_ORDER.get(node, hexes) for node, hexes in enumerate(STANDARD_LAYOUT.node_hexes)
+)
+
+# Module-level topology of the standard board
+HEX_COORDS = STANDARD_LAYOUT.hex_coords
+HEX_COUNT = STANDARD_LAYOUT.hex_count
+NODE_HEXES = STANDARD_LAYOUT.node_hexes
+NODE_COUNT = STANDARD_LAYOUT.node_count
+NODE_VERTICES = STANDARD_LAYOUT.node_vertices
+NODE_HEX_INDEX = STANDARD_LAYOUT.node_hex_index
+SYMMETRIES = STANDARD_LAYOUT.symmetries
+NODE_NEIGHBORS = STANDARD_LAYOUT.node_neighbors
+NODE_BLOCK_MASKS = STANDARD_LAYOUT.node_block_masks
+
+# Resource order used by every array below; desert is always last.
+RESOURCES = ("brick", "wood", "ore", "wheat", "sheep", "desert")
+RESOURCE_INDEX = {resource: i for i, resource in enumerate(RESOURCES)}
+DESERT = RESOURCE_INDEX["desert"]
+
+# One bit per producing resource (desert has no bit)
+RESOURCE_BITS = np.array([1 << i if r != "desert" else 0 for i, r in enumerate(RESOURCES)], dtype=np.int64)
+RESOURCE_VALUE_ARRAY = np.array([resource_values[r] for r in RESOURCES], dtype=np.float64)
+ROLL_DOTS_ARRAY = np.array([roll_dots.get(roll, 0) for roll in range(13)], dtype=np.int64)
+POPCOUNT = np.array([bin(i).count("1") for i in range(1 << DESERT)], dtype=np.int64)
+# resource bitmask → resource names, in RESOURCES order
+MASK_RESOURCES = tuple(tuple(r for i, r in enumerate(RESOURCES[:DESERT]) if mask >> i & 1) for mask in range(1 << DESERT))
+
+
+@lru_cache(maxsize=64)
+def port_bits(layout: BoardLayout) -> np.ndarray:
+    """(node_count,) bit of the resource each node's port trades (0 for 3:1 and no port)."""
+    return np.array([1 << RESOURCE_INDEX[port] if port in RESOURCE_INDEX else 0 for port in layout.ports],
+                    dtype=np.int64)
+
+
+NODE_PORTS = STANDARD_LAYOUT.ports
+NODE_HAS_PORT = STANDARD_LAYOUT.node_has_port
+NODE_PORT_BONUS = NODE_HAS_PORT * PORT_INCREASE
+NODE_PORT_BITS = port_bits(STANDARD_LAYOUT)
+
+
+def layout_of(board_data) -> BoardLayout:
+    """
+    The layout board_data is laid out on: the map its cells' q/r coordinates
+    describe when they carry them, else the standard or 5-6 player board by
+    hex count. Raises ValueError for anything else.
+    """
+    if board_data and "q" in board_data[0]:
+        try:
+            return layout_for_coords((cell["q"], cell["r"]) for cell in board_data)
+        except (KeyError, TypeError) as e:
+            raise ValueError(f"Every hex needs q and r coordinates ({e})") from None
+    for layout in (STANDARD_LAYOUT, EXPANSION_LAYOUT):
+        if len(board_data) == layout.hex_count:
+            return layout
+    raise ValueError(
+        f"Board must have {STANDARD_LAYOUT.hex_count} or {EXPANSION_LAYOUT.hex_count} hexes, "
+        "or q/r coordinates on every hex"
+    )
+
+
+def default_layout(hex_count: int = None, node_count: int = None) -> BoardLayout:
+    """The standard or 5-6 player layout for arrays of this many hexes (or nodes)."""
+    for layout in (STANDARD_LAYOUT, EXPANSION_LAYOUT):
+        if layout.hex_count == hex_count or layout.node_count == node_count:
+            return layout
+    raise ValueError("Arrays for a custom layout need that layout passed explicitly")
+
+
+# --- Scoring Weights ---
+
+# Tunable weights, in the order of ScoringWeights.as_vector()
+WEIGHT_PARAMETERS = RESOURCES[:DESERT] + (
+    "diversity_bonus", "double_r_dim", "triple_r_dim", "port_increase", "same_resource_bonus",
+)
+
+
+@dataclass(frozen=True)
+class ScoringWeights:
+    """
+    Every tunable number of the scoring engine. The module constants above
+    are the defaults (DEFAULT_WEIGHTS); scoring functions take a weights
+    argument and fall back to active_weights().
+    """
+    resource_values: tuple = tuple(resource_values[r] for r in RESOURCES[:DESERT])
+    diversity_bonus: float = DIVERSITY_BONUS
+    double_r_dim: float = DOUBLE_R_DIM
+    triple_r_dim: float = TRIPLE_R_DIM
+    port_increase: float = PORT_INCREASE
+    same_resource_bonus: float = SAME_RESOURCE_BONUS
+
+    def __post_init__(self):
+        if len(self.resource_values) != DESERT:
+            raise ValueError(f"resource_values needs {DESERT} values, in the order {', '.join(RESOURCES[:DESERT])}")
+        object.__setattr__(self, "resource_values", tuple(float(v) for v in self.resource_values))
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "ScoringWeights":
+        """Weights from to_dict() output; missing entries keep their defaults."""
+        data = dict(data)
+        values = data.pop("resource_values", None)
+        unknown = set(data) - set(WEIGHT_PARAMETERS[DESERT:])
+        if unknown:
+            raise ValueError(f"Unknown weight(s): {', '.join(sorted(unknown))}")
+        if isinstance(values, dict):
+            unknown = set(values) - set(RESOURCES[:DESERT])
+            if unknown:
+                raise ValueError(f"Unknown resource(s): {', '.join(sorted(unknown))}")
+            defaults = dict(zip(RESOURCES, cls.resource_values))
+            values = tuple(values.get(r, defaults[r]) for r in RESOURCES[:DESERT])
+        kwargs = {name: float(value) for name, value in data.items()}
+        if values is not None:
+            kwargs["resource_values"] = values
+        return cls(**kwargs)
+
+    def to_dict(self) -> dict:
+        data = asdict(self)
+        data["resource_values"] = dict(zip(RESOURCES, self.resource_values))
+        return data
+
+    @classmethod
+    def from_vector(cls, vector) -> "ScoringWeights":
+        vector = [float(v) for v in vector]
+        return cls(tuple(vector[:DESERT]), *vector[DESERT:])
+
+    def as_vector(self) -> tuple:
+        """Weights as a flat tuple in WEIGHT_PARAMETERS order."""
+        return self.resource_values + tuple(getattr(self, name) for name in WEIGHT_PARAMETERS[DESERT:])
+
+    @cached_property
+    def resource_value_array(self) -> np.ndarray:
+        """Value per RESOURCES index (desert is always 0)."""
+        return np.array(self.resource_values + (0.0,), dtype=np.float64)
+
+    @cached_property
+    def fingerprint(self) -> str:
+        return hashlib.sha256(repr(self.as_vector()).encode()).hexdigest()[:16]
+
+    @cached_property
+    def production_fingerprint(self) -> str:
+        """Hash of the weights production_scores() uses (ports and diversity are applied later)."""
+        production = self.resource_values + (self.double_r_dim, self.triple_r_dim)
+        return hashlib.sha256(repr(production).encode()).hexdigest()[:16]
+
+
+DEFAULT_WEIGHTS = ScoringWeights()
+_active_weights = DEFAULT_WEIGHTS
+
+
+def active_weights() -> ScoringWeights:
+    """Weights used when a scoring call doesn't pass its own."""
+    return _active_weights
+
+
+def set_active_weights(weights: ScoringWeights = None):
+    """Swap the process-wide weights (None restores DEFAULT_WEIGHTS)."""
+    global _active_weights
+    _active_weights = weights or DEFAULT_WEIGHTS
+
+
+# --- Board Encoding ---
+
+def _normalize_roll(roll) -> int:
+    """Rolls without a dot value (None, 7, unknown) score exactly like 0."""
+    return int(roll) if roll_dots.get(roll, 0) else 0
+
+
+# Dotted roll → itself; _DOTTED_ROLLS.get(roll, 0) == _normalize_roll(roll)
+_DOTTED_ROLLS = {roll: roll for roll, dots in roll_dots.items() if dots}
+
+
+def _encode_lists(board_data: list, hex_count: int) -> tuple:
+    cells = [board_data[i] for i in range(hex_count)]
+    return (
+        [RESOURCE_INDEX[cell["resource"]] for cell in cells],
+        [_DOTTED_ROLLS.get(cell.get("roll", 0), 0) for cell in cells],
+    )
+
+
+def encode_board(board_data: list, layout: BoardLayout = None) -> tuple:
+    """
+    Convert board_data into (resources, rolls) integer arrays of length
+    hex_count of its layout (layout_of(board_data) unless given).
+    Raises KeyError for unknown resources, like the scorer always has.
+    """
+    layout = layout or layout_of(board_data)
+    resources, rolls = _encode_lists(board_data, layout.hex_count)
+    return np.array(resources, dtype=np.int64), np.array(rolls, dtype=np.int64)
+
+
+def encode_boards(boards: list, layout: BoardLayout = None) -> tuple:
+    """
+    Stack many board_data lists into (B, hex_count) resource and roll arrays.
+    Every board must be on `layout` (default: the first board's layout).
+    """
+    if layout is None:
+        layout = layout_of(boards[0]) if boards else STANDARD_LAYOUT
+    encoded = []
+    for board_data in boards:
+        if layout_of(board_data) is not layout:
+            raise ValueError(f"Every board in the batch must be on the {layout.name} layout")
+        encoded.append(_encode_lists(board_data, layout.hex_count))
+    resources = np.array([r for r, _ in encoded], dtype=np.int64).reshape(len(boards), layout.hex_count)
+    rolls = np.array([x for _, x in encoded], dtype=np.int64).reshape(len(boards), layout.hex_count)
+    return resources, rolls
+
+
+def group_by_layout(boards) -> dict:
+    """{layout: [index, ...]} for board_data lists, so mixed batches can be scored per layout."""
+    groups = {}
+    for index, board_data in enumerate(boards):
+        groups.setdefault(layout_of(board_data), []).append(index)
+    return groups
+
+
+# --- Board Codes ---
+
+# A board code packs every hex's (resource, roll) pair into one mixed-radix
+# integer, resource * 13 + roll per hex, hex 0 least significant. On the
+# standard board that integer fits in 15 bytes, which is 20 URL-safe base64
+# characters. The JS twin lives in game/static/game/index.js.
+#
+# Other registered layouts prefix their name, e.g. "expansion.<32 chars>";
+# unregistered (custom) layouts have no codes.
+_ROLL_RADIX = 13
+_HEX_RADIX = len(RESOURCES) * _ROLL_RADIX
+BOARD_CODE_BYTES = 15
+BOARD_CODE_LENGTH = BOARD_CODE_BYTES * 4 // 3
+_BOARD_CODE_ALPHABET = "ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789-_"
+_BOARD_CODE_DIGITS = {c: i for i, c in enumerate(_BOARD_CODE_ALPHABET)}
+_CODE_PART = 10  # hexes per int64 part of a code (_HEX_RADIX ** 10 < 2 ** 63)
+
+
+@lru_cache(maxsize=64)
+def board_code_bytes(hex_count: int) -> int:
+    """Bytes in the code of a board with this many hexes (a multiple of 3, so base64 needs no padding)."""
+    bits = (_HEX_RADIX ** hex_count - 1).bit_length()
+    return -(-bits // 24) * 3
+
+
+def _code_prefix(layout: BoardLayout) -> str:
+    if LAYOUTS.get(layout.name) is not layout:
+        raise ValueError("Only registered board layouts have board codes")
+    return "" if layout is STANDARD_LAYOUT else layout.name + "."
+
+
+def board_codes(resources: np.ndarray, rolls: np.ndarray, layout: BoardLayout = None) -> list:
+    """Board codes for (B, hex_count) resource and roll arrays."""
+    layout = layout or default_layout(resources.shape[1])
+    prefix = _code_prefix(layout)
+    size = board_code_bytes(layout.hex_count)
+    cells = resources * _ROLL_RADIX + rolls
+    # int64 parts of _CODE_PART hexes (hex 0 least significant), joined as Python ints
+    starts = range(0, layout.hex_count, _CODE_PART)
+    parts = []
+    for start in starts:
+        block = cells[:, start:start + _CODE_PART]
+        parts.append((block @ (_HEX_RADIX ** np.arange(block.shape[1], dtype=np.int64))).tolist())
+    shifts = [_HEX_RADIX ** start for start in starts]
+    # The alphabet is the base64url one, and a multiple of 3 bytes encodes with no padding
+    return [
+        prefix + base64.urlsafe_b64encode(sum(p * s for p, s in zip(row, shifts)).to_bytes(size, "big")).decode()
+        for row in zip(*parts)
+    ]
+
+
+def board_code(resources, rolls, layout: BoardLayout = None) -> str:
+    """Board code for one board's (resources, rolls) arrays (see encode_board)."""
+    return board_codes(np.asarray(resources)[None], np.asarray(rolls)[None], layout)[0]
+
+
+def encode_board_code(board_data: list) -> str:
+    """Compact, URL-safe code for board_data. Boards that score alike share a code."""
+    layout = layout_of(board_data)
+    return board_code(*encode_board(board_data, layout), layout)
+
+
+def decode_board_code(code: str) -> list:
+    """
+    board_data ({resource, roll, index} dicts) for a board code. Hexes of a
+    layout other than the standard one also carry their q/r coordinates.
+    Raises ValueError for anything encode_board_code() cannot produce.
+    """
+    name, _, digits = code.rpartition(".")
+    layout = get_layout(name) if name else STANDARD_LAYOUT
+    if name and layout is STANDARD_LAYOUT:
+        raise ValueError("Standard board codes have no layout prefix")
+    length = board_code_bytes(layout.hex_count) * 4 // 3
+    if len(digits) != length:
+        raise ValueError(f"Board code must be {length} characters")
+    value = 0
+    for c in digits:
+        digit = _BOARD_CODE_DIGITS.get(c)
+        if digit is None:
+            raise ValueError(f"Invalid board code character {c!r}")
+        value = value * 64 + digit
+
+    board_data = []
+    for h in range(layout.hex_count):
+        value, cell = divmod(value, _HEX_RADIX)
+        resource, roll = divmod(cell, _ROLL_RADIX)
+        if _normalize_roll(roll) != roll:
+            raise ValueError(f"Invalid roll {roll} in board code")
+        board_data.append({"resource": RESOURCES[resource], "roll": roll or None, "index": h})
+        if layout is not STANDARD_LAYOUT:
+            board_data[-1]["q"], board_data[-1]["r"] = layout.hex_coords[h]
+    if value:
+        raise ValueError("Board code is out of range")
+    return board_data
+
+
+def scoring_fingerprint(weights: ScoringWeights = None) -> str:
+    """Short hash of every scoring input; it changes whenever scores for a board code could."""
+    weights = weights or active_weights()
+    layouts = sorted((name, layout.hex_coords, layout.ports) for name, layout in LAYOUTS.items())
+    inputs = (weights.as_vector(), roll_dots, layouts)
+    return hashlib.sha256(repr(inputs).encode()).hexdigest()[:16]
+
+
+def needed_resource_bits(player_resources) -> int:
+    """
+    Bitmask of resources that earn DIVERSITY_BONUS for this player.
+    Empty/None player_resources means no bonus at all (not "everything is new").
+    """
+    if not player_resources:
+        return 0
+    bits = 0
+    for i, resource in enumerate(RESOURCES[:DESERT]):
+        if resource not in player_resources:
+            bits |= 1 << i
+    return bits
+
+
+# --- Batched Scoring Engine ---
+
+def _pad(array: np.ndarray, value: int) -> np.ndarray:
+    """Append the sentinel hex column used by node_hex_index padding."""
+    hex_count = array.shape[1]
+    padded = np.empty((array.shape[0], hex_count + 1), dtype=array.dtype)
+    padded[:, :hex_count] = array
+    padded[:, hex_count] = value
+    return padded
+
+
+def node_production(node_res: np.ndarray, node_dots: np.ndarray, weights: ScoringWeights) -> np.ndarray:
+    """
+    Production score from each node's three (resource, dots) pairs: dots ×
+    resource value, with double_r_dim / triple_r_dim applied to repeated
+    resources.
+
+    node_res, node_dots: (..., 3) integer arrays (missing hexes are desert)
+    returns: (...) float64
+
+    Terms are summed in the same order the per-node scorer used, so the
+    results are bit-for-bit identical to it.
+    """
+    prod = node_dots * weights.resource_value_array[node_res]
+
+    land = node_res != DESERT
+    same01 = land[..., 0] & (node_res[..., 0] == node_res[..., 1])
+    same02 = land[..., 0] & (node_res[..., 0] == node_res[..., 2])
+    same12 = land[..., 1] & (node_res[..., 1] == node_res[..., 2])
+    triple = same01 & same02
+
+    first, second, third = prod[..., 0], prod[..., 1], prod[..., 2]
+    for pair, (i, j, k) in ((same01, (0, 1, 2)), (same02, (0, 2, 1)), (same12, (1, 2, 0))):
+        pair = pair & ~triple
+        high = np.maximum(prod[..., i], prod[..., j])
+        low = np.minimum(prod[..., i], prod[..., j])
+        first = np.where(pair, high, first)
+        second = np.where(pair, low * weights.double_r_dim, second)
+        third = np.where(pair, prod[..., k], third)
+
+    ranked = np.sort(prod, axis=-1)
+    first = np.where(triple, ranked[..., 2], first)
+    second = np.where(triple, ranked[..., 1] * weights.double_r_dim, second)
+    third = np.where(triple, ranked[..., 0] * weights.triple_r_dim, third)
+
+    return first + second + third
+
+
+def production_scores(resources: np.ndarray, rolls: np.ndarray, weights: ScoringWeights = None,
+                      layout: BoardLayout = None) -> np.ndarray:
+    """
+    Port- and player-independent score of every node (see node_production).
+
+    resources, rolls: (B, hex_count) integer arrays
+    layout: (optional) default default_layout(hex_count)
+    returns: (B, node_count) float64
+    """
+    node_hex_index = (layout or default_layout(resources.shape[1])).node_hex_index
+    node_res = _pad(resources, DESERT)[:, node_hex_index]
+    node_dots = ROLL_DOTS_ARRAY[_pad(rolls, 0)][:, node_hex_index]
+    return node_production(node_res, node_dots, weights or active_weights())
+
+
+def node_resource_masks(resources: np.ndarray, layout: BoardLayout = None) -> np.ndarray:
+    """(B, hex_count) resources → (B, node_count) bitmask of resources each node produces."""
+    node_hex_index = (layout or default_layout(resources.shape[1])).node_hex_index
+    bits = RESOURCE_BITS[_pad(resources, DESERT)][:, node_hex_index]
+    return bits[..., 0] | bits[..., 1] | bits[..., 2]
+
+
+def node_number_masks(resources: np.ndarray, rolls: np.ndarray, layout: BoardLayout = None) -> np.ndarray:
+    """(B, hex_count) boards → (B, node_count) bitmask (1 << roll) of numbers each node produces on."""
+    node_hex_index = (layout or default_layout(resources.shape[1])).node_hex_index
+    numbered = np.where((resources != DESERT) & (rolls > 0), np.left_shift(1, rolls), 0)
+    bits = _pad(numbered, 0)[:, node_hex_index]
+    return bits[..., 0] | bits[..., 1] | bits[..., 2]
+
+
+def port_scores(production: np.ndarray, masks: np.ndarray, weights: ScoringWeights = None,
+                layout: BoardLayout = None) -> np.ndarray:
+    """Add port_increase and the matching-resource same_resource_bonus to production scores."""
+    weights = weights or active_weights()
+    layout = layout or default_layout(node_count=production.shape[-1])
+    matched = np.where(masks & port_bits(layout), weights.same_resource_bonus, 0.0)
+    return production + layout.node_has_port * weights.port_increase + matched
+
+
+def diversity_scores(base: np.ndarray, masks: np.ndarray, needed_bits, weights: ScoringWeights = None) -> np.ndarray:
+    """
+    Add diversity_bonus for every needed resource a node produces.
+    needed_bits: int or (B,) array from needed_resource_bits()
+    """
+    weights = weights or active_weights()
+    needed_bits = np.asarray(needed_bits, dtype=np.int64).reshape(-1, 1)
+    return base + POPCOUNT[masks & needed_bits] * weights.diversity_bonus
+
+
+def score_boards(resources: np.ndarray, rolls: np.ndarray, needed_bits=0, weights: ScoringWeights = None,
+                 layout: BoardLayout = None) -> np.ndarray:
+    """
+    Score every node of B boards in one pass.
+
+    resources, rolls: (B, hex_count) arrays from encode_boards()
+    needed_bits: int or (B,) array from needed_resource_bits()
+    layout: (optional) default default_layout(hex_count)
+    returns: (B, node_count) float64 unrounded scores
+    """
+    weights = weights or active_weights()
+    layout = layout or default_layout(resources.shape[1])
+    masks = node_resource_masks(resources, layout)
+    base = port_scores(production_scores(resources, rolls, weights, layout), masks, weights, layout)
+    return diversity_scores(base, masks, needed_bits, weights)
+
+
+# --- Description Layer ---
+#
+# Descriptions are assembled from DESCRIPTION_TEMPLATES. A node's text depends
+# only on its cells' (resource, roll) pairs, its port and which of its
+# resources the player still needs, so the sentences are memoized on exactly
+# that and every repeated node shape across boards and turns is a cache hit.
+
+DESCRIPTION_TEMPLATES = {
+    "no_production": "No production.",
+    "no_production_port": "No production. Offers {port} port access.",
+    "excellent": "Excellent Numbers: Touches two high-prob tiles ({resources}).",
+    "strong": "Strong Production: Built on {resources} with a 6 or 8.",
+    "good": "Good Production: Solid mid-range numbers on {resources}.",
+    "modest": "Modest Production: Relies on {resources}.",
+    "diverse": "PRO: High resource diversity.",
+    "one_resource": "CON: Relies heavily on one resource.",
+    "port_synergy": "PRO: Excellent {port} port synergy!",
+    "generic_port": "PRO: Valuable 3:1 port access.",
+    "port_access": "PRO: Access to {port} port.",
+    "risky": "CON: Risky, relies on {low} low-prob number(s).",
+    "strategic_fit": "STRATEGIC FIT: Offers needed {needed}.",
+}
+
+HIGH_ROLLS = (6, 8)
+MID_ROLLS = (5, 9, 4, 10)
+LOW_ROLLS = (2, 3, 11, 12)
+
+
+class Cell:
+    def __init__(self, resource: str, roll: int):
+        self.resource = resource
+        self.roll = roll
+
+    def getDotValue(self) -> int:
+        return roll_dots.get(self.roll, 0)
+
+    def __str__(self) -> str:
+        return f"{self.resource}, {self.roll}"
+
+
+def initializeCells(cellData: list) -> list:
+    """Initialize the flat list of cells from board data"""
+    cells = []
+    for i in range(layout_of(cellData).hex_count):
+        resource = cellData[i]["resource"]
+        roll = cellData[i].get("roll", 0)
+        if roll is None:
+            roll = 0
+        cells.append(Cell(resource, roll))
+    return cells
+
+
+def _production_stats(cells: tuple) -> dict:
+    """Dot total, high/mid/low number counts and distinct resources of (resource, roll) cells."""
+    stats = {"dots": 0, "high": 0, "mid": 0, "low": 0, "unique": set()}
+    for resource, roll in cells:
+        if resource == 'desert':
+            continue
+
+        stats["unique"].add(resource)
+        stats["dots"] += roll_dots.get(roll, 0)
+
+        if roll in HIGH_ROLLS: stats["high"] += 1
+        elif roll in MID_ROLLS: stats["mid"] += 1
+        elif roll in LOW_ROLLS: stats["low"] += 1
+
+    stats["unique_count"] = len(stats["unique"])
+    return stats
+
+
+@lru_cache(maxsize=65536)
+def resource_summary(cells: tuple) -> str:
+    """Human-readable summary of the resources on (resource, roll) cells, e.g. "Wood (x2), Ore"."""
+    resource_counts = {}
+    for resource, _ in cells:
+        if resource != 'desert':
+            r = resource.capitalize()
+            resource_counts[r] = resource_counts.get(r, 0) + 1
+
+    if not resource_counts:
+        return "Desert location"
+
+    return ", ".join(f"{r} (x{count})" if count > 1 else r for r, count in resource_counts.items())
+
+
+@lru_cache(maxsize=65536)
+def _base_sentences(cells: tuple, port: str) -> tuple:
+    """
+    Player-independent description sentences for a node, and whether the
+    player-dependent STRATEGIC FIT sentence may follow them.
+    """
+    stats = _production_stats(cells)
+    templates = DESCRIPTION_TEMPLATES
+
+    if stats["dots"] == 0:
+        if port:
+            return (templates["no_production_port"].format(port=port.capitalize()),), False
+        return (templates["no_production"],), False
+
+    sentences = []
+    resources = resource_summary(cells)
+
+    # 1. Overall Production Rating
+    if stats["high"] >= 2:
+        sentences.append(templates["excellent"].format(resources=resources))
+    elif stats["high"] == 1:
+        sentences.append(templates["strong"].format(resources=resources))
+    elif stats["mid"] >= (1 + stats["low"]):  # e.g., (5,9) > (2)
+        sentences.append(templates["good"].format(resources=resources))
+    else:
+        sentences.append(templates["modest"].format(resources=resources))
+
+    # 2. Resource Diversity (Node-level)
+    if stats["unique_count"] == 3:
+        sentences.append(templates["diverse"])
+    elif stats["unique_count"] == 1 and len(cells) > 1:
+        sentences.append(templates["one_resource"])
+
+    # 3. Port Bonus
+    if port:
+        if any(resource in port for resource, _ in cells if resource != 'desert'):
+            sentences.append(templates["port_synergy"].format(port=port.capitalize()))
+        elif port == '3:1':
+            sentences.append(templates["generic_port"])
+        else:
+            # e.g., A wood port on a brick/sheep node
+            sentences.append(templates["port_access"].format(port=port.capitalize()))
+
+    # 4. Cons (Low Numbers)
+    if stats["low"] > 0 and stats["high"] == 0:
+        sentences.append(templates["risky"].format(low=stats["low"]))
+
+    return tuple(sentences), True
+
+
+def new_resources(cells: tuple, player_resources) -> tuple:
+    """Resources on (resource, roll) cells the player does not have yet, in cell order."""
+    if not player_resources:
+        return ()
+    return tuple(dict.fromkeys(
+        resource for resource, _ in cells
+        if resource not in player_resources and resource != "desert"
+    ))
+
+
+@lru_cache(maxsize=65536)
+def node_description(cells: tuple, port: str, needed: tuple = ()) -> str:
+    """
+    Strategic description of a node from its (resource, roll) cells, its port
+    and the resources it offers that the player still needs (new_resources()).
+    """
+    sentences, fits = _base_sentences(cells, port)
+    if fits and needed:
+        # This is the most important info, add it last for emphasis.
+        needed_str = ", ".join(r.capitalize() for r in needed)
+        sentences += (DESCRIPTION_TEMPLATES["strategic_fit"].format(needed=needed_str),)
+    return " ".join(sentences)
+
+
+def node_cells(board_data: list, layout: BoardLayout = None) -> tuple:
+    """Every node's (resource, roll) cell tuple, the key the description layer is memoized on."""
+    layout = layout or layout_of(board_data)
+    hexes = []
+    for i in range(layout.hex_count):
+        roll = board_data[i].get("roll", 0)
+        hexes.append((board_data[i]["resource"], 0 if roll is None else roll))
+    return tuple(tuple(hexes[h] for h in node_hexes) for node_hexes in layout.node_hexes)
+
+
+class Node:
+    def __init__(self, node_num: int, cell_list: list, port_type: str = None):
+        self.nodeNum = node_num
+        self.cellList = cell_list
+        self.port = port_type
+
+        # These will be populated by getDescription()
+        self.new_resources_found = []
+        self.stats = {} # Will be filled by _analyze_production
+
+    def _cells(self) -> tuple:
+        return tuple((cell.resource, cell.roll) for cell in self.cellList)
+
+    def getResourceSummary(self) -> str:
+        """Generate a human-readable summary of resources at this node"""
+        return resource_summary(self._cells())
+
+    def _analyze_production(self) -> dict:
+        """Internal helper to get detailed stats for the description."""
+        return _production_stats(self._cells())
+
+    def _find_new_resources(self, player_resources: list) -> list:
+        """Resources on this node the player does not have yet (in cell order)."""
+        return list(new_resources(self._cells(), player_resources))
+
+    def getDescription(self, player_resources: list) -> str:
+        """Generate strategic description based on node's resources."""
+        self.stats = self._analyze_production()
+        self.new_resources_found = self._find_new_resources(player_resources)
+        return node_description(self._cells(), self.port, tuple(self.new_resources_found))
+
 
 # --- Main Function ---
 
-def calculate_node_scores(board_data, player_resources=None):
+def calculate_node_components(board_data, cache=None, weights: ScoringWeights = None) -> tuple:
     """
-    Calculates scores for all 54 nodes based on the provided board data.
-    
-    board_data: list of dicts with {resource, roll, index}
-    player_resources: (optional) list of strings of resources a player *already* has
-    returns: dict of {node_id: {score, description, resources}}
+    Player-independent part of every node's score.
+
+    returns: (base, masks) where base is the (node_count,) production + port
+    score and masks is the (node_count,) bitmask of resources each node
+    produces. A player's score is base + diversity_bonus per needed resource.
+    """
+    weights = weights or active_weights()
+    layout = layout_of(board_data)
+    resources, rolls = encode_board(board_data, layout)
+    if cache is not None:
+        production, masks = cache.components(resources, rolls, weights, layout)
+    else:
+        production = production_scores(resources[None], rolls[None], weights, layout)[0]
+        masks = node_resource_masks(resources[None], layout)[0]
+    return port_scores(production, masks, weights, layout), masks
+
+
+def rescore_nodes(board_data, player_resources, cache=None, weights: ScoringWeights = None) -> dict:
+    """
+    Scores only (no description layer) for one player's resources.
+    With a cache the base vector is reused, so this is O(node_count).
+    returns: dict of {node_id: score}
+    """
+    weights = weights or active_weights()
+    with stage("score"):
+        base, masks = calculate_node_components(board_data, cache, weights)
+        scores = diversity_scores(base, masks, needed_resource_bits(player_resources), weights)[0].tolist()
+    return {i: round(score, 1) for i, score in enumerate(scores)}
+
+
+# Per-node fields a scoring response can carry, in response order
+NODE_FIELDS = ("score", "base", "resource_set", "description", "resources")
+_TEXT_FIELDS = {"description", "resources"}
+
+
+def parse_fields(fields) -> tuple:
+    """NODE_FIELDS subset from a list or comma-separated string (None means all)."""
+    if fields is None:
+        return NODE_FIELDS
+    if isinstance(fields, str):
+        fields = [field for field in fields.split(",") if field]
+    if not fields:
+        raise ValueError("fields must name at least one column")
+    unknown = set(fields) - set(NODE_FIELDS)
+    if unknown:
+        raise ValueError(f"Unknown field(s): {', '.join(sorted(unknown))}")
+    return tuple(field for field in NODE_FIELDS if field in fields)
+
+
+def calculate_node_columns(board_data, player_resources=None, cache=None, fields=NODE_FIELDS,
+                           weights: ScoringWeights = None) -> dict:
+    """
+    Requested fields for all nodes as parallel node_count-long lists.
+
+    resource_set is given as each node's resource bitmask (bit i is
+    RESOURCES[i]). The description layer only runs when "description" or
+    "resources" is requested.
+    returns: dict of {field: list}
     """
     if player_resources is None:
         player_resources = []
+    weights = weights or active_weights()
+
+    # 1. Score every node in one batched pass (or take it from the cache)
+    with stage("score"):
+        base, masks = calculate_node_components(board_data, cache, weights)
+        columns = {}
+        if "score" in fields:
+            scores = diversity_scores(base, masks, needed_resource_bits(player_resources), weights)[0].tolist()
+            columns["score"] = [round(score, 1) for score in scores]
+        if "base" in fields:
+            columns["base"] = [round(score, 1) for score in base.tolist()]
+        if "resource_set" in fields:
+            columns["resource_set"] = masks.tolist()
+
+    # 2. Build the description layer (memoized per node shape)
+    if _TEXT_FIELDS.intersection(fields):
+        with stage("cells"):
+            cells = node_cells(board_data)
+            ports = layout_of(board_data).ports
+        with stage("describe"):
+            if "description" in fields:
+                columns["description"] = [
+                    node_description(cells[i], ports[i], new_resources(cells[i], player_resources))
+                    for i in range(len(cells))
+                ]
+            if "resources" in fields:
+                columns["resources"] = [resource_summary(node) for node in cells]
 
-    # --- Encapsulated Classes ---
-    
-    class Cell:
-        def __init__(self, resource: str, roll: int):
-            self.resource = resource
-            self.roll = roll
-
-        def getDotValue(self) -> int:
-            return roll_dots.get(self.roll, 0)
-        
-        def __str__(self) -> str:
-            return f"{self.resource}, {self.roll}"
-
-    def initializeCells(cellData: list) -> list:
-        """Initialize the cell grid from board data"""
-        cellGrid = [
-            [None, None, None],
-            [None, None, None, None],
-            [None, None, None, None, None],
-            [None, None, None, None],
-            [None, None, None]
-        ]
-        
-        cellDataIdx = 0
-        for rowIdx in range(5):
-            for cellIdx in range(len(cellGrid[rowIdx])):
-                resource = cellData[cellDataIdx]["resource"]
-                roll = cellData[cellDataIdx].get("roll", 0) 
-                if roll is None:
-                    roll = 0
-                cellGrid[rowIdx][cellIdx] = Cell(resource, roll)
-                cellDataIdx += 1
-        return cellGrid
-
-    class Node:
-        def __init__(self, node_num: int, cell_list: list, port_type: str = None):
-            self.nodeNum = node_num
-            self.cellList = cell_list
-            self.port = port_type
-            
-            # These will be populated by other methods
-            self.new_resources_found = [] 
-            self.stats = {} # Will be filled by _analyze_production
-        
-        def getResourceSummary(self) -> str:
-            """Generate a human-readable summary of resources at this node"""
-            resource_counts = {}
-            for cell in self.cellList:
-                if cell.resource != 'desert':
-                    r = cell.resource.capitalize()
-                    if r not in resource_counts:
-                        resource_counts[r] = 0
-                    resource_counts[r] += 1
-            
-            if not resource_counts:
-                return "Desert location"
-            
-            summary = []
-            for r, count in resource_counts.items():
-                if count > 1:
-                    summary.append(f"{r} (x{count})")
-                else:
-                    summary.append(r)
-            return ", ".join(summary)
-        
-        def _analyze_production(self) -> dict:
-            """Internal helper to get detailed stats *before* scoring."""
-            stats = {"dots": 0, "high": 0, "mid": 0, "low": 0, "unique": set()}
-            for cell in self.cellList:
-                if cell.resource == 'desert':
-                    continue
-                
-                stats["unique"].add(cell.resource)
-                stats["dots"] += cell.getDotValue()
-                
-                if cell.roll in [6, 8]: stats["high"] += 1
-                elif cell.roll in [5, 9, 4, 10]: stats["mid"] += 1
-                elif cell.roll in [2, 3, 11, 12]: stats["low"] += 1
-            
-            stats["unique_count"] = len(stats["unique"])
-            return stats
-
-        def getDescription(self, player_resources: list) -> str:
-            """
-            Generate strategic description based on node's resources.
-            MUST be called *after* calcCellScore() to have stats.
-            """
-            
-            # self.stats is populated by calcCellScore, which is called *before* this.
-            if not self.stats or self.stats["dots"] == 0:
-                if self.port:
-                    return f"No production. Offers {self.port.capitalize()} port access."
-                return "No production."
-
-            desc_parts = []
-            resources_str = self.getResourceSummary()
-
-            # 1. Overall Production Rating
-            if self.stats["high"] >= 2:
-                desc_parts.append(f"Excellent Numbers: Touches two high-prob tiles ({resources_str}).")
-            elif self.stats["high"] == 1:
-                desc_parts.append(f"Strong Production: Built on {resources_str} with a 6 or 8.")
-            elif self.stats["mid"] >= (1 + self.stats["low"]): # e.g., (5,9) > (2)
-                desc_parts.append(f"Good Production: Solid mid-range numbers on {resources_str}.")
-            elif self.stats["dots"] > 0:
-                desc_parts.append(f"Modest Production: Relies on {resources_str}.")
-
-            # 2. Resource Diversity (Node-level)
-            if self.stats["unique_count"] == 3:
-                desc_parts.append("PRO: High resource diversity.")
-            elif self.stats["unique_count"] == 1 and len(self.cellList) > 1:
-                desc_parts.append("CON: Relies heavily on one resource.")
-
-            # 3. Port Bonus
-            if self.port:
-                is_match = any(cell.resource in self.port for cell in self.cellList if cell.resource != 'desert')
-                if is_match:
-                    desc_parts.append(f"PRO: Excellent {self.port.capitalize()} port synergy!")
-                elif self.port == '3:1':
-                    desc_parts.append("PRO: Valuable 3:1 port access.")
-                else:
-                    # e.g., A wood port on a brick/sheep node
-                    desc_parts.append(f"PRO: Access to {self.port.capitalize()} port.")
-
-            # 4. Cons (Low Numbers)
-            if self.stats["low"] > 0 and self.stats["high"] == 0:
-                desc_parts.append(f"CON: Risky, relies on {self.stats['low']} low-prob number(s).")
-
-            # 5. Strategic Fit (Player-level)
-            if self.new_resources_found:
-                needed_str = ", ".join([r.capitalize() for r in self.new_resources_found])
-                # This is the most important info, add it last for emphasis.
-                desc_parts.append(f"STRATEGIC FIT: Offers needed {needed_str}.")
-
-            return " ".join(desc_parts)
-
-        def getSameResourceIndecies(self) -> list:
-            resource_map = {}
-            for i, cell in enumerate(self.cellList):
-                if cell.resource == 'desert':
-                    continue
-                if cell.resource not in resource_map:
-                    resource_map[cell.resource] = []
-                resource_map[cell.resource].append(i)
-            
-            best_indecies = []
-            for indecies in resource_map.values():
-                if len(indecies) > len(best_indecies):
-                    best_indecies = indecies
-                    
-            return best_indecies if len(best_indecies) > 1 else []
-
-        def calcCellScore(self, player_resources: list) -> float:
-            # --- Call analyzer helper FIRST ---
-            # This populates self.stats for getDescription() to use
-            self.stats = self._analyze_production()
-            
-            cellScore = 0
-            
-            DOUBLE_R_DIM = 0.90
-            TRIPLE_R_DIM = 0.75
-            PORT_INCREASE = 1.0
-            SAME_RESOURCE_BONUS = 1.0
-
-            sameResourceIndecies = self.getSameResourceIndecies()
-            
-            if len(self.cellList) == 0:
-                return 0
-
-            sorted_cells = sorted(self.cellList, key=lambda c: c.getDotValue(), reverse=True)
-
-            if len(sameResourceIndecies) == 3:
-                # All three are the same resource
-                cellScore += sorted_cells[0].getDotValue() * resource_values[sorted_cells[0].resource]
-                cellScore += sorted_cells[1].getDotValue() * resource_values[sorted_cells[1].resource] * DOUBLE_R_DIM
-                cellScore += sorted_cells[2].getDotValue() * resource_values[sorted_cells[2].resource] * TRIPLE_R_DIM
-            
-            elif len(sameResourceIndecies) == 2:
-                # Two cells are the same
-                cell1 = self.cellList[sameResourceIndecies[0]]
-                cell2 = self.cellList[sameResourceIndecies[1]]
-                
-                if cell1.getDotValue() >= cell2.getDotValue():
-                    cellScore += cell1.getDotValue() * resource_values[cell1.resource]
-                    cellScore += cell2.getDotValue() * resource_values[cell2.resource] * DOUBLE_R_DIM
-                else:
-                    cellScore += cell2.getDotValue() * resource_values[cell2.resource]
-                    cellScore += cell1.getDotValue() * resource_values[cell1.resource] * DOUBLE_R_DIM
-
-                # Now, add the score for the third, different cell *if it exists*
-                if len(self.cellList) == 3:
-                    other_cell_index = 3 - (sameResourceIndecies[0] + sameResourceIndecies[1])
-                    other_cell = self.cellList[other_cell_index]
-                    cellScore += other_cell.getDotValue() * resource_values[other_cell.resource]
-            
-            else:
-                # No matching resources, or only 1-2 tiles with different resources
-                for cell in self.cellList:
-                    cellScore += cell.getDotValue() * resource_values[cell.resource]
-
-            # --- Port Logic ---
-            if self.port is not None:
-                cellScore += PORT_INCREASE
-                for cell in self.cellList:
-                    if cell.resource in self.port and cell.resource != "desert":
-                        cellScore += SAME_RESOURCE_BONUS
-                        break
-
-            # --- Diversity Bonus Logic ---
-            if player_resources:
-                new_resources_on_this_node = set()
-                for cell in self.cellList:
-                    if cell.resource not in player_resources and cell.resource != "desert":
-                        new_resources_on_this_node.add(cell.resource)
-                
-                # Store for getDescription()
-                self.new_resources_found = list(new_resources_on_this_node)
-                
-                # Apply bonus
-                bonus = len(new_resources_on_this_node) * DIVERSITY_BONUS
-                cellScore += bonus
-
-            return cellScore
-
-    # --- End of Encapsulated Classes ---
-
-    # 1. Initialize the board grid
-    cellGrid = initializeCells(board_data)
-    
-    # 2. Define Port Mappings
-    port_map = {
-        2:"3:1", 3:"3:1",
-        5:"3:1", 6:"3:1",
-        15:"wheat", 25:"wheat",
-        36:"wood", 46:"wood",
-        52:"3:1", 53:"3:1",
-        50:"sheep", 49:"sheep",
-        48:"3:1", 47:"3:1",
-        38:"brick", 28:"brick",
-        17:"ore", 7:"ore"
-    }
-
-    # 3. Define Node-to-Cell Mappings
-    # *** DATA FIX: Corrected n21, n22, n32, n33 to match your original file ***
-    cellListDict = {
-        # row 1
-        "n0": [cellGrid[0][0]],
-        "n1": [cellGrid[0][0]],
-        "n2": [cellGrid[0][0], cellGrid[0][1]],
-        "n3": [cellGrid[0][1]],
-        "n4": [cellGrid[0][1], cellGrid[0][2]],
-        "n5": [cellGrid[0][2]],
-        "n6": [cellGrid[0][2]],
-        # row 2
-        "n7": [cellGrid[1][0]],
-        "n8": [cellGrid[0][0], cellGrid[1][0]],
-        "n9": [cellGrid[0][0], cellGrid[1][0], cellGrid[1][1]],
-        "n10": [cellGrid[0][0], cellGrid[0][1], cellGrid[1][1]],
-        "n11": [cellGrid[0][1], cellGrid[1][1], cellGrid[1][2]],
-        "n12": [cellGrid[0][1], cellGrid[0][2], cellGrid[1][2]],
-        "n13": [cellGrid[0][2], cellGrid[1][2], cellGrid[1][3]],
-        "n14": [cellGrid[0][2], cellGrid[1][3]],
-        "n15": [cellGrid[1][3]],
-        # row 3
-        "n16": [cellGrid[2][0]],
-        "n17": [cellGrid[1][0], cellGrid[2][0]],
-        "n18": [cellGrid[1][0], cellGrid[2][0], cellGrid[2][1]],
-        "n19": [cellGrid[1][0], cellGrid[1][1], cellGrid[2][1]],
-        "n20": [cellGrid[1][1], cellGrid[2][1], cellGrid[2][2]],
-        "n21": [cellGrid[1][2], cellGrid[1][1], cellGrid[2][2]], # Hexes 5, 4, 9
-        "n22": [cellGrid[1][2], cellGrid[1][3], cellGrid[2][3]], # Hexes 5, 6, 10
-        "n23": [cellGrid[1][2], cellGrid[1][3], cellGrid[2][3]], # Hexes 5, 6, 10 (Wait, n21 is 4,5,9. n22 is 5,9,10)
-        "n24": [cellGrid[1][3], cellGrid[2][3], cellGrid[2][4]], # Hexes 6, 10, 11
-        "n25": [cellGrid[1][3], cellGrid[2][4]],
-        "n26": [cellGrid[2][4]],
-        # row 4
-        "n27": [cellGrid[2][0]],
-        "n28": [cellGrid[2][0], cellGrid[3][0]],
-        "n29": [cellGrid[2][0], cellGrid[2][1], cellGrid[3][0]],
-        "n30": [cellGrid[2][1], cellGrid[3][0], cellGrid[3][1]],
-        "n31": [cellGrid[2][1], cellGrid[2][2], cellGrid[3][1]],
-        "n32": [cellGrid[2][2], cellGrid[3][1], cellGrid[3][2]], # Hexes 9, 13, 14
-        "n33": [cellGrid[2][2], cellGrid[2][3], cellGrid[3][2]], # Hexes 9, 10, 14
-        "n34": [cellGrid[2][3], cellGrid[3][2], cellGrid[3][3]], # Hexes 10, 14, 15
-        "n35": [cellGrid[2][3], cellGrid[2][4], cellGrid[3][3]], # Hexes 10, 11, 15
-        "n36": [cellGrid[2][4], cellGrid[3][3]],
-        "n37": [cellGrid[2][4]],
-        # row 5
-        "n38": [cellGrid[3][0]],
-        "n39": [cellGrid[3][0], cellGrid[4][0]],
-        "n40": [cellGrid[3][0], cellGrid[3][1], cellGrid[4][0]],
-        "n41": [cellGrid[3][1], cellGrid[4][0], cellGrid[4][1]],
-        "n42": [cellGrid[3][1], cellGrid[3][2], cellGrid[4][1]],
-        "n43": [cellGrid[3][2], cellGrid[4][1], cellGrid[4][2]],
-        "n44": [cellGrid[3][2], cellGrid[3][3], cellGrid[4][2]],
-        "n45": [cellGrid[4][2], cellGrid[3][3]],
-        "n46": [cellGrid[3][3]],
-        # row 6
-        "n47": [cellGrid[4][0]],
-        "n48": [cellGrid[4][0]],
-        "n49": [cellGrid[4][0], cellGrid[4][1]],
-        "n50": [cellGrid[4][1]],
-        "n51": [cellGrid[4][1], cellGrid[4][2]],
-        "n52": [cellGrid[4][2]],
-        "n53": [cellGrid[4][2]],
-    }
-    
-    # 4. Create nodes, calculate scores, and format results
-    result = {}
-    for i in range(54):
-        node_cell_list = cellListDict[f"n{i}"]
-        node_port = port_map.get(i) 
-        
-        node = Node(i, node_cell_list, node_port)
-        
-        score = node.calcCellScore(player_resources)
-        description = node.getDescription(player_resources) 
-        
-        result[i] = {
-            "score": round(score, 1),
-            "description": description,
-            "resources": node.getResourceSummary()
-        }
-    
-    return result
\ No newline at end of file
+    return columns
+
+
+def calculate_node_scores(board_data, player_resources=None, cache=None, fields=NODE_FIELDS,
+                          weights: ScoringWeights = None):
+    """
+    Calculates scores for every node (54 on the standard board) based on the provided board data.
+
+    board_data: list of dicts with {resource, roll, index} (and q, r on a custom map)
+    player_resources: (optional) list of strings of resources a player *already* has
+    cache: (optional) a game.cache.ScoreCache to reuse production scores from
+    fields: (optional) subset of NODE_FIELDS to include
+    weights: (optional) ScoringWeights, default active_weights()
+    returns: dict of {node_id: {score, base, resource_set, description, resources}}
+    """
+    columns = calculate_node_columns(board_data, player_resources, cache, fields, weights)
+    if "resource_set" in columns:
+        columns["resource_set"] = [list(MASK_RESOURCES[mask]) for mask in columns["resource_set"]]
+
+    names = [field for field in NODE_FIELDS if field in columns]
+    return {i: {field: columns[field][i] for field in names} for i in range(len(columns[names[0]]))}
+
+
+# --- Batch Scoring ---
+
+BATCH_CHUNK_SIZE = 1024
+
+def _score_chunk(chunk: list, weights: ScoringWeights):
+    """Score one chunk of (index, entry) pairs, yielding (index, scores, error) in order."""
+    errors = {}
+    encoded = {}  # layout → [(index, resources, rolls, needed)], one scoring pass per layout
+    for index, entry in chunk:
+        try:
+            if isinstance(entry, Exception):
+                raise entry
+            layout = layout_of(entry["board_data"])
+            resources, rolls = encode_board(entry["board_data"], layout)
+            needed = needed_resource_bits(entry.get("player_resources"))
+        except Exception as e:
+            errors[index] = str(e)
+            continue
+        encoded.setdefault(layout, []).append((index, resources, rolls, needed))
+
+    rows = {}
+    for layout, boards in encoded.items():
+        indices, resources, rolls, needed = zip(*boards)
+        needed = np.array(needed, dtype=np.int64)
+        scores = score_boards(np.stack(resources), np.stack(rolls), needed, weights, layout).tolist()
+        rows.update(zip(indices, scores))
+
+    for index, _ in chunk:
+        if index in errors:
+            yield index, None, errors[index]
+        else:
+            yield index, [round(score, 1) for score in rows[index]], None
+
+
+def iter_batch_scores(entries, chunk_size: int = BATCH_CHUNK_SIZE, weights: ScoringWeights = None):
+    """
+    Score an iterable of {board_data, player_resources} dicts, chunk_size boards
+    at a time, so memory stays bounded no matter how many boards come in.
+
+    yields: (index, scores, error) where scores is a list of node_count rounded
+    scores, or None with an error message for a board that could not be scored
+    """
+    weights = weights or active_weights()
+    chunk = []
+    for index, entry in enumerate(entries):
+        chunk.append((index, entry))
+        if len(chunk) >= chunk_size:
+            yield from _score_chunk(chunk, weights)
+            chunk = []
+    if chunk:
+        yield from _score_chunk(chunk, weights)
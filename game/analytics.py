@@ -0,0 +1,169 @@
+"""
+Historical game logs → placement facts → outcome aggregates.
+
+A log records one game per line: the board (board code or board_data), the
+opening picks in snake-draft order and every player's final VP. Each pick
+is scored the way the draft tools score it: a first settlement is worth its
+base score, and a second one also earns diversity_bonus for every resource
+the player's first settlement lacks. The pick then becomes one Placement row
+that records whether that player won.
+
+Placements are also folded into small aggregate tables keyed by score (in
+tenths) and by node. Questions such as "win rate of placements scoring ≥ X"
+are therefore answered from at most a few hundred rows, without touching the
+facts or the logs.
+"""
+import csv
+import json
+
+from .algorithm import (
+    NODE_COUNT, POPCOUNT, STANDARD_LAYOUT, active_weights, board_codes, decode_board_code, encode_boards, layout_of,
+    node_resource_masks, port_scores, production_scores,
+)
+from .draft import ALL_RESOURCE_BITS, snake_order
+
+LOG_FORMATS = ("jsonl", "csv")
+
+
+def _split_numbers(value) -> list:
+    if isinstance(value, str):
+        return [int(v) for v in value.replace(";", " ").replace(",", " ").split()]
+    return [int(v) for v in value]
+
+
+def parse_game(record: dict) -> tuple:
+    """
+    (game_id, board_data, picks, final_vp) from one log record. The board is
+    "board" (a board code) or "board_data"; picks and final_vp are lists, or
+    strings of numbers separated by spaces or semicolons (as in CSV logs).
+    """
+    if record.get("board_data"):
+        board_data = record["board_data"]
+    else:
+        board_data = decode_board_code(record["board"])
+    if layout_of(board_data) is not STANDARD_LAYOUT:
+        # Node outcomes are aggregated by node id, which only means one thing per layout
+        raise ValueError("Only games on the standard board can be analysed")
+    picks = _split_numbers(record.get("picks") or [])
+    final_vp = _split_numbers(record["final_vp"])
+    if not final_vp:
+        raise ValueError("final_vp is empty")
+    if len(picks) > 2 * len(final_vp):
+        raise ValueError("More picks than an opening draft has")
+    for node in picks:
+        if not 0 <= node < NODE_COUNT:
+            raise ValueError(f"Unknown node {node}")
+    return str(record["game_id"]), board_data, picks, final_vp
+
+
+def iter_game_logs(stream, log_format: str = "jsonl"):
+    """
+    Yield (line_number, record) for each game in a log without reading it
+    whole. A line that is not valid JSON comes through as a ValueError.
+    """
+    if log_format == "csv":
+        for number, row in enumerate(csv.DictReader(stream), 2):
+            yield number, row
+        return
+    for number, line in enumerate(stream, 1):
+        if not line.strip():
+            continue
+        try:
+            yield number, json.loads(line)
+        except ValueError as e:
+            yield number, e
+
+
+def score_games(records: list, weights=None) -> tuple:
+    """
+    Score one chunk of log records in a single vectorized pass (process pool
+    entry point), with `weights` or the active scoring weights.
+
+    returns: (games, placements, errors) where games are (game_id, board code,
+    players, winning_vp) tuples, placements are (game_id, player, pick,
+    round, node, score, vp, won) tuples and errors are (line_number, message)
+    """
+    games, errors = [], []
+    for number, record in records:
+        try:
+            if isinstance(record, Exception):
+                raise record
+            games.append(parse_game(record))
+        except (ValueError, KeyError, TypeError) as e:
+            errors.append((number, f"{type(e).__name__}: {e}"))
+
+    if not games:
+        return [], [], errors
+
+    try:
+        resources, rolls = encode_boards([board_data for _, board_data, _, _ in games])
+    except (ValueError, KeyError, TypeError, IndexError):
+        # Find the bad boards one by one, then score the rest
+        valid = []
+        for game in games:
+            try:
+                encode_boards([game[1]])
+                valid.append(game)
+            except (ValueError, KeyError, TypeError, IndexError) as e:
+                errors.append((None, f"game {game[0]}: {type(e).__name__}: {e}"))
+        games = valid
+        if not games:
+            return [], [], errors
+        resources, rolls = encode_boards([board_data for _, board_data, _, _ in games])
+
+    weights = weights or active_weights()
+    masks = node_resource_masks(resources)
+    base = port_scores(production_scores(resources, rolls, weights), masks, weights)
+    base_rows, mask_rows = base.tolist(), masks.tolist()
+    codes = board_codes(resources, rolls)
+
+    game_rows, placements = [], []
+    for g, (game_id, _, picks, final_vp) in enumerate(games):
+        winning_vp = max(final_vp)
+        game_rows.append((game_id, codes[g], len(final_vp), winning_vp))
+        order = snake_order(len(final_vp))
+        needs = [None] * len(final_vp)
+        for pick, node in enumerate(picks):
+            player = order[pick]
+            score = base_rows[g][node]
+            mask = mask_rows[g][node]
+            if needs[player] is None:
+                needs[player] = ALL_RESOURCE_BITS & ~mask if mask else 0
+                draft_round = 1
+            else:
+                score += POPCOUNT[mask & needs[player]] * weights.diversity_bonus
+                draft_round = 2
+            vp = final_vp[player]
+            placements.append((game_id, player, pick, draft_round, node, round(float(score), 1), vp, vp == winning_vp))
+    return game_rows, placements, errors
+
+
+def score_bucket(score: float) -> int:
+    """Aggregate key for a score: tenths, matching the 1-decimal rounding of every score."""
+    return int(round(score * 10))
+
+
+def aggregate(placements: list) -> tuple:
+    """
+    Fold placement tuples into ({(round, score_tenths): [placements, wins, vp]},
+    {(round, node): [placements, wins, vp]}).
+    """
+    by_score, by_node = {}, {}
+    for _, _, _, draft_round, node, score, vp, won in placements:
+        for table, key in ((by_score, (draft_round, score_bucket(score))), (by_node, (draft_round, node))):
+            totals = table.get(key)
+            if totals is None:
+                totals = table[key] = [0, 0, 0]
+            totals[0] += 1
+            totals[1] += won
+            totals[2] += vp
+    return by_score, by_node
+
+
+def outcome_summary(placements: int, wins: int, vp_total: int) -> dict:
+    return {
+        "placements": placements,
+        "wins": wins,
+        "win_rate": round(wins / placements, 4) if placements else None,
+        "mean_vp": round(vp_total / placements, 3) if placements else None,
+    }
@@ -4,3 +4,12 @@ from django.apps import AppConfig
 class GameConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'game'
+
+    def ready(self):
+        from django.conf import settings
+        from . import metrics
+        from .tuning import weights_file
+
+        metrics.configure(getattr(settings, 'SCORING_METRICS_ENABLED', False))
+        weights_file.configure(getattr(settings, 'SCORING_WEIGHTS_PATH', None))
+        weights_file.refresh(force=True)
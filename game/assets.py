@@ -0,0 +1,154 @@
+"""
+Static assets of the board page, built for caching.
+
+`collectstatic` runs every collected file through
+CompressedManifestStaticFilesStorage, which:
+
+- shrinks the hex tile images to TILE_IMAGE_SIZE, twice the size the board
+  draws them at (this needs Pillow, and is skipped without it),
+- fingerprints every file (board.3f2a….css), rewriting the url()s in CSS
+  and recording the names in staticfiles.json,
+- writes .gz and, with the brotli package installed, .br copies of every
+  fingerprinted text asset.
+
+serve_asset() serves STATIC_ROOT when no web server in front does. It
+picks the best precompressed copy the client accepts, and marks
+fingerprinted files cacheable for a year, because their contents never
+change under the same name.
+"""
+import gzip
+import logging
+import mimetypes
+import os
+import re
+
+from django.conf import settings
+from django.core.exceptions import SuspiciousFileOperation
+from django.contrib.staticfiles.storage import HashedFilesMixin, ManifestStaticFilesStorage, staticfiles_storage
+from django.http import FileResponse, Http404, HttpResponseNotModified
+from django.utils._os import safe_join
+from django.utils.http import http_date
+from django.views.static import was_modified_since
+
+try:
+    import brotli
+except ImportError:  # Optional: without it only .gz copies are written
+    brotli = None
+
+try:
+    from PIL import Image
+except ImportError:  # Optional: without it tiles are collected at full size
+    Image = None
+
+logger = logging.getLogger(__name__)
+
+# Tiles are drawn at 140px; twice that keeps them sharp on high-DPI screens
+TILE_IMAGE_SIZE = (280, 320)
+TILE_IMAGES = re.compile(r"^game/images/(desert|field|forest|hill|mountain|pasture)\.png$")
+
+COMPRESSIBLE = re.compile(r"\.(css|js|json|svg|txt|html|map|xml)$")
+MIN_COMPRESS_SIZE = 256
+# Encodings in order of preference: (Accept-Encoding token, file suffix)
+ENCODINGS = (("br", ".br"), ("gzip", ".gz"))
+
+FINGERPRINTED_MAX_AGE = 365 * 24 * 3600
+UNFINGERPRINTED_MAX_AGE = 300
+
+
+class CompressedManifestStaticFilesStorage(ManifestStaticFilesStorage):
+    """ManifestStaticFilesStorage that also shrinks tiles and precompresses text assets."""
+
+    def url(self, name, force=False):
+        # Before the first collectstatic there is no manifest: keep the plain
+        # URLs rather than failing every page
+        if not self.hashed_files and not force:
+            return super(HashedFilesMixin, self).url(name)
+        return super().url(name, force)
+
+    def post_process(self, paths, dry_run=False, **options):
+        if not dry_run:
+            for name in paths:
+                if TILE_IMAGES.match(name):
+                    self._shrink_image(name)
+
+        yield from super().post_process(paths, dry_run, **options)
+
+        if dry_run:
+            return
+        for name in sorted(set(self.hashed_files.values())):
+            if COMPRESSIBLE.search(name):
+                for compressed in self._compress(name):
+                    yield name, compressed, True
+
+    def _shrink_image(self, name: str):
+        if Image is None:
+            logger.info("Pillow is not installed; %s is collected at full size", name)
+            return
+        path = self.path(name)
+        with Image.open(path) as image:
+            if image.width <= TILE_IMAGE_SIZE[0] and image.height <= TILE_IMAGE_SIZE[1]:
+                return
+            image.thumbnail(TILE_IMAGE_SIZE, Image.LANCZOS)
+            image.save(path, optimize=True)
+
+    def _compress(self, name: str) -> list:
+        """Write the compressed copies of one file that are worth keeping; returns their names."""
+        with self.open(name) as f:
+            content = f.read()
+        if len(content) < MIN_COMPRESS_SIZE:
+            return []
+        variants = [(".gz", gzip.compress(content, compresslevel=9, mtime=0))]
+        if brotli is not None:
+            variants.append((".br", brotli.compress(content, mode=brotli.MODE_TEXT)))
+        written = []
+        for suffix, data in variants:
+            if len(data) >= len(content) * 0.95:
+                continue
+            with open(self.path(name + suffix), "wb") as f:
+                f.write(data)
+            written.append(name + suffix)
+        return written
+
+
+def _accepts(request, token: str) -> bool:
+    accepted = request.headers.get("Accept-Encoding", "")
+    return any(part.split(";")[0].strip() == token for part in accepted.split(","))
+
+
+def _fingerprinted(name: str) -> bool:
+    return name in getattr(staticfiles_storage, "hashed_files", {}).values()
+
+
+def serve_asset(request, path):
+    """A collected static file, precompressed when possible, with long cache lifetimes for fingerprinted names."""
+    if not settings.STATIC_ROOT:
+        raise Http404("STATIC_ROOT is not set")
+    try:
+        full_path = safe_join(settings.STATIC_ROOT, path)
+    except SuspiciousFileOperation:
+        raise Http404("Not found")
+    if not os.path.isfile(full_path):
+        raise Http404("Not found")
+
+    encoding = None
+    served_path = full_path
+    for token, suffix in ENCODINGS:
+        if _accepts(request, token) and os.path.isfile(full_path + suffix):
+            encoding, served_path = token, full_path + suffix
+            break
+
+    stat = os.stat(served_path)
+    if not was_modified_since(request.META.get("HTTP_IF_MODIFIED_SINCE"), stat.st_mtime):
+        return HttpResponseNotModified()
+
+    content_type = mimetypes.guess_type(full_path)[0] or "application/octet-stream"
+    response = FileResponse(open(served_path, "rb"), content_type=content_type)
+    response["Last-Modified"] = http_date(stat.st_mtime)
+    response["Vary"] = "Accept-Encoding"
+    if encoding:
+        response["Content-Encoding"] = encoding
+    if _fingerprinted(path):
+        response["Cache-Control"] = f"public, max-age={FINGERPRINTED_MAX_AGE}, immutable"
+    else:
+        response["Cache-Control"] = f"public, max-age={UNFINGERPRINTED_MAX_AGE}"
+    return response
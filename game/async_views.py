@@ -0,0 +1,238 @@
+"""
+Async variants of the scoring API, for running under ASGI (config/asgi.py).
+
+Single-board scoring runs in a worker thread, not on the event loop. It is
+NumPy work, plus the optional robber, expansion and variance columns and
+blocking calls to the shared cache, so one slow request would otherwise
+stall every coroutine in the process. Batch scoring, draft search and
+simulation are handed to the bounded process pool in game.workers, and the
+API answers 503 when that pool is saturated.
+Draft sessions push their picks to participants over Server-Sent Events.
+"""
+import asyncio
+import json
+import weakref
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.http import JsonResponse, StreamingHttpResponse
+from django.views.decorators.csrf import csrf_exempt
+
+from .algorithm import BATCH_CHUNK_SIZE, active_weights
+from .metrics import stage
+from .sessions import session_store
+from .views import (
+    busy_response, draft_arguments, iter_ndjson_boards, ndjson_score_row, node_scores_payload, score_options,
+    simulation_arguments,
+)
+from .workers import PoolBusy, batch_task, draft_task, scoring_pool, simulation_task
+
+# Chunks of one batch request kept in flight at a time
+BATCH_PIPELINE_DEPTH = 2
+
+
+@csrf_exempt  # Temporary - add CSRF token handling in production
+async def get_node_scores(request):
+    """Async twin of views.get_node_scores; scoring runs in a worker thread."""
+    if request.method != 'POST':
+        return JsonResponse({'error': 'POST required'}, status=405)
+
+    try:
+        with stage('json'):
+            data = json.loads(request.body)
+        board_data = data.get('board_data', [])
+
+        if not board_data:
+            return JsonResponse({'error': 'No board data provided'}, status=400)
+
+        player_resources = data.get('player_resources') or []
+
+        try:
+            options = score_options(data)
+        except ValueError as e:
+            return JsonResponse({'error': str(e), 'success': False}, status=400)
+
+        payload = await sync_to_async(node_scores_payload, thread_sensitive=False)(
+            board_data, player_resources, options)
+    except ValueError as e:
+        return JsonResponse({'error': str(e), 'success': False}, status=400)
+    except Exception as e:
+        return JsonResponse({'error': str(e), 'success': False}, status=500)
+
+    with stage('serialize'):
+        return JsonResponse(payload)
+
+
+def _chunks(entries, size: int):
+    chunk = []
+    for entry in entries:
+        chunk.append(entry)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+async def _stream_pooled_batch(entries, reservation):
+    """Score chunks in the pool, a few at a time, yielding NDJSON lines in order."""
+    weights = active_weights()
+    try:
+        in_flight = []
+        offset = 0
+        for chunk in _chunks(entries, BATCH_CHUNK_SIZE):
+            in_flight.append((offset, asyncio.ensure_future(scoring_pool.submit(batch_task, chunk, weights))))
+            offset += len(chunk)
+            if len(in_flight) >= BATCH_PIPELINE_DEPTH:
+                start, future = in_flight.pop(0)
+                for index, scores, error in await future:
+                    yield ndjson_score_row(start + index, scores, error)
+        for start, future in in_flight:
+            for index, scores, error in await future:
+                yield ndjson_score_row(start + index, scores, error)
+    finally:
+        reservation.release()
+
+
+@csrf_exempt  # Temporary - add CSRF token handling in production
+async def get_batch_node_scores(request):
+    """Async twin of views.get_batch_node_scores; chunks are scored in the process pool."""
+    if request.method != 'POST':
+        return JsonResponse({'error': 'POST required'}, status=405)
+
+    if request.content_type == 'application/x-ndjson':
+        entries = iter_ndjson_boards(request)
+    else:
+        try:
+            entries = json.loads(request.body).get('boards', [])
+        except Exception as e:
+            return JsonResponse({'error': str(e), 'success': False}, status=400)
+
+        if not entries:
+            return JsonResponse({'error': 'No boards provided'}, status=400)
+
+    try:
+        reservation = scoring_pool.reservation()
+    except PoolBusy:
+        return busy_response()
+
+    # The stream's body may never start (the client went away, or a middleware
+    # swapped the response), so closing or dropping the response frees the slot too
+    response = StreamingHttpResponse(_stream_pooled_batch(entries, reservation), content_type='application/x-ndjson')
+    response._resource_closers.append(reservation.release)
+    weakref.finalize(response, reservation.release)
+    return response
+
+
+@csrf_exempt  # Temporary - add CSRF token handling in production
+async def get_draft_recommendation(request):
+    """Async twin of views.get_draft_recommendation; the search runs in the process pool."""
+    if request.method != 'POST':
+        return JsonResponse({'error': 'POST required'}, status=405)
+
+    try:
+        data = json.loads(request.body)
+        board_data = data.get('board_data', [])
+
+        if not board_data:
+            return JsonResponse({'error': 'No board data provided'}, status=400)
+
+        result = await scoring_pool.run(draft_task, board_data, draft_arguments(data), active_weights())
+    except PoolBusy:
+        return busy_response()
+    except ValueError as e:
+        return JsonResponse({'error': str(e), 'success': False}, status=400)
+    except Exception as e:
+        return JsonResponse({'error': str(e), 'success': False}, status=500)
+
+    result['success'] = True
+    return JsonResponse(result)
+
+
+@csrf_exempt  # Temporary - add CSRF token handling in production
+async def get_production_simulation(request):
+    """Async twin of views.get_production_simulation; games run in the process pool."""
+    if request.method != 'POST':
+        return JsonResponse({'error': 'POST required'}, status=405)
+
+    try:
+        data = json.loads(request.body)
+        board_data = data.get('board_data', [])
+        nodes = [int(node) for node in data.get('nodes', [])]
+
+        if not board_data or not nodes:
+            return JsonResponse({'error': 'board_data and nodes are required'}, status=400)
+
+        summary = await scoring_pool.run(simulation_task, board_data, nodes, simulation_arguments(data))
+    except PoolBusy:
+        return busy_response()
+    except ValueError as e:
+        return JsonResponse({'error': str(e), 'success': False}, status=400)
+    except Exception as e:
+        return JsonResponse({'error': str(e), 'success': False}, status=500)
+
+    return JsonResponse({'simulation': summary, 'success': True})
+
+
+def _sse_event(event: dict) -> str:
+    return f"id: {event['version']}\nevent: pick\ndata: {json.dumps(event, separators=(',', ':'))}\n\n"
+
+
+async def session_events(session, after: int = 0, keepalive: float = 15):
+    """
+    Server-Sent Events for one draft session: the picks after version
+    `after`, then every new pick as it happens, with a comment line after
+    `keepalive` idle seconds so proxies keep the connection open. Ends when
+    the draft is complete.
+    """
+    queue, backlog = session.subscribe(after)
+    try:
+        sent = after
+        for event in backlog:
+            sent = event['version']
+            yield _sse_event(event)
+            if event['complete']:
+                return
+        while True:
+            try:
+                event = await asyncio.wait_for(queue.get(), keepalive)
+            except asyncio.TimeoutError:
+                yield ': keep-alive\n\n'
+                continue
+            if event['version'] <= sent:
+                continue
+            sent = event['version']
+            yield _sse_event(event)
+            if event['complete']:
+                return
+    finally:
+        session.unsubscribe(queue)
+
+
+async def get_draft_session_events(request, session_id):
+    """
+    Stream a draft session's picks (text/event-stream). A client that
+    reconnects sends Last-Event-ID (or ?after=<version>) and gets the picks
+    it missed first. Needs the ASGI server: under WSGI the stream would
+    never be flushed.
+    """
+    if request.method != 'GET':
+        return JsonResponse({'error': 'GET required'}, status=405)
+
+    try:
+        after = int(request.headers.get('Last-Event-ID') or request.GET.get('after') or 0)
+    except ValueError:
+        return JsonResponse({'error': 'after must be a version number', 'success': False}, status=400)
+
+    # Rebuilding from a snapshot reads the database
+    session = await sync_to_async(session_store.get)(session_id)
+    if session is None:
+        return JsonResponse({'error': 'Draft session not found', 'success': False}, status=404)
+
+    response = StreamingHttpResponse(
+        session_events(session, after, getattr(settings, 'DRAFT_EVENTS_KEEPALIVE', 15)),
+        content_type='text/event-stream',
+    )
+    response['Cache-Control'] = 'no-cache'
+    response['X-Accel-Buffering'] = 'no'
+    return response
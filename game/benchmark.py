@@ -0,0 +1,258 @@
+"""
+Timing harness and golden corpus for the scoring engine and API.
+
+`python manage.py benchmark` runs BENCHMARKS, writes the timings to a JSON
+results file and, given an earlier results file, flags every case whose median
+got slower than `threshold` times its old median. The golden corpus, made of
+seeded random boards and their pinned scores, is what game/tests.py checks
+changes against.
+"""
+import hashlib
+import json
+import platform
+import random
+import statistics
+import time
+
+import numpy as np
+
+from .algorithm import (
+    BOARD_RESOURCES, BOARD_ROLLS, EXPANSION_RESOURCES, EXPANSION_ROLLS, calculate_node_scores, encode_board_code,
+    iter_batch_scores, rescore_nodes,
+)
+from .cache import ScoreCache
+
+GOLDEN_SEEDS = range(50)
+GOLDEN_PLAYER_RESOURCES = ["brick", "wheat"]
+
+DEFAULT_THRESHOLD = 1.25
+
+
+def random_board(seed: int, expansion: bool = False) -> list:
+    """
+    A shuffled standard (or, with expansion, 5-6 player) board as board_data;
+    the same seed always gives the same board.
+    """
+    rng = random.Random(seed)
+    resources = (EXPANSION_RESOURCES if expansion else BOARD_RESOURCES)[:]
+    rolls = (EXPANSION_ROLLS if expansion else BOARD_ROLLS)[:]
+    rng.shuffle(resources)
+    rng.shuffle(rolls)
+    rolls = iter(rolls)
+    return [
+        {"resource": resource, "roll": None if resource == "desert" else next(rolls), "index": h}
+        for h, resource in enumerate(resources)
+    ]
+
+
+# --- Golden Corpus ---
+
+def _description_digest(scores: dict) -> str:
+    text = json.dumps([[scores[i]["description"], scores[i]["resources"]] for i in sorted(scores)])
+    return hashlib.sha256(text.encode()).hexdigest()
+
+
+def golden_entry(seed: int) -> dict:
+    """Today's outputs for one seeded board, as stored in the golden file."""
+    board_data = random_board(seed)
+    scores = calculate_node_scores(board_data)
+    player_scores = calculate_node_scores(board_data, GOLDEN_PLAYER_RESOURCES)
+    return {
+        "seed": seed,
+        "code": encode_board_code(board_data),
+        "scores": [scores[i]["score"] for i in sorted(scores)],
+        "base": [scores[i]["base"] for i in sorted(scores)],
+        "player_scores": [player_scores[i]["score"] for i in sorted(player_scores)],
+        "descriptions": _description_digest(player_scores),
+    }
+
+
+def golden_corpus(seeds=GOLDEN_SEEDS) -> list:
+    return [golden_entry(seed) for seed in seeds]
+
+
+# --- Benchmarks ---
+
+def _time(func, repeat: int, number: int = 1) -> dict:
+    """Per-call timings of func() in microseconds over `repeat` runs of `number` calls."""
+    func()  # warm-up
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(number):
+            func()
+        samples.append((time.perf_counter() - start) / number * 1e6)
+    return {
+        "median_us": round(statistics.median(samples), 2),
+        "min_us": round(min(samples), 2),
+        "repeat": repeat,
+        "number": number,
+    }
+
+
+def _batch_entries(count: int) -> list:
+    boards = [random_board(seed) for seed in range(min(count, 1000))]
+    return [
+        {"board_data": boards[i % len(boards)], "player_resources": GOLDEN_PLAYER_RESOURCES if i % 2 else []}
+        for i in range(count)
+    ]
+
+
+def bench_single_board(repeat: int) -> dict:
+    board_data = random_board(0)
+    return _time(lambda: calculate_node_scores(board_data, GOLDEN_PLAYER_RESOURCES), repeat, 20)
+
+
+def bench_single_board_cached(repeat: int) -> dict:
+    board_data = random_board(0)
+    cache = ScoreCache(max_size=16)
+    return _time(lambda: calculate_node_scores(board_data, GOLDEN_PLAYER_RESOURCES, cache), repeat, 20)
+
+
+def bench_rescore(repeat: int) -> dict:
+    board_data = random_board(0)
+    cache = ScoreCache(max_size=16)
+    return _time(lambda: rescore_nodes(board_data, GOLDEN_PLAYER_RESOURCES, cache), repeat, 200)
+
+
+def _bench_batch(count: int):
+    def bench(repeat: int) -> dict:
+        entries = _batch_entries(count)
+        result = _time(lambda: sum(1 for _ in iter_batch_scores(entries)), repeat)
+        result["boards_per_second"] = round(count / (result["median_us"] / 1e6))
+        return result
+    return bench
+
+
+def _bench_view(method: str):
+    def bench(repeat: int) -> dict:
+        from django.test import Client, override_settings
+
+        client = Client()
+        board_data = random_board(0)
+        if method == "GET":
+            url = f"/api/scores/{encode_board_code(board_data)}/"
+            request = lambda: client.get(url)
+        else:
+            body = json.dumps({"board_data": board_data, "player_resources": GOLDEN_PLAYER_RESOURCES})
+            request = lambda: client.post("/api/calculate-scores/", body, content_type="application/json")
+        # The test client's host name is not in the deployment's ALLOWED_HOSTS
+        with override_settings(ALLOWED_HOSTS=["testserver"]):
+            return _time(request, repeat, 20)
+    return bench
+
+
+# name → (benchmark, part of --quick runs)
+BENCHMARKS = {
+    "single_board": (bench_single_board, True),
+    "single_board_cached": (bench_single_board_cached, True),
+    "rescore": (bench_rescore, True),
+    "batch_1k": (_bench_batch(1000), True),
+    "batch_100k": (_bench_batch(100000), False),
+    "view_post_scores": (_bench_view("POST"), True),
+    "view_get_board_code": (_bench_view("GET"), True),
+}
+
+
+# Server profile → WSGI module (see config/settings_api.py)
+PROFILES = {"full": "config.wsgi", "api": "config.wsgi_api"}
+
+# Runs in a fresh interpreter per profile: times the import of the WSGI module
+_PROFILE_PROBE = """
+import importlib, json, sys, time
+start = time.perf_counter()
+module = importlib.import_module(sys.argv[1])
+startup = time.perf_counter() - start
+from game.benchmark import profile_requests
+result = profile_requests(module.application, int(sys.argv[2]))
+result["startup_ms"] = round(startup * 1000, 1)
+result["warm_up_ms"] = round(getattr(module, "warm_up_seconds", 0) * 1000, 1)
+print(json.dumps(result))
+"""
+
+
+def profile_requests(application, number: int) -> dict:
+    """
+    First-request latency and per-request medians of one WSGI application:
+    a scoring POST (a cache hit after the first call) and /api/cache-stats/,
+    whose view does almost nothing, so its time is the framework overhead.
+    """
+    from .warmup import wsgi_request
+
+    body = json.dumps({"board_data": random_board(1000), "player_resources": GOLDEN_PLAYER_RESOURCES}).encode()
+    start = time.perf_counter()
+    wsgi_request(application, "POST", "/api/calculate-scores/", body)
+    first = time.perf_counter() - start
+
+    post = _time(lambda: wsgi_request(application, "POST", "/api/calculate-scores/", body), 5, number)
+    overhead = _time(lambda: wsgi_request(application, "GET", "/api/cache-stats/"), 5, number)
+    return {
+        "first_request_us": round(first * 1e6, 2),
+        "post_scores_us": post["median_us"],
+        "overhead_us": overhead["median_us"],
+    }
+
+
+def compare_profiles(profiles=tuple(PROFILES), runs: int = 3, number: int = 200) -> dict:
+    """
+    Start every server profile `runs` times in a fresh interpreter and
+    report the median of each measurement (see profile_requests).
+    """
+    import os
+    import subprocess
+    import sys
+
+    from django.conf import settings
+
+    env = dict(os.environ)
+    env.pop("DJANGO_SETTINGS_MODULE", None)
+    results = {}
+    for name in profiles:
+        samples = []
+        for _ in range(runs):
+            output = subprocess.run(
+                [sys.executable, "-c", _PROFILE_PROBE, PROFILES[name], str(number)],
+                cwd=settings.BASE_DIR, env=env, capture_output=True, text=True, check=True,
+            ).stdout
+            samples.append(json.loads(output.strip().splitlines()[-1]))
+        results[name] = {key: round(statistics.median(s[key] for s in samples), 2) for key in samples[0]}
+    return results
+
+
+def run_benchmarks(names=None, repeat: int = 5, quick: bool = False) -> dict:
+    """Run the selected BENCHMARKS; returns the results document."""
+    cases = {}
+    for name, (bench, in_quick) in BENCHMARKS.items():
+        if names and name not in names:
+            continue
+        if quick and not in_quick and not names:
+            continue
+        # Heavy cases get fewer repeats
+        cases[name] = bench(max(1, repeat // 5) if name == "batch_100k" else repeat)
+    return {
+        "created": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "cases": cases,
+    }
+
+
+def compare_results(current: dict, baseline: dict, threshold: float = DEFAULT_THRESHOLD) -> list:
+    """
+    Cases present in both runs whose median got slower than threshold × the
+    baseline median, as dicts of name, baseline_us, current_us and ratio.
+    """
+    regressions = []
+    for name, result in current["cases"].items():
+        old = baseline.get("cases", {}).get(name)
+        if not old or not old["median_us"]:
+            continue
+        ratio = result["median_us"] / old["median_us"]
+        if ratio > threshold:
+            regressions.append({
+                "name": name,
+                "baseline_us": old["median_us"],
+                "current_us": result["median_us"],
+                "ratio": round(ratio, 3),
+            })
+    return regressions
@@ -0,0 +1,223 @@
+"""
+Symmetry-aware cache in front of the node scoring engine.
+
+Boards that are rotations or reflections of each other share one entry: the
+key is the lexicographically smallest encoding of the hexes over the layout's
+symmetries, and values are stored in that canonical frame and remapped to the
+caller's node ids on a hit. Keys of boards on layouts other than the standard
+one also carry the layout's fingerprint.
+
+Only the production scores and node resource masks are cached. Ports are fixed
+to the frame rather than the hexes, so port bonuses are re-applied after the
+remap, and the player's diversity bonus is applied last. That keeps the key
+independent of player_resources, so every turn of a draft hits the same entry.
+Keys are prefixed with the weights' production_fingerprint, so installing new
+scoring weights never serves production scores computed under the old ones.
+"""
+import threading
+from collections import OrderedDict
+from functools import lru_cache
+
+import numpy as np
+from django.conf import settings
+from django.core.cache import caches
+
+from .algorithm import STANDARD_LAYOUT, active_weights, default_layout, node_resource_masks, production_scores
+
+# hex → one character per resource and per roll, e.g. "3c" is wheat on 12
+_RESOURCE_CHARS = "012345"
+_ROLL_CHARS = "0123456789abc"
+
+@lru_cache(maxsize=64)
+def _source_array(layout) -> np.ndarray:
+    """(symmetries, hex_count) source hex of every canonical hex position."""
+    return np.array(layout.source_hexes, dtype=np.intp)
+
+
+def canonical_board(resources: np.ndarray, rolls: np.ndarray, layout=None) -> tuple:
+    """
+    Return (key, symmetry_index) for a board: the smallest hex encoding over
+    all the layout's symmetries, and the symmetry that produces it.
+    """
+    layout = layout or default_layout(len(resources))
+    cells = [_RESOURCE_CHARS[r] + _ROLL_CHARS[x] for r, x in zip(resources.tolist(), rolls.tolist())]
+    best_key, best_index = None, 0
+    for index, sources in enumerate(layout.source_hexes):
+        key = "".join([cells[h] for h in sources])
+        if best_key is None or key < best_key:
+            best_key, best_index = key, index
+    return best_key, best_index
+
+
+_HEX_RADIX = len(_RESOURCE_CHARS) * len(_ROLL_CHARS)
+_SPLIT = 10  # hexes per int64 part of a vectorized key (_HEX_RADIX ** 10 < 2 ** 63)
+
+
+def canonical_boards(resources: np.ndarray, rolls: np.ndarray, layout=None) -> tuple:
+    """
+    Vectorized canonical_board() for (B, hex_count) arrays.
+    returns: (canonical_resources, canonical_rolls, symmetry_indices), where
+    the boards are rearranged into the canonical frame
+    """
+    source_array = _source_array(layout or default_layout(resources.shape[1]))
+    cells = resources * len(_ROLL_CHARS) + rolls
+    permuted = cells[:, source_array]  # (B, symmetries, hex_count)
+    # Comparing the keys as strings is comparing these base-_HEX_RADIX numbers,
+    # _SPLIT hexes at a time: each part only breaks the ties left by the last
+    tied = np.ones(permuted.shape[:2], dtype=bool)
+    for start in range(0, permuted.shape[2], _SPLIT):
+        part = permuted[:, :, start:start + _SPLIT]
+        part = part @ (_HEX_RADIX ** np.arange(part.shape[2] - 1, -1, -1, dtype=np.int64))
+        part = np.where(tied, part, np.iinfo(np.int64).max)
+        tied &= part == part.min(axis=1, keepdims=True)
+    symmetries = tied.argmax(axis=1)
+
+    sources = source_array[symmetries]
+    rows = np.arange(len(resources))[:, None]
+    return resources[rows, sources], rolls[rows, sources], symmetries
+
+
+def canonical_frame(resources: np.ndarray, rolls: np.ndarray, layout=None) -> tuple:
+    """(canonical_resources, canonical_rolls, symmetry_index) for one board."""
+    layout = layout or default_layout(len(resources))
+    _, symmetry = canonical_board(resources, rolls, layout)
+    sources = list(layout.source_hexes[symmetry])
+    return resources[sources], rolls[sources], symmetry
+
+
+def from_canonical(production: np.ndarray, masks: np.ndarray, symmetry: int, layout=None) -> tuple:
+    """Remap canonical-frame node vectors to the node order of the board with this symmetry."""
+    layout = layout or default_layout(node_count=len(production))
+    node_perm = layout.symmetries[symmetry][1]
+    return production[node_perm], masks[node_perm]
+
+
+def pack_components(production: np.ndarray, masks: np.ndarray) -> bytes:
+    """Compact blob of one board's node vectors: node_count float64 then node_count uint8."""
+    return production.astype(np.float64).tobytes() + masks.astype(np.uint8).tobytes()
+
+
+def unpack_components(blob: bytes) -> tuple:
+    node_count = len(blob) // 9
+    production = np.frombuffer(blob, dtype=np.float64, count=node_count)
+    masks = np.frombuffer(blob, dtype=np.uint8, offset=node_count * 8).astype(np.int64)
+    return production, masks
+
+
+class ScoreCache:
+    """
+    Two-tier cache of (production, masks) node vectors.
+
+    The first tier is a bounded in-process LRU. The optional second tier is a
+    Django cache alias (e.g. memcached/redis) so gunicorn workers share hits.
+    """
+
+    def __init__(self, max_size: int = 4096, shared_alias: str = None, key_prefix: str = "settler:scores:"):
+        self.max_size = max_size
+        self.shared_alias = shared_alias
+        self.key_prefix = key_prefix
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.shared_hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def components(self, resources: np.ndarray, rolls: np.ndarray, weights=None, layout=None) -> tuple:
+        """
+        Production scores and resource masks for one board, in the caller's
+        node order: (node_count,) float64 and (node_count,) int64 arrays.
+        """
+        weights = weights or active_weights()
+        layout = layout or default_layout(len(resources))
+        key, symmetry = canonical_board(resources, rolls, layout)
+        key = f"{weights.production_fingerprint}:{key}"
+        if layout is not STANDARD_LAYOUT:
+            key = f"{layout.fingerprint}:{key}"
+        entry = self._get(key)
+        if entry is None:
+            sources = list(layout.source_hexes[symmetry])
+            canonical_resources = resources[sources][None]
+            canonical_rolls = rolls[sources][None]
+            entry = (
+                production_scores(canonical_resources, canonical_rolls, weights, layout)[0],
+                node_resource_masks(canonical_resources, layout)[0],
+            )
+            self._set(key, entry)
+
+        return from_canonical(*entry, symmetry, layout)
+
+    def _get(self, key: str):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry
+
+        entry = self._shared_get(key)
+        with self._lock:
+            if entry is None:
+                self.misses += 1
+                return None
+            self.shared_hits += 1
+        self._remember(key, entry)
+        return entry
+
+    def _set(self, key: str, entry: tuple):
+        self._remember(key, entry)
+        self._shared_set(key, entry)
+
+    def _remember(self, key: str, entry: tuple):
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def _shared_get(self, key: str):
+        if not self.shared_alias:
+            return None
+        try:
+            blob = caches[self.shared_alias].get(self.key_prefix + key)
+        except Exception:
+            return None  # A shared tier outage must not break scoring
+        if blob is None:
+            return None
+        return unpack_components(blob)
+
+    def _shared_set(self, key: str, entry: tuple):
+        if not self.shared_alias:
+            return
+        blob = pack_components(*entry)
+        try:
+            caches[self.shared_alias].set(self.key_prefix + key, blob, timeout=None)
+        except Exception:
+            pass
+
+    def stats(self) -> dict:
+        """Hit/miss/eviction counters and current size."""
+        with self._lock:
+            lookups = self.hits + self.shared_hits + self.misses
+            return {
+                "size": len(self._entries),
+                "max_size": self.max_size,
+                "hits": self.hits,
+                "shared_hits": self.shared_hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": round((self.hits + self.shared_hits) / lookups, 4) if lookups else 0.0,
+            }
+
+    def clear(self):
+        """Drop the in-process tier and reset the counters."""
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.shared_hits = self.misses = self.evictions = 0
+
+
+score_cache = ScoreCache(
+    max_size=getattr(settings, "SCORE_CACHE_SIZE", 4096),
+    shared_alias=getattr(settings, "SCORE_CACHE_ALIAS", None),
+)
@@ -0,0 +1,310 @@
+"""
+Snake-draft lookahead for the opening settlement picks.
+
+The draft runs 1-2-...-N-N-...-2-1. Picks are valued the way the board page
+values them: a first pick is worth its base score, and a second pick also
+earns diversity_bonus for every resource the player's first pick lacks.
+A settled node blocks itself and its neighbours (the distance rule).
+
+The search is depth-limited max-n (each player maximises their own total)
+over the best beam_width candidates per ply, with iterative deepening under a
+time budget. Picks past the depth limit are played out greedily. Subtrees are
+shared through a transposition table keyed by the occupied-node bitmask plus
+the resource needs of the players who have picked, which together fix
+everything that happens for the rest of the draft.
+
+best_pairs() ranks every legal two-settlement combination for one player in
+a single vectorized pass over the precomputed list of non-adjacent pairs.
+"""
+import time
+
+import numpy as np
+
+from .algorithm import (
+    DESERT, MASK_RESOURCES, POPCOUNT, STANDARD_LAYOUT,
+    active_weights, calculate_node_components, diversity_scores, encode_board, layout_of, node_number_masks,
+)
+
+ALL_RESOURCE_BITS = (1 << DESERT) - 1
+
+DEFAULT_BEAM_WIDTH = 6
+DEFAULT_TIME_BUDGET = 0.5  # seconds
+
+
+def snake_order(players: int) -> list:
+    """Player index for every pick of the opening draft, e.g. 0 1 2 3 3 2 1 0."""
+    return list(range(players)) + list(range(players - 1, -1, -1))
+
+
+class _Timeout(Exception):
+    pass
+
+
+class DraftSearch:
+    """
+    Searches the remaining picks of one board's opening draft.
+
+    base, masks: (node_count,) arrays from calculate_node_components()
+    layout: the board's BoardLayout (default the standard board)
+    """
+
+    def __init__(self, base, masks, players: int = 4, beam_width: int = DEFAULT_BEAM_WIDTH,
+                 time_budget: float = DEFAULT_TIME_BUDGET, max_depth: int = None, weights=None, layout=None):
+        self.base = base
+        self.weights = weights or active_weights()
+        self.layout = layout or STANDARD_LAYOUT
+        self.block_masks = self.layout.node_block_masks
+        self._mask_array = masks
+        self.masks = masks.tolist()
+        self.players = players
+        self.order = snake_order(players)
+        self.beam_width = beam_width
+        self.time_budget = time_budget
+        self.max_depth = max_depth
+
+        self._scores = {}  # needs bitmask → node scores
+        self._ranked = {}  # needs bitmask → node ids, best first
+        self._table = {}   # (occupied, needs) → (depth, value, best_node)
+        self.nodes_searched = 0
+        self._deadline = None
+
+    # --- Scoring ---
+
+    def _node_scores(self, needs: int) -> list:
+        scores = self._scores.get(needs)
+        if scores is None:
+            scores = diversity_scores(self.base, self._mask_array, needs, self.weights)[0].tolist()
+            self._scores[needs] = scores
+            self._ranked[needs] = sorted(range(len(scores)), key=lambda n: -scores[n])
+        return scores
+
+    def _needs_after(self, needs: tuple, player: int, node: int) -> tuple:
+        """Needs tuple after player settles node (only a first pick changes it)."""
+        if needs[player] is not None:
+            return needs
+        mask = self.masks[node]
+        updated = list(needs)
+        updated[player] = ALL_RESOURCE_BITS & ~mask if mask else 0
+        return tuple(updated)
+
+    def _candidates(self, needs: int, blocked: int, limit: int) -> list:
+        self._node_scores(needs)
+        candidates = []
+        for node in self._ranked[needs]:
+            if not blocked >> node & 1:
+                candidates.append(node)
+                if len(candidates) >= limit:
+                    break
+        return candidates
+
+    # --- Search ---
+
+    def _rollout(self, turn: int, blocked: int, needs: tuple) -> list:
+        """Play the rest of the draft greedily; returns each player's future gain."""
+        value = [0.0] * self.players
+        while turn < len(self.order):
+            player = self.order[turn]
+            player_needs = needs[player] or 0
+            candidates = self._candidates(player_needs, blocked, 1)
+            if not candidates:
+                break
+            node = candidates[0]
+            value[player] += self._node_scores(player_needs)[node]
+            blocked |= self.block_masks[node]
+            needs = self._needs_after(needs, player, node)
+            turn += 1
+        return value
+
+    def _search(self, turn: int, occupied: int, blocked: int, needs: tuple, depth: int) -> list:
+        self.nodes_searched += 1
+        if self.nodes_searched & 255 == 0 and time.perf_counter() > self._deadline:
+            raise _Timeout()
+
+        if turn >= len(self.order):
+            return [0.0] * self.players
+        if depth == 0:
+            return self._rollout(turn, blocked, needs)
+
+        key = (occupied, needs)
+        entry = self._table.get(key)
+        if entry is not None and entry[0] >= depth:
+            return list(entry[1])
+
+        player = self.order[turn]
+        player_needs = needs[player] or 0
+        scores = self._node_scores(player_needs)
+
+        best_value, best_node = None, None
+        for node in self._candidates(player_needs, blocked, self.beam_width):
+            value = self._search(
+                turn + 1, occupied | 1 << node, blocked | self.block_masks[node],
+                self._needs_after(needs, player, node), depth - 1,
+            )
+            value[player] += scores[node]
+            if best_value is None or value[player] > best_value[player]:
+                best_value, best_node = value, node
+
+        if best_value is None:  # No legal spot left
+            return [0.0] * self.players
+
+        self._table[key] = (depth, tuple(best_value), best_node)
+        return best_value
+
+    def recommend(self, picks=()) -> dict:
+        """
+        Best pick for whoever is next after `picks` (node ids in draft order),
+        and the responses the search expects from everyone else.
+        """
+        turn, occupied, blocked = 0, 0, 0
+        needs = (None,) * self.players
+        totals = [0.0] * self.players
+        for node in picks:
+            if turn >= len(self.order):
+                raise ValueError("Draft is already complete")
+            if not 0 <= node < self.layout.node_count or blocked >> node & 1:
+                raise ValueError(f"Node {node} is not available")
+            player = self.order[turn]
+            totals[player] += self._node_scores(needs[player] or 0)[node]
+            occupied |= 1 << node
+            blocked |= self.block_masks[node]
+            needs = self._needs_after(needs, player, node)
+            turn += 1
+
+        if turn >= len(self.order):
+            raise ValueError("Draft is already complete")
+
+        remaining = len(self.order) - turn
+        max_depth = min(self.max_depth or remaining, remaining)
+        self._deadline = time.perf_counter() + self.time_budget
+        completed_depth = 0
+        for depth in range(1, max_depth + 1):
+            try:
+                self._search(turn, occupied, blocked, needs, depth)
+            except _Timeout:
+                break
+            completed_depth = depth
+
+        if completed_depth == 0:
+            raise ValueError("Time budget too small to search a single ply")
+
+        # Follow the table's best moves, then greedy picks past the searched depth
+        variation = []
+        while turn < len(self.order):
+            player = self.order[turn]
+            player_needs = needs[player] or 0
+            entry = self._table.get((occupied, needs))
+            if entry is not None and entry[2] is not None:
+                node = entry[2]
+            else:
+                candidates = self._candidates(player_needs, blocked, 1)
+                if not candidates:
+                    break
+                node = candidates[0]
+            score = self._node_scores(player_needs)[node]
+            variation.append({"turn": turn, "player": player, "node": node, "score": round(score, 1)})
+            totals[player] += score
+            occupied |= 1 << node
+            blocked |= self.block_masks[node]
+            needs = self._needs_after(needs, player, node)
+            turn += 1
+
+        if not variation:
+            raise ValueError("No legal spot left for the next pick")
+
+        return {
+            "player": variation[0]["player"],
+            "recommended": variation[0]["node"],
+            "score": variation[0]["score"],
+            "principal_variation": variation,
+            "expected_totals": [round(total, 1) for total in totals],
+            "depth": completed_depth,
+            "complete": completed_depth == max_depth,
+            "nodes_searched": self.nodes_searched,
+        }
+
+
+def recommend_pick(board_data, picks=(), players: int = 4, beam_width: int = DEFAULT_BEAM_WIDTH,
+                   time_budget: float = DEFAULT_TIME_BUDGET, max_depth: int = None, cache=None,
+                   weights=None) -> dict:
+    """Convenience wrapper: score the board, then search the rest of its draft."""
+    weights = weights or active_weights()
+    base, masks = calculate_node_components(board_data, cache, weights)
+    search = DraftSearch(base, masks, players, beam_width, time_budget, max_depth, weights, layout_of(board_data))
+    return search.recommend(picks)
+
+
+# --- Settlement Pair Search ---
+
+# Objective weight for each distinct dice number a pair produces on
+PAIR_NUMBER_BONUS = 0.5
+DEFAULT_TOP_K = 10
+
+_NUMBER_POPCOUNT = np.array([bin(i).count("1") for i in range(1 << 13)], dtype=np.int64)
+
+
+def best_pairs(base, masks, numbers, occupied=(), first: int = None, top_k: int = DEFAULT_TOP_K,
+               weights=None, layout=None) -> list:
+    """
+    Rank every legal (first, second) settlement pair in one vectorized pass.
+
+    Objective: both base scores, diversity_bonus per distinct resource the
+    pair covers and PAIR_NUMBER_BONUS per distinct number it produces on.
+    occupied: nodes already settled by anyone (they and their neighbours are
+    unavailable); first: fix the first settlement and rank only seconds.
+
+    base, masks, numbers: (node_count,) arrays for one board
+    layout: the board's BoardLayout (default the standard board)
+    returns: top_k dicts, best first
+    """
+    layout = layout or STANDARD_LAYOUT
+    blocked = 0
+    for node in occupied:
+        if not 0 <= node < layout.node_count:
+            raise ValueError(f"Unknown node {node}")
+        blocked |= layout.node_block_masks[node]
+    available = np.array([not blocked >> n & 1 for n in range(layout.node_count)])
+
+    a, b = layout.pair_first, layout.pair_second
+    legal = available[a] & available[b]
+    if first is not None:
+        if not 0 <= first < layout.node_count or not available[first]:
+            raise ValueError(f"Node {first} is not available")
+        legal &= (a == first) | (b == first)
+    a, b = a[legal], b[legal]
+    if first is not None:
+        # Orient every pair as (first, second)
+        a, b = np.where(a == first, a, b), np.where(a == first, b, a)
+
+    scores = (
+        base[a] + base[b]
+        + POPCOUNT[masks[a] | masks[b]] * (weights or active_weights()).diversity_bonus
+        + _NUMBER_POPCOUNT[numbers[a] | numbers[b]] * PAIR_NUMBER_BONUS
+    )
+
+    k = min(top_k, len(scores))
+    if k == 0:
+        return []
+    top = np.argpartition(-scores, k - 1)[:k]
+    top = top[np.argsort(-scores[top], kind="stable")]
+
+    return [
+        {
+            "first": int(a[i]),
+            "second": int(b[i]),
+            "score": round(float(scores[i]), 1),
+            "resources": list(MASK_RESOURCES[masks[a[i]] | masks[b[i]]]),
+            "numbers": [roll for roll in range(2, 13) if (numbers[a[i]] | numbers[b[i]]) >> roll & 1],
+        }
+        for i in top
+    ]
+
+
+def recommend_pairs(board_data, occupied=(), first: int = None, top_k: int = DEFAULT_TOP_K, cache=None,
+                    weights=None) -> list:
+    """Convenience wrapper: score the board, then rank its legal settlement pairs."""
+    weights = weights or active_weights()
+    layout = layout_of(board_data)
+    base, masks = calculate_node_components(board_data, cache, weights)
+    resources, rolls = encode_board(board_data, layout)
+    numbers = node_number_masks(resources[None], rolls[None], layout)[0]
+    return best_pairs(base, masks, numbers, occupied, first, top_k, weights, layout)
@@ -0,0 +1,86 @@
+"""
+Expansion potential: where a settlement lets its player build next.
+
+A node's own score only counts the (at most three) hexes it touches. Its
+expansion potential is the score of the best open spot its player could
+still settle by building roads out from it. That spot is discounted by
+EXPANSION_ROAD_DISCOUNT for each road past the first. A spot is open while
+no settlement (including the one being valued) blocks it.
+
+The layout holds every node's 1-, 2- and 3-road rings as node bitmasks
+(BoardLayout.node_reach). ExpansionScorer renumbers those bitmasks once per
+board, so that bit i is the board's i-th best node. The best open spot in a
+ring is then its lowest set bit once the blocked bits are cleared. A pick
+costs one OR into the blocked mask, and revaluing every node costs a few bit
+operations per ring. That is cheap enough to run after every pick of a draft.
+"""
+from .algorithm import calculate_node_components, layout_of
+
+# Value kept per road past the first on the way to the spot
+EXPANSION_ROAD_DISCOUNT = 0.5
+
+
+class ExpansionScorer:
+    """
+    Expansion potential of every node on one board.
+
+    scores: (node_count,) sequence of the spot values to expand to (base scores)
+    """
+
+    def __init__(self, scores, layout, discount: float = EXPANSION_ROAD_DISCOUNT):
+        self.layout = layout
+        self.scores = [float(score) for score in scores]
+        self.order = sorted(range(layout.node_count), key=lambda n: -self.scores[n])  # rank → node
+        rank = [0] * layout.node_count
+        for r, node in enumerate(self.order):
+            rank[node] = r
+
+        def ranked(mask: int) -> int:
+            bits = 0
+            while mask:
+                low = mask & -mask
+                bits |= 1 << rank[low.bit_length() - 1]
+                mask ^= low
+            return bits
+
+        self._block = [ranked(mask) for mask in layout.node_block_masks]
+        self._rings = [
+            (discount ** (roads - 1), [ranked(mask) for mask in ring])
+            for roads, ring in enumerate(layout.node_reach, start=1)
+        ]
+
+    def blocked(self, occupied=()) -> int:
+        """The rank-space blocked mask for settlements on `occupied`."""
+        blocked = 0
+        for node in occupied:
+            if not 0 <= node < self.layout.node_count:
+                raise ValueError(f"Unknown node {node}")
+            blocked |= self._block[node]
+        return blocked
+
+    def potential(self, occupied=(), blocked: int = None) -> list:
+        """
+        Each node's expansion potential with settlements on `occupied` (or
+        a rank-space `blocked` mask from blocked()).
+        """
+        if blocked is None:
+            blocked = self.blocked(occupied)
+        potential = []
+        for n, own in enumerate(self._block):
+            closed = blocked | own
+            best = 0.0
+            for factor, rings in self._rings:
+                spots = rings[n] & ~closed
+                if spots:
+                    value = factor * self.scores[self.order[(spots & -spots).bit_length() - 1]]
+                    if value > best:
+                        best = value
+            potential.append(best)
+        return potential
+
+
+def expansion_potential(board_data, occupied=(), cache=None, weights=None) -> list:
+    """Rounded expansion potential of every node, with settlements on `occupied`."""
+    base, _ = calculate_node_components(board_data, cache, weights)
+    scorer = ExpansionScorer(base.tolist(), layout_of(board_data))
+    return [round(value, 1) for value in scorer.potential([int(node) for node in occupied])]
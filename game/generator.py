@@ -0,0 +1,267 @@
+"""
+Fair random boards, generated on the server.
+
+A board is built one tile and one number token at a time. Each placement is
+checked only against the hexes next to it (layout.hex_neighbors), so a
+choice that breaks a local constraint is rejected before the rest of the
+board is built:
+
+- no 6 or 8 next to another 6 or 8 (optionally, no equal numbers side by side),
+- no connected group of one resource larger than max_cluster hexes.
+
+When no tile or token fits, that phase starts over. The whole-board
+constraints need node scores, so candidates are scored in vectorized batches
+and filtered:
+
+- the best spot for each resource (most dots of it on one node) are within
+  max_resource_gap dots of each other,
+- the top_nodes best base scores are within max_top_spread of each other.
+"""
+import random
+from dataclasses import asdict, dataclass, fields
+
+import numpy as np
+
+from .algorithm import (
+    BOARD_RESOURCES, BOARD_ROLLS, DESERT, EXPANSION_LAYOUT, EXPANSION_RESOURCES, EXPANSION_ROLLS, RESOURCE_INDEX,
+    RESOURCES, ROLL_DOTS_ARRAY, STANDARD_LAYOUT, active_weights, board_codes, get_layout, score_boards,
+)
+
+# Tiles and number tokens of each layout that boards can be generated for
+TILE_SETS = {
+    STANDARD_LAYOUT.name: (BOARD_RESOURCES, BOARD_ROLLS),
+    EXPANSION_LAYOUT.name: (EXPANSION_RESOURCES, EXPANSION_ROLLS),
+}
+
+RED_ROLLS = (6, 8)
+GENERATE_BATCH_SIZE = 256
+# Attempts at one phase (tiles or tokens) before giving up on the constraints
+MAX_RESTARTS = 1000
+# Candidates built before the acceptance rate so far decides whether count is reachable
+ACCEPTANCE_SAMPLE = 4 * GENERATE_BATCH_SIZE
+
+
+@dataclass(frozen=True)
+class FairnessConstraints:
+    """
+    What makes a generated board fair. A limit of None switches that
+    constraint off. With the defaults, about two in five boards that pass
+    the local rules also pass the score-based ones.
+    """
+    no_adjacent_red: bool = True
+    no_adjacent_equal: bool = False
+    max_cluster: int = 2
+    max_resource_gap: int = 4
+    top_nodes: int = 5
+    max_top_spread: float = 2.0
+
+    def __post_init__(self):
+        if self.max_cluster is not None and self.max_cluster < 1:
+            raise ValueError("max_cluster must be at least 1")
+        # top_nodes is a count, not a limit, so it cannot be switched off
+        if self.top_nodes is None or self.top_nodes < 2:
+            raise ValueError("top_nodes must be at least 2")
+
+    @classmethod
+    def from_dict(cls, data) -> "FairnessConstraints":
+        """
+        Constraints from a dict or query string; missing entries keep their
+        defaults, and "none" (or an empty value) switches a limit off.
+        """
+        kwargs = {}
+        for field in fields(cls):
+            if field.name not in data:
+                continue
+            value = data[field.name]
+            if isinstance(value, str):
+                value = value.strip().lower()
+                if field.type is bool:
+                    value = value not in ("", "0", "false", "no")
+                elif value in ("", "none"):
+                    value = None
+            if value is not None and field.type is not bool:
+                value = int(value) if field.type is int else float(value)
+            kwargs[field.name] = value
+        return cls(**kwargs)
+
+    def to_dict(self) -> dict:
+        return asdict(self)
+
+
+DEFAULT_CONSTRAINTS = FairnessConstraints()
+
+
+class BoardGenerator:
+    """
+    Endless source of fair boards on one layout, as (resources, rolls) arrays.
+    The same seed and constraints always give the same boards.
+    """
+
+    def __init__(self, layout=STANDARD_LAYOUT, constraints: FairnessConstraints = DEFAULT_CONSTRAINTS,
+                 seed: int = None, weights=None, batch_size: int = GENERATE_BATCH_SIZE):
+        if layout.name not in TILE_SETS:
+            raise ValueError(f"No tile set for the {layout.name} layout")
+        self.layout = layout
+        self.constraints = constraints
+        self.weights = weights or active_weights()
+        self.batch_size = batch_size
+        self.rng = random.Random(seed)
+        tiles, tokens = TILE_SETS[layout.name]
+        self._tiles = [RESOURCE_INDEX[tile] for tile in tiles]
+        self._tokens = list(tokens)
+        self._neighbors = layout.hex_neighbors
+        self.candidates = 0  # boards that passed the local rules
+        self.restarts = 0    # phases that ran out of legal placements
+
+    # --- Local constraints, checked per placement ---
+
+    def _cluster_size(self, hex_index: int, resource: int, resources: list) -> int:
+        """Size of the group of `resource` hexes that placing it on hex_index would make."""
+        seen, stack = {hex_index}, [hex_index]
+        while stack:
+            for n in self._neighbors[stack.pop()]:
+                if n not in seen and resources[n] == resource:
+                    seen.add(n)
+                    stack.append(n)
+        return len(seen)
+
+    def _place_tiles(self) -> list:
+        limit = self.constraints.max_cluster
+        for _ in range(MAX_RESTARTS):
+            tiles = self._tiles[:]
+            self.rng.shuffle(tiles)
+            resources = [None] * self.layout.hex_count
+            for h in range(self.layout.hex_count):
+                for i, tile in enumerate(tiles):
+                    if limit is None or tile == DESERT or self._cluster_size(h, tile, resources) <= limit:
+                        resources[h] = tiles.pop(i)
+                        break
+                else:
+                    break
+            else:
+                return resources
+            self.restarts += 1
+        raise ValueError("Could not place the tiles within max_cluster; loosen the constraints")
+
+    def _token_fits(self, hex_index: int, token: int, rolls: list) -> bool:
+        neighbours = [rolls[n] for n in self._neighbors[hex_index]]
+        if self.constraints.no_adjacent_red and token in RED_ROLLS and any(r in RED_ROLLS for r in neighbours):
+            return False
+        return not (self.constraints.no_adjacent_equal and token in neighbours)
+
+    def _place_tokens(self, resources: list) -> list:
+        land = [h for h, resource in enumerate(resources) if resource != DESERT]
+        for _ in range(MAX_RESTARTS):
+            tokens = self._tokens[:]
+            self.rng.shuffle(tokens)
+            # The most constrained tokens go first, while there is room for them
+            tokens.sort(key=lambda token: token not in RED_ROLLS)
+            free = land[:]
+            self.rng.shuffle(free)
+            rolls = [0] * self.layout.hex_count
+            for token in tokens:
+                for i, h in enumerate(free):
+                    if self._token_fits(h, token, rolls):
+                        rolls[free.pop(i)] = token
+                        break
+                else:
+                    break
+            else:
+                return rolls
+            self.restarts += 1
+        raise ValueError("Could not place the number tokens; loosen the constraints")
+
+    # --- Whole-board constraints, checked per batch ---
+
+    def _fair(self, resources: np.ndarray, rolls: np.ndarray) -> np.ndarray:
+        """(B,) mask of the boards that meet the score-based constraints."""
+        constraints = self.constraints
+        keep = np.ones(len(resources), dtype=bool)
+        if constraints.max_resource_gap is not None:
+            dots = np.concatenate([ROLL_DOTS_ARRAY[rolls], np.zeros((len(rolls), 1), dtype=np.int64)], axis=1)
+            padded = np.concatenate([resources, np.full((len(resources), 1), DESERT)], axis=1)
+            best = np.stack([
+                (dots * (padded == r))[:, self.layout.node_hex_index].sum(axis=2).max(axis=1)
+                for r in range(DESERT)
+            ], axis=1)
+            keep &= best.max(axis=1) - best.min(axis=1) <= constraints.max_resource_gap
+        if constraints.max_top_spread is not None:
+            base = score_boards(resources, rolls, 0, self.weights, self.layout)
+            top = -np.partition(-base, constraints.top_nodes - 1, axis=1)[:, :constraints.top_nodes]
+            keep &= top.max(axis=1) - top.min(axis=1) <= constraints.max_top_spread + 1e-9
+        return keep
+
+    def batch(self) -> tuple:
+        """(resources, rolls) arrays of the fair boards among batch_size candidates."""
+        resources, rolls = [], []
+        for _ in range(self.batch_size):
+            tiles = self._place_tiles()
+            resources.append(tiles)
+            rolls.append(self._place_tokens(tiles))
+        self.candidates += self.batch_size
+        resources = np.array(resources, dtype=np.int64)
+        rolls = np.array(rolls, dtype=np.int64)
+        keep = self._fair(resources, rolls)
+        return resources[keep], rolls[keep]
+
+    def generate(self, count: int, max_candidates: int = None):
+        """
+        Yield (resources, rolls) arrays, a batch at a time, until `count` fair
+        boards have been produced. Nothing is yielded before ACCEPTANCE_SAMPLE
+        candidates have been built. From then on, raises ValueError as soon as
+        the acceptance rate so far says count boards will not fit in
+        max_candidates candidates (default: 1000 per board), so constraints
+        nothing can meet fail fast instead of hanging the caller.
+        """
+        max_candidates = max_candidates or 1000 * max(count, 1)
+        sample = min(ACCEPTANCE_SAMPLE, max_candidates)
+        accepted = produced = 0
+        held = []
+        while produced < count:
+            resources, rolls = self.batch()
+            accepted += len(resources)
+            resources, rolls = resources[:count - produced], rolls[:count - produced]
+            if len(resources):
+                produced += len(resources)
+                held.append((resources, rolls))
+            if produced < count and self.candidates >= sample:
+                needed = (count - produced) * self.candidates / accepted if accepted else float("inf")
+                if self.candidates + needed > max_candidates:
+                    raise ValueError(f"Constraints too strict: {accepted} of {self.candidates} candidates "
+                                     f"met them, too few for {count} boards in {max_candidates} "
+                                     f"candidates; loosen them")
+            if produced >= count or self.candidates >= sample:
+                yield from held
+                held = []
+
+
+def board_data_for(resources, rolls) -> list:
+    """board_data ({resource, roll, index} dicts) for one board's arrays."""
+    return [
+        {"resource": RESOURCES[resource], "roll": roll or None, "index": h}
+        for h, (resource, roll) in enumerate(zip(resources.tolist(), rolls.tolist()))
+    ]
+
+
+def iter_generated_boards(count: int, layout: str = STANDARD_LAYOUT.name, constraints: FairnessConstraints = None,
+                          seed: int = None, weights=None, max_candidates: int = None):
+    """
+    Iterator of {code, board_data} for `count` fair boards on the named
+    layout, without holding them all. An unknown layout raises ValueError
+    here rather than on the first board; constraints too strict for
+    max_candidates (see BoardGenerator.generate) raise it on the first board.
+    """
+    generator = BoardGenerator(get_layout(layout), constraints or DEFAULT_CONSTRAINTS, seed, weights)
+
+    def boards():
+        for resources, rolls in generator.generate(count, max_candidates):
+            for code, r, x in zip(board_codes(resources, rolls, generator.layout), resources, rolls):
+                yield {"code": code, "board_data": board_data_for(r, x)}
+
+    return boards()
+
+
+def generate_boards(count: int, layout: str = STANDARD_LAYOUT.name, constraints: FairnessConstraints = None,
+                    seed: int = None, weights=None) -> list:
+    """`count` fair boards as {code, board_data} dicts."""
+    return list(iter_generated_boards(count, layout, constraints, seed, weights))
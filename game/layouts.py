@@ -0,0 +1,269 @@
+"""
+Board layouts compiled from axial hex coordinates.
+
+A layout is its land hexes in axial (q, r) coordinates, listed in hex index
+order, plus the ports on its coast. Everything the scorer, the draft search
+and the board codes need is derived from those coordinates:
+
+- the hexes next to each hex,
+- the nodes (hex corners) and the hexes each node touches,
+- the nodes one road apart, and the distance-rule block masks,
+- the nodes 1, 2 and 3 roads from each node, as bitmasks,
+- the edges and the coast, walked in order around the board,
+- the rotations and reflections that map the board onto itself.
+
+compile_layout() caches the result, so each layout is compiled once per
+process and scoring costs the same per node on every layout.
+
+Positions are cube coordinates scaled by 6. Hex centres, corners and edge
+midpoints (every point a board can be symmetric about) are then all
+integers, and the symmetries are plain integer permutations and negations.
+Nodes are numbered the way the board page numbers them: corners are grouped
+into node rows (pairs of corner heights) and read left to right.
+"""
+import hashlib
+import itertools
+from functools import lru_cache
+
+import numpy as np
+
+# Axial offsets of the six hexes around a hex
+_AXIAL_DIRECTIONS = ((1, 0), (-1, 0), (0, 1), (0, -1), (1, -1), (-1, 1))
+# Centre-to-corner offsets in cube coordinates scaled by 6
+_CORNER_OFFSETS = ((4, -2, -2), (-4, 2, 2), (-2, 4, -2), (2, -4, 2), (-2, -2, 4), (2, 2, -4))
+# Roads out from a node that node_reach covers
+MAX_REACH_ROADS = 3
+
+
+def _cube(q: int, r: int) -> tuple:
+    """Scaled cube position of the centre of hex (q, r)."""
+    return (6 * q, -6 * q - 6 * r, 6 * r)
+
+
+def hex_rows(widths) -> tuple:
+    """
+    Axial coordinates, row by row, of a board whose rows widen by one hex per
+    row up to the widest row and narrow by one after it: (3, 4, 5, 4, 3) is
+    the standard board and (3, 4, 5, 6, 5, 4, 3) the 5-6 player one.
+    """
+    middle = max(range(len(widths)), key=lambda i: widths[i])
+    first = -(widths[middle] // 2)
+    last = first + widths[middle] - 1
+    coords = []
+    for i, width in enumerate(widths):
+        r = i - middle
+        start = last - width + 1 if r < 0 else first
+        coords.extend((q, r) for q in range(start, start + width))
+    return tuple(coords)
+
+
+class BoardLayout:
+    """
+    Compiled topology of one layout (see compile_layout). Node-indexed
+    attributes are tuples or arrays of length node_count.
+    """
+
+    def __init__(self, name: str, hex_coords: tuple, ports: tuple = ()):
+        self.name = name
+        self.hex_coords = hex_coords
+        self.hex_count = len(hex_coords)
+        if len(set(hex_coords)) != self.hex_count:
+            raise ValueError("Layout has the same hex twice")
+        # Production never depends on ports, so this only hashes the hexes
+        self.fingerprint = hashlib.sha256(repr(hex_coords).encode()).hexdigest()[:16]
+
+        # Hexes sharing an edge (axial neighbours)
+        hex_index = {coords: h for h, coords in enumerate(hex_coords)}
+        self.hex_neighbors = tuple(
+            tuple(sorted(hex_index[q + dq, r + dr] for dq, dr in _AXIAL_DIRECTIONS if (q + dq, r + dr) in hex_index))
+            for q, r in hex_coords
+        )
+
+        centres = [_cube(q, r) for q, r in hex_coords]
+        corner_hexes = {}
+        for h, (x, y, z) in enumerate(centres):
+            for dx, dy, dz in _CORNER_OFFSETS:
+                corner_hexes.setdefault((x + dx, y + dy, z + dz), []).append(h)
+
+        heights = sorted({corner[2] for corner in corner_hexes})
+        self.node_vertices = tuple(sorted(corner_hexes, key=lambda c: (heights.index(c[2]) // 2, 2 * c[0] + c[2])))
+        self.node_count = len(self.node_vertices)
+        self.node_hexes = tuple(tuple(sorted(corner_hexes[vertex])) for vertex in self.node_vertices)
+
+        # node → hex indices, padded with a sentinel hex (index hex_count) that
+        # is always an unnumbered desert, so every node scores as three cells
+        self.node_hex_index = np.full((self.node_count, 3), self.hex_count, dtype=np.intp)
+        for node, hexes in enumerate(self.node_hexes):
+            self.node_hex_index[node, :len(hexes)] = hexes
+
+        # Neighbouring corners are exactly one corner offset apart
+        index = {vertex: n for n, vertex in enumerate(self.node_vertices)}
+        self.node_neighbors = tuple(
+            tuple(sorted(index[m] for m in ((x + dx, y + dy, z + dz) for dx, dy, dz in _CORNER_OFFSETS) if m in index))
+            for x, y, z in self.node_vertices
+        )
+        # Distance rule: settling node n blocks n and every neighbour (as a node bitmask)
+        self._neighbor_masks = tuple(sum(1 << m for m in neighbors) for neighbors in self.node_neighbors)
+        self.node_block_masks = tuple((1 << n) | self._neighbor_masks[n] for n in range(self.node_count))
+        self.edges = tuple((a, b) for a in range(self.node_count) for b in self.node_neighbors[a] if a < b)
+        self.node_reach = self._reach(MAX_REACH_ROADS)
+        self.coast = self._walk_coast()
+
+        port_types = dict(ports)
+        unknown = set(port_types) - set(range(self.node_count))
+        if unknown:
+            raise ValueError(f"Ports on unknown nodes: {sorted(unknown)}")
+        self.ports = tuple(port_types.get(node) for node in range(self.node_count))
+        self.node_has_port = np.array([1.0 if port else 0.0 for port in self.ports])
+
+        self.symmetries = self._symmetries(centres)
+        # For each symmetry, the source hex of every canonical hex position
+        self.source_hexes = tuple(tuple(np.argsort(hex_perm).tolist()) for hex_perm, _ in self.symmetries)
+
+        # Every unordered node pair the distance rule allows, as parallel index arrays
+        pairs = [(a, b) for a in range(self.node_count) for b in range(a + 1, self.node_count)
+                 if not self.node_block_masks[a] >> b & 1]
+        self.pair_first, self.pair_second = np.array(pairs, dtype=np.intp).reshape(-1, 2).T
+
+    def __repr__(self):
+        return f"<BoardLayout {self.name}: {self.hex_count} hexes, {self.node_count} nodes>"
+
+    def _reach(self, roads: int) -> tuple:
+        """
+        node_reach[k - 1][n]: bitmask of the nodes exactly k roads from node n
+        (breadth-first over the node graph), for k = 1..roads.
+        """
+        rings = []
+        seen = [1 << n for n in range(self.node_count)]
+        frontier = list(seen)
+        for _ in range(roads):
+            ring = []
+            for n in range(self.node_count):
+                reached = 0
+                bits = frontier[n]
+                while bits:
+                    low = bits & -bits
+                    reached |= self._neighbor_masks[low.bit_length() - 1]
+                    bits ^= low
+                ring.append(reached & ~seen[n])
+                seen[n] |= reached
+            rings.append(tuple(ring))
+            frontier = ring
+        return tuple(rings)
+
+    def _walk_coast(self) -> tuple:
+        """Coastal edges (edges with land on one side only), in order around the board."""
+        hexes = [set(h) for h in self.node_hexes]
+        coastal = [(a, b) for a, b in self.edges if len(hexes[a] & hexes[b]) == 1]
+        if not coastal:
+            return ()
+        by_node = {}
+        for edge in coastal:
+            for node in edge:
+                by_node.setdefault(node, []).append(edge)
+        ordered, node, edge = [], coastal[0][1], coastal[0]
+        while True:
+            ordered.append(edge)
+            following = [e for e in by_node[node] if e != edge]
+            if not following or following[0] == coastal[0] or len(ordered) == len(coastal):
+                break
+            edge = following[0]
+            node = edge[1] if edge[0] == node else edge[0]
+        return tuple(ordered)
+
+    def _symmetries(self, centres: list) -> tuple:
+        """
+        Rotations/reflections that map the board onto itself, about its centre,
+        as (hex_perm, node_perm) arrays where hex_perm[h] / node_perm[n] is the
+        image of hex h / node n. Index 0 is always the identity. Ports don't
+        constrain them: scores are remapped without ports and the port
+        bonuses are applied in the caller's frame.
+        """
+        total = [sum(axis) for axis in zip(*centres)]
+        if any(t % self.hex_count for t in total):
+            centre = None  # Not centred on a lattice point: only the identity
+        else:
+            centre = tuple(t // self.hex_count for t in total)
+
+        def rotate(c):
+            return (-c[2], -c[0], -c[1])
+
+        def reflect(c):
+            return (c[0], c[2], c[1])
+
+        hex_index = {centre_: h for h, centre_ in enumerate(centres)}
+        node_index = {vertex: n for n, vertex in enumerate(self.node_vertices)}
+        symmetries = []
+        for reflected, turns in itertools.product((False, True), range(6)):
+            if centre is None and (reflected or turns):
+                continue
+
+            def transform(p):
+                c = tuple(a - b for a, b in zip(p, centre)) if centre else p
+                if reflected:
+                    c = reflect(c)
+                for _ in range(turns):
+                    c = rotate(c)
+                return tuple(a + b for a, b in zip(c, centre)) if centre else c
+
+            hex_images = [hex_index.get(transform(c)) for c in centres]
+            node_images = [node_index.get(transform(v)) for v in self.node_vertices]
+            if None in hex_images or None in node_images:
+                continue
+            symmetries.append((np.array(hex_images, dtype=np.intp), np.array(node_images, dtype=np.intp)))
+        return tuple(symmetries)
+
+
+def coastal_ports(hex_coords: tuple, kinds: tuple) -> tuple:
+    """
+    (node, port type) pairs for a layout with len(kinds) ports spaced evenly
+    around its coast, each port covering both nodes of one coastal edge.
+    """
+    coast = _compile("", tuple(hex_coords), ()).coast
+    ports = []
+    for i, kind in enumerate(kinds):
+        a, b = coast[i * len(coast) // len(kinds)]
+        ports += [(a, kind), (b, kind)]
+    return tuple(sorted(ports))
+
+
+@lru_cache(maxsize=64)
+def _compile(name: str, hex_coords: tuple, ports: tuple) -> BoardLayout:
+    return BoardLayout(name, hex_coords, ports)
+
+
+def compile_layout(name: str, hex_coords, ports=()) -> BoardLayout:
+    """
+    The compiled BoardLayout for these hex coordinates and ports ({node:
+    type} or (node, type) pairs), built once per distinct layout.
+    """
+    ports = tuple(sorted(dict(ports).items()))
+    return _compile(name, tuple((int(q), int(r)) for q, r in hex_coords), ports)
+
+
+# --- Registry ---
+#
+# Named layouts get board codes and can be looked up by name or by their
+# coordinates. game.algorithm registers the standard and 5-6 player boards.
+
+LAYOUTS = {}
+_LAYOUTS_BY_COORDS = {}
+
+
+def register_layout(layout: BoardLayout) -> BoardLayout:
+    LAYOUTS[layout.name] = layout
+    _LAYOUTS_BY_COORDS.setdefault(layout.hex_coords, layout)
+    return layout
+
+
+def get_layout(name: str) -> BoardLayout:
+    try:
+        return LAYOUTS[name]
+    except KeyError:
+        raise ValueError(f"Unknown board layout {name!r}") from None
+
+
+def layout_for_coords(hex_coords) -> BoardLayout:
+    """The registered layout with exactly these coordinates, else a port-less custom one."""
+    hex_coords = tuple((int(q), int(r)) for q, r in hex_coords)
+    return _LAYOUTS_BY_COORDS.get(hex_coords) or compile_layout("custom", hex_coords)
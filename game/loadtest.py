@@ -0,0 +1,231 @@
+"""
+Load generator that replays draft traffic against a locally started server.
+
+Every simulated session is one player group drafting a seeded random board,
+sending the requests the board page sends:
+
+- page: GET / (the page itself; its static files are left to the web server),
+- board_scores: the initial fetchNodeScores, a GET of /api/scores/<code>/,
+- rescore: one POST to /api/calculate-scores/ per draft turn, carrying the
+  resources the player on turn already settles. These lists grow as the
+  snake draft goes on.
+
+The picks are planned before any timing starts. Each player takes one of the
+three best open nodes for them, chosen with the session's seed, so the same
+seed always replays the same traffic. local_server() starts gunicorn with a
+given server profile and worker count on a free port. run_load() replays the
+sessions from `concurrency` client threads, and reports throughput, error
+rate and p50/p95/p99 latency per endpoint. sweep() runs every combination of
+worker counts and concurrencies, which is what sizing a fleet needs.
+"""
+import http.client
+import json
+import os
+import random
+import socket
+import subprocess
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from urllib.parse import urlsplit
+
+from .benchmark import PROFILES, random_board
+
+ENDPOINTS = ("page", "board_scores", "rescore")
+PERCENTILES = (50, 95, 99)
+# Choices a simulated player considers on each turn, best first
+PICK_CHOICES = 3
+SERVER_START_TIMEOUT = 60
+
+
+def draft_session(seed: int, players: int = 4, page: bool = True) -> list:
+    """
+    One seeded session's requests, in order, as (endpoint, method, path,
+    body) tuples. Boards with more than four players are 5-6 player boards.
+    """
+    from .algorithm import calculate_node_scores, encode_board_code, layout_of
+    from .draft import snake_order
+
+    rng = random.Random(seed)
+    board_data = random_board(seed, expansion=players > 4)
+    layout = layout_of(board_data)
+
+    requests = []
+    if page:
+        requests.append(("page", "GET", "/", b""))
+    requests.append(("board_scores", "GET", f"/api/scores/{encode_board_code(board_data)}/", b""))
+
+    blocked = 0
+    owned = [[] for _ in range(players)]
+    for player in snake_order(players):
+        body = json.dumps({"board_data": board_data, "player_resources": owned[player]}).encode()
+        requests.append(("rescore", "POST", "/api/calculate-scores/", body))
+
+        scores = calculate_node_scores(board_data, owned[player])
+        open_nodes = sorted((n for n in scores if not blocked >> n & 1), key=lambda n: -scores[n]["score"])
+        node = rng.choice(open_nodes[:PICK_CHOICES])
+        blocked |= layout.node_block_masks[node]
+        owned[player] += [r for r in scores[node]["resource_set"] if r not in owned[player]]
+    return requests
+
+
+def percentile(ordered: list, q: float) -> float:
+    """Nearest-rank q-th percentile of an already sorted list."""
+    if not ordered:
+        return 0.0
+    rank = max(1, -(-len(ordered) * q // 100))
+    return ordered[int(rank) - 1]
+
+
+def summarize(latencies: list, errors: int, seconds: float) -> dict:
+    """Request count, error rate, throughput and latency percentiles of one endpoint."""
+    ordered = sorted(latencies)
+    summary = {
+        "requests": len(ordered),
+        "errors": errors,
+        "error_rate": round(errors / len(ordered), 4) if ordered else 0.0,
+        "throughput_rps": round(len(ordered) / seconds, 1) if seconds else 0.0,
+    }
+    for q in PERCENTILES:
+        summary[f"p{q}_ms"] = round(percentile(ordered, q) * 1000, 2)
+    return summary
+
+
+def run_load(base_url: str, sessions: int = 100, concurrency: int = 8, players: int = 4, seed: int = 0,
+             page: bool = True, timeout: float = 30) -> dict:
+    """
+    Replay `sessions` draft sessions (seeds seed, seed + 1, ...) against the
+    server at base_url from `concurrency` threads; returns the report.
+    A request fails on a connection error or a status of 400 or more.
+    """
+    plans = [draft_session(seed + i, players, page) for i in range(sessions)]
+    url = urlsplit(base_url)
+    latencies = {endpoint: [] for endpoint in ENDPOINTS}
+    errors = dict.fromkeys(ENDPOINTS, 0)
+    lock = threading.Lock()
+    pending = iter(plans)
+
+    def client():
+        connection = http.client.HTTPConnection(url.hostname, url.port or 80, timeout=timeout)
+        try:
+            while True:
+                with lock:
+                    plan = next(pending, None)
+                if plan is None:
+                    return
+                for endpoint, method, path, body in plan:
+                    headers = {"Content-Type": "application/json"} if body else {}
+                    start = time.perf_counter()
+                    try:
+                        connection.request(method, url.path.rstrip("/") + path, body or None, headers)
+                        response = connection.getresponse()
+                        response.read()
+                        failed = response.status >= 400
+                    except (OSError, http.client.HTTPException):
+                        connection.close()
+                        failed = True
+                    elapsed = time.perf_counter() - start
+                    with lock:
+                        latencies[endpoint].append(elapsed)
+                        errors[endpoint] += failed
+        finally:
+            connection.close()
+
+    threads = [threading.Thread(target=client, daemon=True) for _ in range(concurrency)]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    seconds = time.perf_counter() - start
+
+    endpoints = {
+        endpoint: summarize(latencies[endpoint], errors[endpoint], seconds)
+        for endpoint in ENDPOINTS if latencies[endpoint]
+    }
+    return {
+        "sessions": sessions,
+        "concurrency": concurrency,
+        "players": players,
+        "seconds": round(seconds, 3),
+        "sessions_per_second": round(sessions / seconds, 2) if seconds else 0.0,
+        "endpoints": endpoints,
+        "total": summarize([t for ts in latencies.values() for t in ts], sum(errors.values()), seconds),
+    }
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def _wait_until_up(process, port: int, timeout: float):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f"The server exited with status {process.returncode}")
+        connection = http.client.HTTPConnection("127.0.0.1", port, timeout=1)
+        try:
+            connection.request("GET", "/api/cache-stats/")
+            if connection.getresponse().status == 200:
+                return
+        except OSError:
+            pass
+        finally:
+            connection.close()
+        time.sleep(0.1)
+    raise RuntimeError(f"The server did not answer within {timeout:.0f} seconds")
+
+
+@contextmanager
+def local_server(profile: str = "full", workers: int = 1, timeout: float = SERVER_START_TIMEOUT):
+    """
+    Run gunicorn with a server profile (see benchmark.PROFILES) and `workers`
+    workers on a free local port; yields its base URL.
+    """
+    from django.conf import settings
+
+    if profile not in PROFILES:
+        raise ValueError(f"Unknown profile {profile!r}; choose from {', '.join(PROFILES)}")
+    port = _free_port()
+    env = dict(os.environ)
+    env.pop("DJANGO_SETTINGS_MODULE", None)
+    env["ALLOWED_HOSTS"] = "127.0.0.1,localhost"
+    command = [sys.executable, "-m", "gunicorn"]
+    if profile == "api":
+        command += ["-c", "config/gunicorn_api.py"]
+    command += ["--workers", str(workers), "--bind", f"127.0.0.1:{port}", "--preload",
+                "--log-level", "warning", f"{PROFILES[profile]}:application"]
+
+    process = subprocess.Popen(command, cwd=settings.BASE_DIR, env=env)
+    try:
+        _wait_until_up(process, port, timeout)
+        yield f"http://127.0.0.1:{port}"
+    finally:
+        process.terminate()
+        try:
+            process.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            process.kill()
+            process.wait()
+
+
+def sweep(workers=(1,), concurrency=(8,), profile: str = "full", warm_up_sessions: int = 2, **load) -> list:
+    """
+    run_load() for every worker count and concurrency, on a fresh server per
+    worker count; returns the reports, each with its "workers" and "profile".
+    Each server first replays `warm_up_sessions` untimed sessions on boards
+    of their own, so one-off first-request costs stay out of the latencies.
+    """
+    reports = []
+    for count in workers:
+        with local_server(profile, count) as base_url:
+            if warm_up_sessions:
+                run_load(base_url, warm_up_sessions, concurrency=1, players=load.get("players", 4),
+                         seed=-warm_up_sessions, page=load.get("page", True))
+            for clients in concurrency:
+                report = run_load(base_url, concurrency=clients, **load)
+                reports.append({"profile": profile, "workers": count, **report})
+    return reports
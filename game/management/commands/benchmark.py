@@ -0,0 +1,74 @@
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+
+from game.benchmark import (
+    BENCHMARKS, DEFAULT_THRESHOLD, PROFILES, compare_profiles, compare_results, golden_corpus, run_benchmarks,
+)
+
+
+class Command(BaseCommand):
+    help = "Time the scoring engine and API, and flag regressions against an earlier run"
+
+    def add_arguments(self, parser):
+        parser.add_argument("cases", nargs="*", help=f"Benchmarks to run (default: all): {', '.join(BENCHMARKS)}")
+        parser.add_argument("--output", default="benchmark-results.json", help="JSON results file to write")
+        parser.add_argument("--baseline", help="Earlier results file to compare against")
+        parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                            help="Flag cases whose median exceeds threshold × the baseline median")
+        parser.add_argument("--repeat", type=int, default=5, help="Timed runs per benchmark")
+        parser.add_argument("--quick", action="store_true", help="Skip the 100k-board batch")
+        parser.add_argument("--profiles", action="store_true",
+                            help=f"Compare startup and per-request overhead of the {' and '.join(PROFILES)} "
+                                 "server profiles instead")
+        parser.add_argument("--write-golden", metavar="PATH",
+                            help="Write today's golden scores to PATH instead of benchmarking")
+
+    def handle(self, *args, **options):
+        if options["write_golden"]:
+            with open(options["write_golden"], "w") as f:
+                # One board per line keeps diffs of the golden file readable
+                f.write("[\n" + ",\n".join(json.dumps(entry) for entry in golden_corpus()) + "\n]\n")
+            self.stdout.write(f"Wrote golden scores to {options['write_golden']}")
+            return
+
+        if options["profiles"]:
+            results = {"profiles": compare_profiles(runs=options["repeat"])}
+            for name, result in results["profiles"].items():
+                self.stdout.write(
+                    f"{name:6} startup {result['startup_ms']:>8.1f} ms (warm-up {result['warm_up_ms']:.1f} ms)   "
+                    f"first request {result['first_request_us'] / 1000:>7.1f} ms   "
+                    f"scores {result['post_scores_us']:>8.1f} µs   overhead {result['overhead_us']:>6.1f} µs"
+                )
+            with open(options["output"], "w") as f:
+                json.dump(results, f, indent=2)
+                f.write("\n")
+            self.stdout.write(f"Wrote {options['output']}")
+            return
+
+        unknown = set(options["cases"]) - set(BENCHMARKS)
+        if unknown:
+            raise CommandError(f"Unknown benchmark(s): {', '.join(sorted(unknown))}")
+
+        results = run_benchmarks(options["cases"], options["repeat"], options["quick"])
+
+        for name, result in results["cases"].items():
+            self.stdout.write(f"{name:24} median {result['median_us']:>12.1f} µs   min {result['min_us']:>12.1f} µs")
+
+        if options["baseline"]:
+            with open(options["baseline"]) as f:
+                baseline = json.load(f)
+            results["regressions"] = compare_results(results, baseline, options["threshold"])
+
+        with open(options["output"], "w") as f:
+            json.dump(results, f, indent=2)
+            f.write("\n")
+        self.stdout.write(f"Wrote {options['output']}")
+
+        for regression in results.get("regressions", []):
+            self.stderr.write(
+                f"REGRESSION {regression['name']}: {regression['baseline_us']} µs → "
+                f"{regression['current_us']} µs (×{regression['ratio']})"
+            )
+        if results.get("regressions"):
+            raise CommandError(f"{len(results['regressions'])} benchmark(s) slower than ×{options['threshold']}")
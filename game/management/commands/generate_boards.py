@@ -0,0 +1,54 @@
+import json
+import sys
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from game.algorithm import LAYOUTS
+from game.generator import TILE_SETS, FairnessConstraints, iter_generated_boards
+
+CONSTRAINT_OPTIONS = ("max_cluster", "max_resource_gap", "top_nodes", "max_top_spread")
+
+
+class Command(BaseCommand):
+    help = "Generate fair random boards, one board code or JSON board per line (the import_boards input format)"
+
+    def add_arguments(self, parser):
+        parser.add_argument("count", type=int, help="Boards to generate")
+        parser.add_argument("--output", default="-", help="File to write ('-' for stdout)")
+        parser.add_argument("--format", choices=("codes", "jsonl"), default="codes",
+                            help="Board codes, or {code, board_data} JSON objects")
+        parser.add_argument("--layout", choices=[name for name in LAYOUTS if name in TILE_SETS], default="standard")
+        parser.add_argument("--seed", type=int)
+        parser.add_argument("--allow-adjacent-red", action="store_true", help="Allow 6s and 8s side by side")
+        parser.add_argument("--no-adjacent-equal", action="store_true", help="Forbid equal numbers side by side")
+        for name in CONSTRAINT_OPTIONS:
+            parser.add_argument(f"--{name.replace('_', '-')}", dest=name, metavar="LIMIT",
+                                help="See game.generator.FairnessConstraints ('none' switches it off)")
+
+    def handle(self, *args, **options):
+        values = {name: options[name] for name in CONSTRAINT_OPTIONS if options[name] is not None}
+        values["no_adjacent_red"] = not options["allow_adjacent_red"]
+        values["no_adjacent_equal"] = options["no_adjacent_equal"]
+        try:
+            constraints = FairnessConstraints.from_dict(values)
+            boards = iter_generated_boards(options["count"], options["layout"], constraints, options["seed"])
+        except ValueError as e:
+            raise CommandError(e)
+
+        stream = sys.stdout if options["output"] == "-" else open(options["output"], "w")
+        start = time.perf_counter()
+        written = 0
+        try:
+            for board in boards:
+                stream.write((board["code"] if options["format"] == "codes" else json.dumps(board)) + "\n")
+                written += 1
+        except ValueError as e:
+            raise CommandError(e)
+        finally:
+            if stream is not sys.stdout:
+                stream.close()
+
+        self.stderr.write(self.style.SUCCESS(
+            f"Generated {written} boards ({written / (time.perf_counter() - start):.0f} boards/s)"
+        ))
@@ -0,0 +1,146 @@
+import os
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+
+from game.algorithm import active_weights
+from game.analytics import LOG_FORMATS, aggregate, iter_game_logs, score_games
+from game.models import Game, NodeOutcome, Placement, ScoreOutcome
+
+# Stay under SQLite's bound-parameter limit when looking up existing games
+LOOKUP_SLICE = 900
+
+
+def _chunks(records, size: int):
+    chunk = []
+    for record in records:
+        chunk.append(record)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def _insert_sql(model, fields: list, conflict: str) -> str:
+    table = connection.ops.quote_name(model._meta.db_table)
+    columns = ", ".join(connection.ops.quote_name(model._meta.get_field(f).column) for f in fields)
+    placeholders = ", ".join(["%s"] * len(fields))
+    return f"INSERT INTO {table} ({columns}) VALUES ({placeholders}) {conflict}"
+
+
+def _upsert_sql(model, key: tuple) -> str:
+    """Insert an aggregate row, or add its counts to the row already there."""
+    quote = connection.ops.quote_name
+    table = quote(model._meta.db_table)
+    updates = ", ".join(f"{quote(c)} = {table}.{quote(c)} + excluded.{quote(c)}"
+                        for c in ("placements", "wins", "vp_total"))
+    return _insert_sql(model, [*key, "placements", "wins", "vp_total"],
+                       f"ON CONFLICT ({', '.join(quote(k) for k in key)}) DO UPDATE SET {updates}")
+
+
+class Command(BaseCommand):
+    help = "Ingest historical game logs into placement facts and win-rate aggregates"
+
+    def add_arguments(self, parser):
+        parser.add_argument("path", help="JSONL or CSV game log ('-' for stdin)")
+        parser.add_argument("--format", choices=LOG_FORMATS,
+                            help="Log format (default: from the file extension, else jsonl)")
+        parser.add_argument("--chunk-size", type=int, default=5000, help="Games scored and written per chunk")
+        parser.add_argument("--workers", type=int, default=1,
+                            help="Scoring processes (0 for CPU count; 1 scores in this process)")
+
+    def handle(self, *args, **options):
+        path = options["path"]
+        log_format = options["format"] or ("csv" if path.lower().endswith(".csv") else "jsonl")
+        if path == "-":
+            stream = sys.stdin
+        else:
+            try:
+                stream = open(path, newline="")
+            except OSError as e:
+                raise CommandError(e)
+
+        if connection.vendor == "sqlite" and not connection.in_atomic_block:
+            with connection.cursor() as cursor:
+                cursor.execute("PRAGMA journal_mode=WAL")
+                cursor.execute("PRAGMA synchronous=NORMAL")
+
+        chunks = _chunks(iter_game_logs(stream, log_format), options["chunk_size"])
+        workers = options["workers"] or os.cpu_count() or 1
+        self.totals = {"games": 0, "placements": 0, "skipped": 0, "errors": 0}
+        self.start = time.perf_counter()
+        try:
+            if workers > 1:
+                self._ingest_pooled(chunks, workers)
+            else:
+                for chunk in chunks:
+                    self._write_chunk(*score_games(chunk, active_weights()))
+        finally:
+            if stream is not sys.stdin:
+                stream.close()
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Ingested {self.totals['games']} games ({self.totals['placements']} placements); "
+            f"{self.totals['skipped']} already ingested, {self.totals['errors']} rejected"
+        ))
+
+    def _ingest_pooled(self, chunks, workers: int):
+        # At most two chunks per worker in flight, so memory stays bounded
+        # however long the log is; results are written in log order.
+        in_flight = deque()
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            for chunk in chunks:
+                in_flight.append(pool.submit(score_games, chunk, active_weights()))
+                if len(in_flight) >= workers * 2:
+                    self._write_chunk(*in_flight.popleft().result())
+            while in_flight:
+                self._write_chunk(*in_flight.popleft().result())
+
+    def _write_chunk(self, games: list, placements: list, errors: list):
+        for number, message in errors:
+            self.stderr.write(f"Line {number}: {message}" if number else message)
+        self.totals["errors"] += len(errors)
+
+        # Games already in the database (or repeated within the chunk) are
+        # dropped, so re-ingesting a log never counts a placement twice.
+        ids = [game[0] for game in games]
+        existing = set()
+        for i in range(0, len(ids), LOOKUP_SLICE):
+            existing.update(Game.objects.filter(game_id__in=ids[i:i + LOOKUP_SLICE]).values_list("game_id", flat=True))
+        new_games = {}
+        for game in games:
+            if game[0] not in existing and game[0] not in new_games:
+                new_games[game[0]] = game
+        self.totals["skipped"] += len(games) - len(new_games)
+        # Each game's placements are one contiguous run: keep only the first
+        # run of each new game
+        kept, started, keep, previous = [], set(), False, None
+        for placement in placements:
+            if placement[0] != previous:
+                previous = placement[0]
+                keep = previous in new_games and previous not in started
+                started.add(previous)
+            if keep:
+                kept.append(placement)
+        placements = kept
+        by_score, by_node = aggregate(placements)
+
+        with transaction.atomic(), connection.cursor() as cursor:
+            cursor.executemany(_insert_sql(Game, ["game_id", "board_code", "players", "winning_vp"],
+                                           "ON CONFLICT DO NOTHING"), list(new_games.values()))
+            cursor.executemany(_insert_sql(Placement, ["game", "player", "pick", "round", "node", "score", "vp", "won"],
+                                           ""), placements)
+            cursor.executemany(_upsert_sql(ScoreOutcome, ("round", "score_tenths")),
+                               [(*key, *totals) for key, totals in by_score.items()])
+            cursor.executemany(_upsert_sql(NodeOutcome, ("round", "node")),
+                               [(*key, *totals) for key, totals in by_node.items()])
+
+        self.totals["games"] += len(new_games)
+        self.totals["placements"] += len(placements)
+        self.stdout.write(f"{self.totals['games']} games ingested "
+                          f"({self.totals['games'] / (time.perf_counter() - self.start):.0f} games/s)")
@@ -0,0 +1,60 @@
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+
+from game.benchmark import PROFILES
+from game.loadtest import ENDPOINTS, run_load, sweep
+
+
+class Command(BaseCommand):
+    help = "Replay seeded draft sessions against a local gunicorn and report throughput and latency per endpoint"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--sessions", type=int, default=100, help="Draft sessions to replay per run")
+        parser.add_argument("--concurrency", type=int, nargs="+", default=[8],
+                            help="Concurrent clients; several values run one after another")
+        parser.add_argument("--workers", type=int, nargs="+", default=[1],
+                            help="gunicorn workers; several values start one server each")
+        parser.add_argument("--profile", choices=list(PROFILES), default="full", help="Server profile to start")
+        parser.add_argument("--players", type=int, default=4, help="Players per draft (5-6 use expansion boards)")
+        parser.add_argument("--seed", type=int, default=0, help="Seed of the first session's board")
+        parser.add_argument("--no-page", action="store_true", help="Leave out the page load of each session")
+        parser.add_argument("--url", help="Load an already running server instead of starting one")
+        parser.add_argument("--output", help="JSON file to write the reports to")
+
+    def handle(self, *args, **options):
+        if not 2 <= options["players"] <= 6:
+            raise CommandError("--players must be between 2 and 6")
+        load = {"sessions": options["sessions"], "players": options["players"], "seed": options["seed"],
+                "page": not options["no_page"]}
+        try:
+            if options["url"]:
+                reports = [{"url": options["url"], **run_load(options["url"], concurrency=clients, **load)}
+                           for clients in options["concurrency"]]
+            else:
+                reports = sweep(options["workers"], options["concurrency"], options["profile"], **load)
+        except RuntimeError as e:
+            raise CommandError(str(e))
+
+        for report in reports:
+            server = report.get("url") or f"{report['profile']} × {report['workers']} workers"
+            self.stdout.write(
+                f"{server}, {report['concurrency']} clients: {report['sessions_per_second']} sessions/s, "
+                f"{report['total']['throughput_rps']} requests/s"
+            )
+            for endpoint in (*ENDPOINTS, "total"):
+                result = report["endpoints"].get(endpoint) if endpoint != "total" else report["total"]
+                if result:
+                    self.stdout.write(
+                        f"  {endpoint:13} {result['requests']:>7} req  {result['throughput_rps']:>8.1f}/s   "
+                        f"p50 {result['p50_ms']:>7.2f} ms  p95 {result['p95_ms']:>7.2f} ms  "
+                        f"p99 {result['p99_ms']:>7.2f} ms   errors {result['error_rate']:.2%}"
+                    )
+
+        if options["output"]:
+            with open(options["output"], "w") as f:
+                json.dump({"reports": reports}, f, indent=2)
+                f.write("\n")
+            self.stdout.write(f"Wrote {options['output']}")
+        if any(report["total"]["errors"] for report in reports):
+            raise CommandError("Some requests failed; see the error rates above")
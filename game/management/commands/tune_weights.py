@@ -0,0 +1,84 @@
+import json
+import sys
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from game.algorithm import WEIGHT_PARAMETERS
+from game.analytics import LOG_FORMATS
+from game.tuning import (
+    SEARCH_METHODS, OutcomeDataset, games_from_database, games_from_log, tune, weights_file, write_weights_file,
+)
+
+
+class Command(BaseCommand):
+    help = "Fit the scoring weights to historical game outcomes"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--log", help="JSONL or CSV game log to fit ('-' for stdin; default: ingested games)")
+        parser.add_argument("--format", choices=LOG_FORMATS, help="Log format (default: from the file extension)")
+        parser.add_argument("--method", choices=SEARCH_METHODS, default="coordinate", help="Search method")
+        parser.add_argument("--params", default=",".join(WEIGHT_PARAMETERS),
+                            help="Comma-separated weights to search (the rest keep their defaults)")
+        parser.add_argument("--steps", type=int, default=5, help="Values per parameter for grid/coordinate search")
+        parser.add_argument("--trials", type=int, default=200, help="Candidates for random search")
+        parser.add_argument("--rounds", type=int, default=3, help="Passes over the parameters for coordinate search")
+        parser.add_argument("--folds", type=int, default=5, help="Cross-validation folds (1 to skip)")
+        parser.add_argument("--seed", type=int, default=0)
+        parser.add_argument("--workers", type=int, default=1, help="Evaluation processes (0 for CPU count)")
+        parser.add_argument("--output", default="tuned-weights.json", help="Where to write the result")
+        parser.add_argument("--install", action="store_true",
+                            help="Also write the result to SCORING_WEIGHTS_PATH, where running servers pick it up")
+
+    def handle(self, *args, **options):
+        params = tuple(name for name in options["params"].split(",") if name)
+        unknown = set(params) - set(WEIGHT_PARAMETERS)
+        if unknown or not params:
+            raise CommandError(f"--params must be some of {', '.join(WEIGHT_PARAMETERS)}")
+        if options["install"] and not settings.SCORING_WEIGHTS_PATH:
+            raise CommandError("--install needs SCORING_WEIGHTS_PATH")
+
+        start = time.perf_counter()
+        if options["log"]:
+            path = options["log"]
+            log_format = options["format"] or ("csv" if path.lower().endswith(".csv") else "jsonl")
+            if path == "-":
+                games, rejected = games_from_log(sys.stdin, log_format)
+            else:
+                try:
+                    with open(path, newline="") as stream:
+                        games, rejected = games_from_log(stream, log_format)
+                except OSError as e:
+                    raise CommandError(e)
+            if rejected:
+                self.stderr.write(f"Skipped {rejected} unreadable games")
+        else:
+            games = games_from_database()
+        if not games:
+            raise CommandError("No games to fit (ingest some with `manage.py ingest_games`, or pass --log)")
+
+        dataset = OutcomeDataset(games)
+        self.stdout.write(f"{dataset.games} games, {dataset.placements} placements, "
+                          f"{len(dataset.pair_better)} player pairs ({time.perf_counter() - start:.1f}s)")
+
+        report = tune(
+            dataset, options["method"], folds=options["folds"], workers=options["workers"], seed=options["seed"],
+            params=params, steps=options["steps"], trials=options["trials"], rounds=options["rounds"],
+        )
+        write_weights_file(options["output"], report)
+        if options["install"]:
+            write_weights_file(settings.SCORING_WEIGHTS_PATH, report)
+            weights_file.refresh(force=True)
+
+        cv = report["cross_validation"]
+        self.stdout.write(json.dumps(report["weights"], indent=2))
+        self.stdout.write(
+            f"{report['evaluations']} candidates in {time.perf_counter() - start:.1f}s. "
+            f"Concordance {report['score']} (defaults {report['baseline_score']})"
+            + (f", held out {cv['mean']} (defaults {cv['baseline_mean']})" if cv["folds"] else "")
+        )
+        self.stdout.write(self.style.SUCCESS(
+            f"Wrote {options['output']}" + (f" and installed it at {settings.SCORING_WEIGHTS_PATH}"
+                                             if options["install"] else "")
+        ))
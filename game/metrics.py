@@ -0,0 +1,126 @@
+"""
+Per-request stage timings, reported as Server-Timing headers and latency histograms.
+
+Code on the hot path wraps each stage in `with stage("name"):`. While metrics
+are disabled, stage() returns a shared no-op context manager, so the cost is
+one global lookup. While they are enabled, ServerTimingMiddleware collects
+the stages of the current request and sends them back as a Server-Timing
+header. Every stage, plus the request total, is also added to a histogram
+labelled by view, and render_metrics() prints those histograms in the
+Prometheus text format.
+
+Histograms live in process memory, so each server process reports its own.
+This module imports nothing from Django, so game.algorithm can use it.
+"""
+import threading
+import time
+from bisect import bisect_left
+from contextlib import nullcontext
+from contextvars import ContextVar
+
+ENABLED = False
+
+# Upper bounds in seconds; the +Inf bucket is implicit
+BUCKETS = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+METRIC_NAME = "settler_request_stage_seconds"
+
+_NULL_STAGE = nullcontext()
+_current = ContextVar("request_stages", default=None)
+
+
+def configure(enabled: bool):
+    global ENABLED
+    ENABLED = bool(enabled)
+
+
+class _Stage:
+    __slots__ = ("name", "start")
+
+    def __init__(self, name: str):
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+
+    def __exit__(self, *exc):
+        stages = _current.get()
+        if stages is not None:
+            stages.append((self.name, time.perf_counter() - self.start))
+
+
+def stage(name: str):
+    """Context manager timing one stage of the current request (no-op while disabled)."""
+    if not ENABLED:
+        return _NULL_STAGE
+    return _Stage(name)
+
+
+def begin_request():
+    """Start collecting stages for this request/task; returns a token for end_request()."""
+    return _current.set([])
+
+
+def end_request(token) -> list:
+    """Stop collecting; returns the (name, seconds) stages recorded since begin_request()."""
+    stages = _current.get()
+    _current.reset(token)
+    return stages or []
+
+
+def server_timing(stages: list) -> str:
+    """Server-Timing header value, durations in milliseconds."""
+    return ", ".join(f"{name};dur={seconds * 1000:.3f}" for name, seconds in stages)
+
+
+class Histograms:
+    """Cumulative latency histograms keyed by (view, stage)."""
+
+    def __init__(self, buckets=BUCKETS):
+        self.buckets = buckets
+        self._lock = threading.Lock()
+        self._series = {}  # (view, stage) → [bucket counts..., +Inf count, sum]
+
+    def observe(self, view: str, stages: list):
+        with self._lock:
+            for name, seconds in stages:
+                series = self._series.get((view, name))
+                if series is None:
+                    series = self._series[(view, name)] = [0] * (len(self.buckets) + 1) + [0.0]
+                series[bisect_left(self.buckets, seconds)] += 1
+                series[-1] += seconds
+
+    def clear(self):
+        with self._lock:
+            self._series.clear()
+
+    def render(self) -> list:
+        """Prometheus text-format lines for every series."""
+        lines = [
+            f"# HELP {METRIC_NAME} Time spent in each stage of a scoring request.",
+            f"# TYPE {METRIC_NAME} histogram",
+        ]
+        with self._lock:
+            series = sorted((key, list(values)) for key, values in self._series.items())
+        for (view, name), values in series:
+            labels = f'view="{view}",stage="{name}"'
+            cumulative = 0
+            for bound, count in zip(self.buckets, values):
+                cumulative += count
+                lines.append(f'{METRIC_NAME}_bucket{{{labels},le="{bound}"}} {cumulative}')
+            cumulative += values[len(self.buckets)]
+            lines.append(f'{METRIC_NAME}_bucket{{{labels},le="+Inf"}} {cumulative}')
+            lines.append(f"{METRIC_NAME}_sum{{{labels}}} {values[-1]:.6f}")
+            lines.append(f"{METRIC_NAME}_count{{{labels}}} {cumulative}")
+        return lines
+
+
+histograms = Histograms()
+
+
+def render_metrics(gauges: dict = None) -> str:
+    """The metrics page: histograms plus optional {name: value} gauges."""
+    lines = histograms.render()
+    for name, value in (gauges or {}).items():
+        lines.append(f"# TYPE {name} gauge")
+        lines.append(f"{name} {value}")
+    return "\n".join(lines) + "\n"
@@ -0,0 +1,81 @@
+import time
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+
+from . import metrics
+from .tuning import weights_file
+
+
+class ServerTimingMiddleware:
+    """
+    Adds a Server-Timing header with the stages recorded by game.metrics.stage()
+    plus the request total, and adds them to the latency histograms.
+    Passes requests straight through while SCORING_METRICS_ENABLED is off.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        if not metrics.ENABLED:
+            return self.get_response(request)
+
+        token = metrics.begin_request()
+        start = time.perf_counter()
+        try:
+            response = self.get_response(request)
+        finally:
+            stages = metrics.end_request(token)
+        return self._finish(request, response, stages, start)
+
+    async def __acall__(self, request):
+        if not metrics.ENABLED:
+            return await self.get_response(request)
+
+        token = metrics.begin_request()
+        start = time.perf_counter()
+        try:
+            response = await self.get_response(request)
+        finally:
+            stages = metrics.end_request(token)
+        return self._finish(request, response, stages, start)
+
+    def _finish(self, request, response, stages, start):
+        stages.append(('total', time.perf_counter() - start))
+        response['Server-Timing'] = metrics.server_timing(stages)
+        match = getattr(request, 'resolver_match', None)
+        metrics.histograms.observe(match.url_name if match and match.url_name else 'other', stages)
+        return response
+
+
+class ScoringWeightsMiddleware:
+    """
+    Picks up new scoring weights from SCORING_WEIGHTS_PATH (see
+    game.tuning.WeightsFile) before each request, so an installed tuning
+    run takes effect without restarting the server.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        weights_file.refresh()
+        return self.get_response(request)
+
+    async def __acall__(self, request):
+        weights_file.refresh()
+        return await self.get_response(request)
@@ -0,0 +1,28 @@
+# Generated by Django 5.2.8 on 2026-10-17 20:41
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Board',
+            fields=[
+                ('code', models.CharField(max_length=20, primary_key=True, serialize=False)),
+                ('name', models.CharField(blank=True, max_length=100)),
+                ('components', models.BinaryField()),
+                ('max_production', models.FloatField()),
+                ('resource_spread', models.IntegerField()),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['max_production'], name='board_max_production_idx'), models.Index(fields=['resource_spread'], name='board_resource_spread_idx')],
+            },
+        ),
+    ]
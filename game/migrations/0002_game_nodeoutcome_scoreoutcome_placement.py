@@ -0,0 +1,68 @@
+# Generated by Django 5.2.8 on 2026-10-17 20:47
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('game', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Game',
+            fields=[
+                ('game_id', models.CharField(max_length=64, primary_key=True, serialize=False)),
+                ('board_code', models.CharField(db_index=True, max_length=20)),
+                ('players', models.PositiveSmallIntegerField()),
+                ('winning_vp', models.PositiveSmallIntegerField()),
+            ],
+        ),
+        migrations.CreateModel(
+            name='NodeOutcome',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('round', models.PositiveSmallIntegerField()),
+                ('node', models.PositiveSmallIntegerField()),
+                ('placements', models.PositiveIntegerField(default=0)),
+                ('wins', models.PositiveIntegerField(default=0)),
+                ('vp_total', models.PositiveBigIntegerField(default=0)),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('round', 'node'), name='node_outcome_key')],
+            },
+        ),
+        migrations.CreateModel(
+            name='ScoreOutcome',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('round', models.PositiveSmallIntegerField()),
+                ('score_tenths', models.IntegerField()),
+                ('placements', models.PositiveIntegerField(default=0)),
+                ('wins', models.PositiveIntegerField(default=0)),
+                ('vp_total', models.PositiveBigIntegerField(default=0)),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('round', 'score_tenths'), name='score_outcome_key')],
+            },
+        ),
+        migrations.CreateModel(
+            name='Placement',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('player', models.PositiveSmallIntegerField()),
+                ('pick', models.PositiveSmallIntegerField()),
+                ('round', models.PositiveSmallIntegerField()),
+                ('node', models.PositiveSmallIntegerField()),
+                ('score', models.FloatField()),
+                ('vp', models.PositiveSmallIntegerField()),
+                ('won', models.BooleanField()),
+                ('game', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='placements', to='game.game')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['score'], name='placement_score_idx'), models.Index(fields=['node', 'round'], name='placement_node_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,20 @@
+# Generated by Django 5.2.8 on 2026-10-17 20:51
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('game', '0002_game_nodeoutcome_scoreoutcome_placement'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='board',
+            name='weights',
+            # Boards saved so far were scored with the default weights
+            field=models.CharField(blank=True, default='9d19b0991d1728fe', max_length=16),
+            preserve_default=False,
+        ),
+    ]
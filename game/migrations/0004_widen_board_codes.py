@@ -0,0 +1,23 @@
+# Generated by Django 5.2.8 on 2026-10-17 21:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('game', '0003_board_weights'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='board',
+            name='code',
+            field=models.CharField(max_length=64, primary_key=True, serialize=False),
+        ),
+        migrations.AlterField(
+            model_name='game',
+            name='board_code',
+            field=models.CharField(db_index=True, max_length=64),
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 5.2.8 on 2026-10-17 21:07
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('game', '0004_widen_board_codes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DraftSnapshot',
+            fields=[
+                ('session_id', models.CharField(max_length=32, primary_key=True, serialize=False)),
+                ('board_data', models.JSONField()),
+                ('players', models.PositiveSmallIntegerField()),
+                ('picks', models.JSONField(default=list)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+        ),
+    ]
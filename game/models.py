@@ -1,3 +1,182 @@
+import numpy as np
 from django.db import models
 
-# Create your models here.
+from .algorithm import (
+    DESERT, ROLL_DOTS_ARRAY, active_weights, board_code, decode_board_code, encode_board, layout_of,
+    node_resource_masks, port_scores, production_scores,
+)
+from .cache import canonical_frame, from_canonical, pack_components, unpack_components
+
+# Room for a layout name in front of the code (see algorithm.board_codes)
+BOARD_CODE_MAX_LENGTH = 64
+
+
+def board_summaries(resources: np.ndarray, rolls: np.ndarray, production: np.ndarray) -> dict:
+    """
+    Indexed summary metrics for B boards (none depend on orientation), as
+    arrays: the best node's production score and the spread between the
+    most and least plentiful resource in dots.
+    """
+    dots = ROLL_DOTS_ARRAY[rolls]
+    resource_dots = np.stack([(dots * (resources == r)).sum(axis=1) for r in range(DESERT)], axis=1)
+    return {
+        "max_production": production.max(axis=1).round(4),
+        "resource_spread": resource_dots.max(axis=1) - resource_dots.min(axis=1),
+    }
+
+
+def board_summary(resources: np.ndarray, rolls: np.ndarray, production: np.ndarray) -> dict:
+    """board_summaries() for one board, as plain numbers."""
+    summary = board_summaries(resources[None], rolls[None], production[None])
+    return {"max_production": float(summary["max_production"][0]), "resource_spread": int(summary["resource_spread"][0])}
+
+
+class BoardManager(models.Manager):
+    def save_board(self, board_data, name: str = "", cache=None) -> tuple:
+        """
+        Store a board under its canonical code; returns (board, created).
+        A board already in the library (in any orientation) is returned as is.
+        Scores come from `cache` (a game.cache.ScoreCache) when it has them.
+        """
+        weights = active_weights()
+        layout = layout_of(board_data)
+        resources, rolls = encode_board(board_data, layout)
+        canonical_resources, canonical_rolls, _ = canonical_frame(resources, rolls, layout)
+        code = board_code(canonical_resources, canonical_rolls, layout)
+
+        board = self.filter(code=code).first()
+        if board is not None:
+            return board, False
+
+        if cache is not None:
+            production, masks = cache.components(canonical_resources, canonical_rolls, weights, layout)
+        else:
+            production = production_scores(canonical_resources[None], canonical_rolls[None], weights, layout)[0]
+            masks = node_resource_masks(canonical_resources[None], layout)[0]
+        board, created = self.get_or_create(code=code, defaults=dict(
+            name=name,
+            components=pack_components(production, masks),
+            weights=weights.production_fingerprint,
+            **board_summary(canonical_resources, canonical_rolls, production),
+        ))
+        return board, created
+
+    def find(self, board_data):
+        """(board, symmetry_index) for board_data in any orientation, or (None, None)."""
+        layout = layout_of(board_data)
+        resources, rolls = encode_board(board_data, layout)
+        canonical_resources, canonical_rolls, symmetry = canonical_frame(resources, rolls, layout)
+        board = self.filter(code=board_code(canonical_resources, canonical_rolls, layout)).first()
+        return (board, symmetry) if board is not None else (None, None)
+
+
+class Board(models.Model):
+    """
+    A saved board with its precomputed node vectors.
+
+    Rotations and reflections of a board share one row: the key is the board
+    code of the canonical orientation (game.cache.canonical_board), and
+    `components` holds the production scores and resource masks in that frame
+    (see game.cache.pack_components). Port bonuses are applied when loading,
+    since ports belong to the frame rather than the hexes. `weights` is the
+    production_fingerprint of the scoring weights `components` was computed
+    with; the summary columns keep the values from that time. Boards on any
+    registered layout can be saved (their codes carry the layout name).
+    """
+    code = models.CharField(max_length=BOARD_CODE_MAX_LENGTH, primary_key=True)
+    name = models.CharField(max_length=100, blank=True)
+    components = models.BinaryField()
+    weights = models.CharField(max_length=16, blank=True)
+    max_production = models.FloatField()
+    resource_spread = models.IntegerField()
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    objects = BoardManager()
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["max_production"], name="board_max_production_idx"),
+            models.Index(fields=["resource_spread"], name="board_resource_spread_idx"),
+        ]
+
+    def __str__(self):
+        return self.name or self.code
+
+    def node_components(self, symmetry: int = 0, weights=None) -> tuple:
+        """
+        (base, masks) node vectors for the orientation with this symmetry
+        index (0 is the canonical one). The board is only rescored when it
+        was saved under different production weights.
+        """
+        weights = weights or active_weights()
+        board_data = decode_board_code(self.code)
+        layout = layout_of(board_data)
+        production, masks = unpack_components(bytes(self.components))
+        if self.weights != weights.production_fingerprint:
+            resources, rolls = encode_board(board_data, layout)
+            production = production_scores(resources[None], rolls[None], weights, layout)[0]
+        production, masks = from_canonical(production, masks, symmetry, layout)
+        return port_scores(production, masks, weights, layout), masks
+
+
+# --- Game Log Analytics (see game/analytics.py) ---
+
+class Game(models.Model):
+    """One ingested game log entry."""
+    game_id = models.CharField(max_length=64, primary_key=True)
+    board_code = models.CharField(max_length=BOARD_CODE_MAX_LENGTH, db_index=True)
+    players = models.PositiveSmallIntegerField()
+    winning_vp = models.PositiveSmallIntegerField()
+
+
+class Placement(models.Model):
+    """One opening settlement and how its player finished."""
+    game = models.ForeignKey(Game, on_delete=models.CASCADE, related_name="placements")
+    player = models.PositiveSmallIntegerField()
+    pick = models.PositiveSmallIntegerField()
+    round = models.PositiveSmallIntegerField()
+    node = models.PositiveSmallIntegerField()
+    score = models.FloatField()
+    vp = models.PositiveSmallIntegerField()
+    won = models.BooleanField()
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["score"], name="placement_score_idx"),
+            models.Index(fields=["node", "round"], name="placement_node_idx"),
+        ]
+
+
+class ScoreOutcome(models.Model):
+    """Placements, wins and VP totals per draft round and score (in tenths)."""
+    round = models.PositiveSmallIntegerField()
+    score_tenths = models.IntegerField()
+    placements = models.PositiveIntegerField(default=0)
+    wins = models.PositiveIntegerField(default=0)
+    vp_total = models.PositiveBigIntegerField(default=0)
+
+    class Meta:
+        constraints = [models.UniqueConstraint(fields=["round", "score_tenths"], name="score_outcome_key")]
+
+
+class NodeOutcome(models.Model):
+    """Placements, wins and VP totals per draft round and node."""
+    round = models.PositiveSmallIntegerField()
+    node = models.PositiveSmallIntegerField()
+    placements = models.PositiveIntegerField(default=0)
+    wins = models.PositiveIntegerField(default=0)
+    vp_total = models.PositiveBigIntegerField(default=0)
+
+    class Meta:
+        constraints = [models.UniqueConstraint(fields=["round", "node"], name="node_outcome_key")]
+
+
+# --- Multiplayer Draft Sessions (see game/sessions.py) ---
+
+class DraftSnapshot(models.Model):
+    """Saved board and picks of a draft session, to rebuild it after eviction or a restart."""
+    session_id = models.CharField(max_length=32, primary_key=True)
+    board_data = models.JSONField()
+    players = models.PositiveSmallIntegerField()
+    picks = models.JSONField(default=list)
+    updated_at = models.DateTimeField(auto_now=True)
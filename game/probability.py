@@ -0,0 +1,150 @@
+"""
+Exact per-turn production distributions from the 2d6 roll distribution.
+
+One dice roll decides everything a set of settlements produces in a turn: if
+the roll is r, they collect the summed weight of their hexes numbered r. So a
+node set is fully described by its signature, the sorted (roll, resource,
+weight) triples of the hexes it touches. Distributions are memoized per
+signature. Every node on every board, and every pair of nodes, therefore
+reduces to a few dictionary lookups once its signature has been seen.
+
+The robber is not modelled here. game.simulation covers it by sampling, and
+game.robber gives what it costs each node's score.
+"""
+import math
+from functools import lru_cache
+
+import numpy as np
+
+from .algorithm import DESERT, RESOURCES, default_layout, encode_board, layout_of
+
+# Ways to roll each total with two dice (2d6 = d6 convolved with d6)
+DICE_WAYS = np.convolve(np.ones(6, dtype=np.int64), np.ones(6, dtype=np.int64))
+DICE_TOTALS = np.arange(2, 13)
+DICE_PMF = DICE_WAYS / DICE_WAYS.sum()
+
+HORIZON_PERCENTILES = (5, 25, 50, 75, 95)
+
+
+def node_signature(resources, rolls, nodes, layout=None) -> tuple:
+    """Sorted (roll, resource, weight) triples for the producing hexes of `nodes`."""
+    node_hexes = (layout or default_layout(len(resources))).node_hexes
+    weights = {}
+    for node in nodes:
+        if not 0 <= node < len(node_hexes):
+            raise ValueError(f"Unknown node {node}")
+        for h in node_hexes[node]:
+            if resources[h] != DESERT and rolls[h]:
+                key = (int(rolls[h]), int(resources[h]))
+                weights[key] = weights.get(key, 0) + 1
+    return tuple(sorted((roll, resource, weight) for (roll, resource), weight in weights.items()))
+
+
+def _pmf(payouts: np.ndarray) -> np.ndarray:
+    """Distribution of the amount paid, given the payout for every dice total."""
+    return np.bincount(payouts, weights=DICE_PMF, minlength=1)
+
+
+def _moments(pmf: np.ndarray) -> tuple:
+    values = np.arange(len(pmf))
+    mean = float((values * pmf).sum())
+    variance = float((values ** 2 * pmf).sum()) - mean ** 2
+    return mean, max(variance, 0.0)
+
+
+@lru_cache(maxsize=65536)
+def signature_distribution(signature: tuple) -> dict:
+    """
+    Per-turn distribution of each resource and of the total for one signature.
+    returns: {"total": {...}, "resources": {name: {...}}} with mean, variance
+    and pmf (probability of producing 0, 1, 2, ... in a turn).
+    """
+    payouts = np.zeros((DESERT, len(DICE_TOTALS)), dtype=np.int64)
+    for roll, resource, weight in signature:
+        payouts[resource, roll - 2] += weight
+
+    result = {"resources": {}}
+    for resource in range(DESERT):
+        if payouts[resource].any():
+            pmf = _pmf(payouts[resource])
+            mean, variance = _moments(pmf)
+            result["resources"][RESOURCES[resource]] = {"mean": mean, "variance": variance, "pmf": pmf}
+
+    pmf = _pmf(payouts.sum(axis=0))
+    mean, variance = _moments(pmf)
+    result["total"] = {
+        "mean": mean,
+        "variance": variance,
+        "pmf": pmf,
+        "p_zero": float(pmf[0]),
+        # Coefficient of variation: how lumpy production is for its size
+        "risk": math.sqrt(variance) / mean if mean else None,
+    }
+    return result
+
+
+@lru_cache(maxsize=4096)
+def horizon_distribution(signature: tuple, turns: int) -> np.ndarray:
+    """Distribution of total production over `turns` (at least 1) independent turns."""
+    if turns < 1:
+        raise ValueError("turns must be at least 1")
+    base = signature_distribution(signature)["total"]["pmf"]
+    result = np.ones(1)
+    power = base
+    while turns:
+        if turns & 1:
+            result = np.convolve(result, power)
+        turns >>= 1
+        if turns:
+            power = np.convolve(power, power)
+    return result
+
+
+def _horizon_summary(signature: tuple, turns: int) -> dict:
+    cumulative = np.cumsum(horizon_distribution(signature, turns))
+    return {f"p{p}": int(np.searchsorted(cumulative, p / 100 - 1e-12)) for p in HORIZON_PERCENTILES}
+
+
+def _rounded(distribution: dict) -> dict:
+    rounded = {}
+    for key, value in distribution.items():
+        if isinstance(value, np.ndarray):
+            rounded[key] = [round(float(p), 6) for p in value]
+        elif isinstance(value, float):
+            rounded[key] = round(value, 6)
+        else:
+            rounded[key] = value
+    return rounded
+
+
+def node_set_distribution(board_data, nodes: list, turns: int = None) -> dict:
+    """
+    Exact per-turn distribution for settlements on `nodes` (any number of them).
+    With `turns`, also percentiles of total production over that many turns.
+    """
+    if turns is not None and turns < 1:
+        raise ValueError("turns must be at least 1")
+    layout = layout_of(board_data)
+    resources, rolls = encode_board(board_data, layout)
+    signature = node_signature(resources, rolls, nodes, layout)
+    distribution = signature_distribution(signature)
+    result = {
+        "total": _rounded(distribution["total"]),
+        "resources": {name: _rounded(d) for name, d in distribution["resources"].items()},
+    }
+    if turns is not None:
+        result["horizon"] = dict(_horizon_summary(signature, turns), turns=turns)
+    return result
+
+
+def node_risk(board_data) -> list:
+    """(variance, risk) of per-turn total production for every node."""
+    layout = layout_of(board_data)
+    resources, rolls = encode_board(board_data, layout)
+    resources, rolls = resources.tolist(), rolls.tolist()
+    risks = []
+    for node in range(layout.node_count):
+        total = signature_distribution(node_signature(resources, rolls, (node,), layout))["total"]
+        risk = total["risk"]
+        risks.append((round(total["variance"], 4), round(risk, 4) if risk is not None else None))
+    return risks
@@ -0,0 +1,133 @@
+"""
+What the robber costs every node.
+
+HexImpact scores a board once with each hex blocked in turn. It does this in
+one vectorized pass over a (hex_count, hex_count) batch whose row h is the
+board with hex h made an unnumbered desert. It keeps two (hex_count,
+node_count) matrices:
+
+- loss[h, n]: how much node n's base score drops while hex h is blocked,
+- lost_bits[h, n]: the resources node n stops producing.
+
+Only the (at most three) nodes around a hex have nonzero entries.
+
+The scores with any set of hexes blocked are then the production scores
+minus the summed losses. That is exact for every node next to at most one
+blocked hex. The few nodes next to two or three blocked hexes have their
+repeated-resource dampening and resource set recomputed directly. Port
+and diversity bonuses are reapplied afterwards, from the corrected
+resource sets.
+"""
+from functools import lru_cache
+
+import numpy as np
+
+from .algorithm import (
+    DESERT, POPCOUNT, RESOURCE_BITS, ROLL_DOTS_ARRAY, active_weights, default_layout, diversity_scores, encode_board,
+    layout_of, needed_resource_bits, node_production, node_resource_masks, port_scores, production_scores,
+)
+
+
+class HexImpact:
+    """
+    Per-hex loss matrices for one board.
+
+    resources, rolls: (hex_count,) arrays from encode_board()
+    """
+
+    def __init__(self, resources: np.ndarray, rolls: np.ndarray, weights=None, layout=None):
+        self.layout = layout or default_layout(len(resources))
+        self.weights = weights or active_weights()
+        self.resources = resources
+        self.rolls = rolls
+
+        self.production = production_scores(resources[None], rolls[None], self.weights, self.layout)[0]
+        self.masks = node_resource_masks(resources[None], self.layout)[0]
+        self.base = port_scores(self.production, self.masks, self.weights, self.layout)
+
+        hex_count = self.layout.hex_count
+        blocked_resources = np.repeat(resources[None], hex_count, axis=0)
+        blocked_rolls = np.repeat(rolls[None], hex_count, axis=0)
+        blocked_resources[np.arange(hex_count), np.arange(hex_count)] = DESERT
+        blocked_rolls[np.arange(hex_count), np.arange(hex_count)] = 0
+        blocked_production = production_scores(blocked_resources, blocked_rolls, self.weights, self.layout)
+        blocked_masks = node_resource_masks(blocked_resources, self.layout)
+
+        self.production_loss = self.production - blocked_production
+        self.lost_bits = self.masks & ~blocked_masks
+        self.loss = self.base - port_scores(blocked_production, blocked_masks, self.weights, self.layout)
+
+    def _check(self, hexes) -> list:
+        hexes = sorted({int(h) for h in hexes})
+        for h in hexes:
+            if not 0 <= h < self.layout.hex_count:
+                raise ValueError(f"Unknown hex {h}")
+        return hexes
+
+    def blocked_components(self, hexes) -> tuple:
+        """(base, masks) for every node while `hexes` are blocked."""
+        hexes = self._check(hexes)
+        if not hexes:
+            return self.base, self.masks
+
+        production = self.production - self.production_loss[hexes].sum(axis=0)
+        masks = self.masks & ~np.bitwise_or.reduce(self.lost_bits[hexes], axis=0)
+
+        # Nodes next to several blocked hexes: their losses overlap, so rescore them
+        node_hex_index = self.layout.node_hex_index
+        nodes = np.flatnonzero(np.isin(node_hex_index, hexes).sum(axis=1) > 1)
+        if len(nodes):
+            resources = np.append(self.resources, DESERT)
+            dots = np.append(ROLL_DOTS_ARRAY[self.rolls], 0)
+            resources[hexes] = DESERT
+            dots[hexes] = 0
+            node_res = resources[node_hex_index[nodes]]
+            production[nodes] = node_production(node_res, dots[node_hex_index[nodes]], self.weights)
+            bits = RESOURCE_BITS[node_res]
+            masks[nodes] = bits[:, 0] | bits[:, 1] | bits[:, 2]
+
+        return port_scores(production, masks, self.weights, self.layout), masks
+
+    def scores(self, hexes=(), needed_bits: int = 0) -> np.ndarray:
+        """(node_count,) scores for one player while `hexes` are blocked."""
+        base, masks = self.blocked_components(hexes)
+        return diversity_scores(base, masks, needed_bits, self.weights)[0]
+
+    def vulnerability(self, needed_bits: int = 0) -> tuple:
+        """
+        The most one robber can take from each node's score, and the hex it
+        takes it from: ((node_count,) losses, list of hex ids or None).
+        Losing a needed resource also loses its diversity bonus.
+        """
+        loss = self.loss + POPCOUNT[self.lost_bits & needed_bits] * self.weights.diversity_bonus
+        worst = loss.argmax(axis=0)
+        worst_loss = loss[worst, np.arange(loss.shape[1])]
+        return worst_loss, [int(h) if lost > 0 else None for h, lost in zip(worst.tolist(), worst_loss.tolist())]
+
+
+@lru_cache(maxsize=256)
+def _hex_impact(layout, resources: bytes, rolls: bytes, weights) -> HexImpact:
+    return HexImpact(np.frombuffer(resources, dtype=np.int64).copy(), np.frombuffer(rolls, dtype=np.int64).copy(),
+                     weights, layout)
+
+
+def hex_impact(board_data, weights=None) -> HexImpact:
+    """The HexImpact of a board, built once per board and weights."""
+    layout = layout_of(board_data)
+    resources, rolls = encode_board(board_data, layout)
+    return _hex_impact(layout, resources.astype(np.int64).tobytes(), rolls.astype(np.int64).tobytes(),
+                       weights or active_weights())
+
+
+def robber_columns(board_data, player_resources=(), blocked_hexes=None, weights=None) -> dict:
+    """
+    robber_loss and robber_hex per node (see HexImpact.vulnerability) for a
+    scoring response, plus blocked_score when blocked_hexes are given.
+    """
+    impact = hex_impact(board_data, weights)
+    needed = needed_resource_bits(player_resources)
+    loss, worst = impact.vulnerability(needed)
+    columns = {"robber_loss": [round(value, 1) for value in loss.tolist()], "robber_hex": worst}
+    if blocked_hexes is not None:
+        columns["blocked_score"] = [round(score, 1) for score in impact.scores(blocked_hexes, needed).tolist()]
+    return columns
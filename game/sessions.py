@@ -0,0 +1,327 @@
+"""
+Server-held draft sessions for multiplayer drafting.
+
+A session holds one board's opening draft. That is the board, the occupied
+and blocked node bitmasks, every player's resource needs, and the node
+score vectors, which are computed once when the session is created.
+Participants post picks. Each pick is pushed to everyone as an event that
+carries only what changed: the nodes the pick blocked, and the next
+player's node scores and the expansion potentials (see game.expansion)
+that differ from the last ones sent.
+
+Sessions live in a bounded in-process LRU (SessionStore), so all
+participants of one session must reach the same process (a single ASGI
+worker, or sticky routing). With DRAFT_SESSION_SNAPSHOTS on, the board and
+the picks are also saved to the DraftSnapshot table. A session that was
+evicted, or lost in a restart, is then rebuilt from the table on its next
+request.
+"""
+import asyncio
+import secrets
+import threading
+from collections import OrderedDict
+
+from django.conf import settings
+
+from .algorithm import MASK_RESOURCES, active_weights, calculate_node_components, diversity_scores, layout_of
+from .draft import ALL_RESOURCE_BITS, snake_order
+from .expansion import ExpansionScorer
+
+MIN_PLAYERS = 2
+MAX_PLAYERS = 6
+
+
+def _nodes(bitmask: int) -> list:
+    """Node ids set in a node bitmask, in order."""
+    nodes = []
+    while bitmask:
+        low = bitmask & -bitmask
+        nodes.append(low.bit_length() - 1)
+        bitmask ^= low
+    return nodes
+
+
+class DraftSession:
+    """
+    One board's snake draft. All changes go through pick(), which is safe to
+    call from any thread and notifies the subscribers on their event loops.
+    """
+
+    def __init__(self, session_id: str, board_data, players: int = 4, weights=None, cache=None):
+        if not MIN_PLAYERS <= players <= MAX_PLAYERS:
+            raise ValueError(f"players must be between {MIN_PLAYERS} and {MAX_PLAYERS}")
+        self.id = session_id
+        self.board_data = board_data
+        self.layout = layout_of(board_data)
+        self.weights = weights or active_weights()
+        self.base, self._mask_array = calculate_node_components(board_data, cache, self.weights)
+        self.masks = self._mask_array.tolist()
+        self.players = players
+        self.order = snake_order(players)
+
+        self.picks = []
+        self.occupied = 0  # settled nodes, as a node bitmask
+        self.blocked = 0   # settled nodes and their neighbours
+        self.needs = [None] * players  # resource bits each player still lacks, after their first pick
+        self.events = []   # every pick event, so a client that reconnects can catch up
+        self._scores = {}  # needs bitmask → rounded node scores
+        self._sent = self.turn_scores()
+        self._expansion = ExpansionScorer(self.base.tolist(), self.layout)
+        self._expansion_blocked = 0  # self.blocked in the scorer's rank space
+        self._sent_expansion = self.expansion()
+        self._subscribers = set()
+        self._lock = threading.Lock()
+
+    @property
+    def version(self) -> int:
+        """Number of picks made, which is also the id of the latest event."""
+        return len(self.picks)
+
+    @property
+    def complete(self) -> bool:
+        return len(self.picks) >= len(self.order)
+
+    @property
+    def next_player(self):
+        return None if self.complete else self.order[len(self.picks)]
+
+    def _node_scores(self, needs: int) -> list:
+        scores = self._scores.get(needs)
+        if scores is None:
+            scores = [round(score, 1) for score in
+                      diversity_scores(self.base, self._mask_array, needs, self.weights)[0].tolist()]
+            self._scores[needs] = scores
+        return scores
+
+    def turn_scores(self) -> list:
+        """Node scores for the player on turn (base scores once the draft is over)."""
+        player = self.next_player
+        return self._node_scores(0 if player is None else self.needs[player] or 0)
+
+    def expansion(self) -> list:
+        """Rounded expansion potential of every node, given the picks so far."""
+        return [round(value, 1) for value in self._expansion.potential(blocked=self._expansion_blocked)]
+
+    # --- Picks ---
+
+    def pick(self, node: int, player: int = None) -> dict:
+        """
+        Settle `node` for the player on turn, and push the event to every
+        subscriber. Passing `player` checks that it is their turn. Raises
+        ValueError for an illegal pick.
+        """
+        with self._lock:
+            event = self._apply(node, player)
+            subscribers = list(self._subscribers)
+        for subscriber in subscribers:
+            self._notify(subscriber, event)
+        return event
+
+    def _apply(self, node: int, player: int = None) -> dict:
+        if self.complete:
+            raise ValueError("The draft is already complete")
+        turn = len(self.picks)
+        on_turn = self.order[turn]
+        if player is not None and player != on_turn:
+            raise ValueError(f"It is player {on_turn}'s turn")
+        if not 0 <= node < self.layout.node_count or self.blocked >> node & 1:
+            raise ValueError(f"Node {node} is not available")
+
+        newly_blocked = self.layout.node_block_masks[node] & ~self.blocked
+        self.picks.append(node)
+        self.occupied |= 1 << node
+        self.blocked |= newly_blocked
+        self._expansion_blocked |= self._expansion.blocked((node,))
+        if self.needs[on_turn] is None:
+            mask = self.masks[node]
+            self.needs[on_turn] = ALL_RESOURCE_BITS & ~mask if mask else 0
+
+        # Only the open nodes whose score moved for whoever picks next
+        scores = self.turn_scores()
+        changed = {
+            n: score for n, (score, sent) in enumerate(zip(scores, self._sent))
+            if score != sent and not self.blocked >> n & 1
+        }
+        self._sent = scores
+        expansion = self.expansion()
+        expansion_changed = {
+            n: value for n, (value, sent) in enumerate(zip(expansion, self._sent_expansion))
+            if value != sent and not self.blocked >> n & 1
+        }
+        self._sent_expansion = expansion
+
+        event = {
+            "version": self.version,
+            "turn": turn,
+            "player": on_turn,
+            "node": node,
+            "blocked": _nodes(newly_blocked),
+            "next_player": self.next_player,
+            "scores": changed,
+            "expansion": expansion_changed,
+            "complete": self.complete,
+        }
+        self.events.append(event)
+        return event
+
+    # --- Subscribers ---
+
+    def subscribe(self, after: int = 0) -> tuple:
+        """
+        Register an asyncio.Queue (on the running loop) for future events.
+        Returns (queue, backlog), where backlog is the events after version
+        `after`, so nothing is missed or sent twice.
+        """
+        subscriber = (asyncio.get_running_loop(), asyncio.Queue())
+        with self._lock:
+            self._subscribers.add(subscriber)
+            backlog = self.events[max(after, 0):]
+        return subscriber[1], backlog
+
+    def unsubscribe(self, queue):
+        with self._lock:
+            self._subscribers = {s for s in self._subscribers if s[1] is not queue}
+
+    @property
+    def subscribers(self) -> int:
+        return len(self._subscribers)
+
+    def _notify(self, subscriber: tuple, event: dict):
+        loop, queue = subscriber
+        try:
+            loop.call_soon_threadsafe(queue.put_nowait, event)
+        except RuntimeError:  # Its event loop has closed
+            self.unsubscribe(queue)
+
+    # --- State ---
+
+    def state(self) -> dict:
+        """The whole session, for a client that is joining."""
+        with self._lock:
+            scores = self.turn_scores()
+            return {
+                "id": self.id,
+                "layout": self.layout.name,
+                "players": self.players,
+                "order": self.order,
+                "picks": list(self.picks),
+                "version": self.version,
+                "next_player": self.next_player,
+                "complete": self.complete,
+                "occupied": _nodes(self.occupied),
+                "blocked": _nodes(self.blocked),
+                "scores": [None if self.blocked >> n & 1 else score for n, score in enumerate(scores)],
+                "expansion": [None if self.blocked >> n & 1 else value for n, value in enumerate(self.expansion())],
+                "needs": [None if needs is None else list(MASK_RESOURCES[needs]) for needs in self.needs],
+                "diversity_bonus": self.weights.diversity_bonus,
+                "board_data": self.board_data,
+            }
+
+
+class SessionStore:
+    """
+    Bounded LRU of live draft sessions, with optional snapshots in the
+    database. Evicting a session that still has subscribers is put off
+    until every other session has gone.
+    """
+
+    def __init__(self, max_sessions: int = 1000, snapshots: bool = False, cache=None):
+        self.max_sessions = max_sessions
+        self.snapshots = snapshots
+        self.cache = cache
+        self._sessions = OrderedDict()
+        self._lock = threading.Lock()
+        self.created = 0
+        self.restored = 0
+        self.evictions = 0
+
+    def create(self, board_data, players: int = 4) -> DraftSession:
+        """A new session on this board. Raises ValueError for a bad board or player count."""
+        session = DraftSession(secrets.token_urlsafe(12), board_data, players, cache=self.cache)
+        self._remember(session)
+        with self._lock:
+            self.created += 1
+        self._save(session)
+        return session
+
+    def get(self, session_id: str):
+        """The session, rebuilt from its snapshot if needed, or None."""
+        with self._lock:
+            session = self._sessions.get(session_id)
+            if session is not None:
+                self._sessions.move_to_end(session_id)
+                return session
+        session = self._restore(session_id)
+        if session is not None:
+            self._remember(session)
+        return session
+
+    def pick(self, session: DraftSession, node: int, player: int = None) -> dict:
+        event = session.pick(node, player)
+        self._save(session)
+        return event
+
+    def _remember(self, session: DraftSession):
+        with self._lock:
+            self._sessions[session.id] = session
+            self._sessions.move_to_end(session.id)
+            while len(self._sessions) > self.max_sessions:
+                idle = next((key for key, s in self._sessions.items() if not s.subscribers), None)
+                self._sessions.pop(idle if idle is not None else next(iter(self._sessions)))
+                self.evictions += 1
+
+    # --- Snapshots ---
+
+    def _save(self, session: DraftSession):
+        if not self.snapshots:
+            return
+        from .models import DraftSnapshot
+
+        DraftSnapshot.objects.update_or_create(
+            session_id=session.id,
+            defaults={"board_data": session.board_data, "players": session.players, "picks": list(session.picks)},
+        )
+
+    def _restore(self, session_id: str):
+        if not self.snapshots:
+            return None
+        from .models import DraftSnapshot
+
+        snapshot = DraftSnapshot.objects.filter(session_id=session_id).first()
+        if snapshot is None:
+            return None
+        session = DraftSession(session_id, snapshot.board_data, snapshot.players, cache=self.cache)
+        for node in snapshot.picks:
+            session.pick(node)
+        with self._lock:
+            self.restored += 1
+        return session
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "size": len(self._sessions),
+                "max_size": self.max_sessions,
+                "created": self.created,
+                "restored": self.restored,
+                "evictions": self.evictions,
+                "subscribers": sum(s.subscribers for s in self._sessions.values()),
+            }
+
+    def clear(self):
+        with self._lock:
+            self._sessions.clear()
+            self.created = self.restored = self.evictions = 0
+
+
+def _store() -> SessionStore:
+    from .cache import score_cache
+
+    return SessionStore(
+        max_sessions=getattr(settings, "DRAFT_SESSION_LIMIT", 1000),
+        snapshots=getattr(settings, "DRAFT_SESSION_SNAPSHOTS", False),
+        cache=score_cache,
+    )
+
+
+session_store = _store()
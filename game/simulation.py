@@ -0,0 +1,189 @@
+"""
+Monte Carlo production simulator for a set of settlements.
+
+Games are simulated in batches as (games × turns) NumPy arrays, where a turn
+is one dice roll. Every roll pays each settlement 1 resource per adjacent hex
+with that number, unless the robber is on the hex. On a 7 the robber moves to
+a uniformly random hex, and it starts on the desert.
+
+Each batch is reduced to histograms straight away. Memory therefore stays
+bounded however many games are requested. Histograms from different batches
+and worker processes simply add up.
+"""
+import math
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from .algorithm import DESERT, RESOURCES, encode_board, layout_of
+
+DEFAULT_TURNS = 60
+SIM_BATCH_SIZE = 20000            # games per NumPy batch
+SIM_GAMES_PER_TASK = 250000       # games per worker task
+PERCENTILES = (5, 25, 50, 75, 95)
+DROUGHT_THRESHOLDS = (5, 10, 15)
+
+WHEAT = RESOURCES.index("wheat")
+ORE = RESOURCES.index("ore")
+CITY_COST = {WHEAT: 2, ORE: 3}
+
+
+def _settlement_hexes(nodes: list, layout) -> np.ndarray:
+    """How many of the settlements touch each hex."""
+    weights = np.zeros(layout.hex_count, dtype=np.int64)
+    for node in nodes:
+        if not 0 <= node < layout.node_count:
+            raise ValueError(f"Unknown node {node}")
+        for h in layout.node_hexes[node]:
+            weights[h] += 1
+    return weights
+
+
+def _simulate_batch(rng, resources, rolls, weights, games: int, turns: int, robber: bool) -> dict:
+    """Simulate one batch and reduce it to histograms."""
+    dice = rng.integers(1, 7, size=(games, turns), dtype=np.int8)
+    dice += rng.integers(1, 7, size=(games, turns), dtype=np.int8)
+
+    if robber:
+        desert_hexes = np.flatnonzero(resources == DESERT)
+        start = desert_hexes[0] if len(desert_hexes) else -1
+        sevens = dice == 7
+        moves = rng.integers(0, len(resources), size=(games, turns), dtype=np.int8)
+        last_seven = np.maximum.accumulate(np.where(sevens, np.arange(turns), -1), axis=1)
+        robber_hex = np.where(last_seven >= 0, np.take_along_axis(moves, np.maximum(last_seven, 0), axis=1), start)
+    else:
+        robber_hex = None
+
+    production = np.zeros((games, turns, DESERT), dtype=np.int16)
+    for h in np.flatnonzero(weights):
+        if resources[h] == DESERT or not rolls[h]:
+            continue
+        paid = dice == rolls[h]
+        if robber_hex is not None:
+            paid &= robber_hex != h
+        production[:, :, resources[h]] += weights[h] * paid
+
+    per_turn = production.sum(axis=2)
+    totals = per_turn.sum(axis=1)
+    resource_totals = production.sum(axis=1)
+
+    # Longest run of turns that produced nothing
+    dry = per_turn == 0
+    dry_count = np.cumsum(dry, axis=1)
+    run = dry_count - np.maximum.accumulate(np.where(dry, 0, dry_count), axis=1)
+    longest_drought = run.max(axis=1)
+
+    # First turn with enough wheat and ore for a city (turns + 1 if never)
+    cumulative = np.cumsum(production[:, :, [WHEAT, ORE]], axis=1)
+    affordable = (cumulative[:, :, 0] >= CITY_COST[WHEAT]) & (cumulative[:, :, 1] >= CITY_COST[ORE])
+    first_city = np.where(affordable.any(axis=1), affordable.argmax(axis=1) + 1, turns + 1)
+
+    return {
+        "total": np.bincount(totals),
+        "resources": [np.bincount(resource_totals[:, r]) for r in range(DESERT)],
+        "first_city": np.bincount(first_city, minlength=turns + 2),
+        "drought": np.bincount(longest_drought, minlength=turns + 1),
+    }
+
+
+def _merge(histograms: dict, other: dict) -> dict:
+    def add(a, b):
+        if len(a) < len(b):
+            a, b = b, a
+        a = a.copy()
+        a[:len(b)] += b
+        return a
+
+    if not histograms:
+        return other
+    return {
+        "total": add(histograms["total"], other["total"]),
+        "resources": [add(a, b) for a, b in zip(histograms["resources"], other["resources"])],
+        "first_city": add(histograms["first_city"], other["first_city"]),
+        "drought": add(histograms["drought"], other["drought"]),
+    }
+
+
+def _simulate_task(args) -> dict:
+    """Run `games` games in SIM_BATCH_SIZE batches (process pool entry point)."""
+    seed, resources, rolls, weights, games, turns, robber = args
+    rng = np.random.default_rng(seed)
+    histograms = {}
+    for start in range(0, games, SIM_BATCH_SIZE):
+        batch = min(SIM_BATCH_SIZE, games - start)
+        histograms = _merge(histograms, _simulate_batch(rng, resources, rolls, weights, batch, turns, robber))
+    return histograms
+
+
+def _percentiles(histogram: np.ndarray, scale: float = 1.0) -> dict:
+    cumulative = np.cumsum(histogram)
+    count = cumulative[-1]
+    return {
+        f"p{p}": round(int(np.searchsorted(cumulative, math.ceil(count * p / 100))) * scale, 3)
+        for p in PERCENTILES
+    }
+
+
+def _summarize(histograms: dict, games: int, turns: int) -> dict:
+    values = np.arange(len(histograms["total"]))
+    mean_total = float((values * histograms["total"]).sum()) / games
+
+    first_city = _percentiles(histograms["first_city"])
+    for key, value in first_city.items():
+        if value > turns:
+            first_city[key] = None  # No city within the simulated turns
+
+    drought = histograms["drought"]
+    return {
+        "games": games,
+        "turns": turns,
+        "resources_per_turn": dict(_percentiles(histograms["total"], 1 / turns), mean=round(mean_total / turns, 4)),
+        "per_resource_per_turn": {
+            RESOURCES[r]: _percentiles(histogram, 1 / turns)
+            for r, histogram in enumerate(histograms["resources"])
+        },
+        "turns_to_first_city": dict(
+            first_city, never=round(float(histograms["first_city"][turns + 1]) / games, 4)
+        ),
+        "longest_drought": _percentiles(drought),
+        "drought_probability": {
+            str(k): round(float(drought[k:].sum()) / games, 4) for k in DROUGHT_THRESHOLDS
+        },
+    }
+
+
+def simulate_production(board_data, nodes: list, games: int = 100000, turns: int = DEFAULT_TURNS,
+                        robber: bool = True, seed: int = None, workers: int = None) -> dict:
+    """
+    Simulate `games` games of `turns` dice rolls for settlements on `nodes`.
+
+    Runs larger than SIM_GAMES_PER_TASK are spread across a process pool of
+    `workers` processes (default: CPU count). Returns percentile summaries of
+    resources per turn, turns until a city is affordable and drought streaks.
+    """
+    if games < 1 or turns < 1:
+        raise ValueError("games and turns must be positive")
+    if seed is not None and (isinstance(seed, bool) or not isinstance(seed, int) or seed < 0):
+        raise ValueError("seed must be a non-negative integer")
+
+    layout = layout_of(board_data)
+    resources, rolls = encode_board(board_data, layout)
+    weights = _settlement_hexes(nodes, layout)
+
+    tasks = max(1, math.ceil(games / SIM_GAMES_PER_TASK))
+    seeds = np.random.SeedSequence(seed).spawn(tasks)
+    sizes = [games // tasks + (1 if i < games % tasks else 0) for i in range(tasks)]
+    args = [(s, resources, rolls, weights, size, turns, robber) for s, size in zip(seeds, sizes)]
+
+    workers = min(workers or os.cpu_count() or 1, tasks)
+    if workers > 1:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(_simulate_task, args))
+    else:
+        results = [_simulate_task(a) for a in args]
+
+    histograms = {}
+    for result in results:
+        histograms = _merge(histograms, result)
+    return _summarize(histograms, games, turns)
@@ -131,4 +131,57 @@ class CatanBoard {
         
         return harborPositions.some(([r, c]) => r === row && c === col);
     }
-}
\ No newline at end of file
+}
+// Board codes: the URL-safe board encoding used by GET /api/scores/<code>/.
+// Must match encode_board_code()/decode_board_code() in game/algorithm.py:
+// each hex is resource * 13 + roll in one mixed-radix number (hex 0 least
+// significant), written as 20 base64url characters.
+const BOARD_CODE_RESOURCES = ['brick', 'wood', 'ore', 'wheat', 'sheep', 'desert'];
+const BOARD_CODE_ALPHABET = 'ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789-_';
+const BOARD_CODE_LENGTH = 20;
+const BOARD_CODE_HEX_RADIX = BigInt(BOARD_CODE_RESOURCES.length * 13);
+
+// Rolls without a dot value (none, 7) score like 0
+function normalizeBoardCodeRoll(roll) {
+    const value = Number(roll);
+    return Number.isInteger(value) && value >= 2 && value <= 12 && value !== 7 ? value : 0;
+}
+
+function encodeBoardCode(boardData) {
+    let value = 0n;
+    for (let h = boardData.length - 1; h >= 0; h--) {
+        const resource = BOARD_CODE_RESOURCES.indexOf(boardData[h].resource);
+        if (resource < 0) {
+            throw new Error(`Unknown resource ${boardData[h].resource}`);
+        }
+        value = value * BOARD_CODE_HEX_RADIX + BigInt(resource * 13 + normalizeBoardCodeRoll(boardData[h].roll));
+    }
+    let code = '';
+    for (let i = 0; i < BOARD_CODE_LENGTH; i++) {
+        code = BOARD_CODE_ALPHABET[Number(value % 64n)] + code;
+        value /= 64n;
+    }
+    return code;
+}
+
+function decodeBoardCode(code) {
+    if (code.length !== BOARD_CODE_LENGTH) {
+        throw new Error(`Board code must be ${BOARD_CODE_LENGTH} characters`);
+    }
+    let value = 0n;
+    for (const c of code) {
+        const digit = BOARD_CODE_ALPHABET.indexOf(c);
+        if (digit < 0) {
+            throw new Error(`Invalid board code character ${c}`);
+        }
+        value = value * 64n + BigInt(digit);
+    }
+    const boardData = [];
+    for (let h = 0; h < 19; h++) {
+        const cell = Number(value % BOARD_CODE_HEX_RADIX);
+        value /= BOARD_CODE_HEX_RADIX;
+        const roll = cell % 13;
+        boardData.push({ index: h, resource: BOARD_CODE_RESOURCES[Math.floor(cell / 13)], roll: roll || null });
+    }
+    return boardData;
+}
@@ -0,0 +1,163 @@
+// Board page: scoring API calls and node highlighting
+
+// --- API Integration ---
+
+async function fetchNodeScores(playerResources = null) {
+    const payload = {
+        board_data: globalBoardData // Always use the global board data
+    };
+
+    if (playerResources) {
+        payload.player_resources = playerResources;
+        console.log("Re-fetching scores with player resources:", playerResources);
+    } else {
+        console.log("Fetching initial scores...");
+    }
+
+    try {
+    // Scores for a bare board are a cacheable GET keyed by its board code
+    const response = playerResources ? await fetch('/api/calculate-scores/', {
+    method: 'POST',
+    headers: {
+    'Content-Type': 'application/json',
+    // Include CSRF token if you're using Django's CSRF protection
+    },
+    body: JSON.stringify(payload) // Send the dynamic payload
+    }) : await fetch(`/api/scores/${encodeBoardCode(globalBoardData)}/`);
+
+    const data = await response.json();
+
+    if (data.success) {
+        nodeScores = data.scores; // Update the global scores
+        diversityBonus = data.diversity_bonus;
+        console.log('Node scores loaded:', nodeScores);
+    } else {
+
+    }
+    } catch (error) {
+        console.error('Error fetching scores:', error);
+    }
+}
+// Re-score every node for a player without another request:
+// score = base + diversityBonus for each resource the player still needs.
+function rescoreForPlayer(playerResources) {
+    const rescored = {};
+    Object.entries(initialNodeScores).forEach(([algoId, data]) => {
+        const needed = playerResources.length
+            ? data.resource_set.filter(r => !playerResources.includes(r))
+            : [];
+        let description = data.description;
+        if (needed.length) {
+            const neededStr = needed.map(r => r.charAt(0).toUpperCase() + r.slice(1)).join(', ');
+            description = [description, `STRATEGIC FIT: Offers needed ${neededStr}.`].filter(Boolean).join(' ');
+        }
+        rescored[algoId] = {
+            ...data,
+            score: Math.round((data.base + needed.length * diversityBonus) * 10) / 10,
+            description: description
+        };
+    });
+    return rescored;
+}
+
+function applyNodeScoreColors() {
+    // Collect all scores with their indices
+    const scoreData = Object.entries(nodeScores).map(([algoId, data]) => ({
+        algorithmId: parseInt(algoId),
+        score: data.score,
+        description: data.description
+    }));
+
+    // Sort by score descending to find top 2
+    scoreData.sort((a, b) => b.score - a.score);
+    const topTwoAlgoIds = new Set([
+        scoreData[0].algorithmId,
+        scoreData[1].algorithmId
+    ]);
+
+    console.log('Top 2 nodes:', scoreData[0], scoreData[1]);
+
+    // Calculate thresholds for remaining nodes
+    const scores = scoreData.slice(2).map(d => d.score); // Exclude top 2
+    const maxScore = Math.max(...scores);
+    const minScore = Math.min(...scores);
+
+    // Define thresholds (top 33% = high, middle 33% = mid, bottom 33% = low)
+    const highThreshold = minScore + (maxScore - minScore) * 0.66;
+    const midThreshold = minScore + (maxScore - minScore) * 0.33;
+
+    // Apply classes to each node
+    nodePositions.forEach((pos, index) => {
+        // Now index directly corresponds to algorithm node ID
+        const nodeElement = document.getElementById(`node-${index + 1}`);
+
+        if (nodeScores[index]) {
+            const score = nodeScores[index].score;
+
+            nodeElement.classList.remove('score-best', 'score-high', 'score-mid', 'score-low');
+
+            if (topTwoAlgoIds.has(index)) {
+                nodeElement.classList.add('score-best');
+                console.log(`Node ${index + 1} is a BEST spot! Score: ${score}`);
+            } else {
+                if (score >= highThreshold) {
+                    nodeElement.classList.add('score-high');
+                } else if (score >= midThreshold) {
+                    nodeElement.classList.add('score-mid');
+                } else {
+                    nodeElement.classList.add('score-low');
+                }
+            }
+        }
+    });
+}
+function disableAdjacentNodes(visualNodeIndex) {
+    const adjacentNodes = nodeAdjacency[visualNodeIndex];
+
+    if (adjacentNodes) {
+        adjacentNodes.forEach(adjIndex => {
+            const adjNode = document.getElementById(`node-${adjIndex + 1}`);
+            if (adjNode && !adjNode.classList.contains('placed')) {
+                adjNode.classList.add('disabled');
+                adjNode.classList.remove('score-best');
+                adjNode.style.pointerEvents = 'none';
+            }
+        });
+    }
+}
+
+function updateBestSpots() {
+    // 1. Clear all existing 'score-best' classes
+    document.querySelectorAll('.settlement-node.score-best').forEach(node => {
+    node.classList.remove('score-best');
+    });
+
+    // 2. Get sorted list of all scores from the global 'nodeScores'
+    const scoreData = Object.entries(nodeScores).map(([algoId, data]) => ({
+        algorithmId: parseInt(algoId),
+        score: data.score
+    }));
+    scoreData.sort((a, b) => b.score - a.score);
+
+    // 3. Find the top 2 *available* nodes
+    const newBestSpots = [];
+    for (const nodeData of scoreData) {
+        // Stop if we've found 2
+        if (newBestSpots.length >= 2) {
+        break;
+    }
+
+    const nodeId = nodeData.algorithmId + 1; // 1-indexed for DOM
+    const nodeElement = document.getElementById(`node-${nodeId}`);
+
+    // Check if the node exists and is NOT placed or disabled
+    if (nodeElement && !nodeElement.classList.contains('placed') && !nodeElement.classList.contains('disabled')) {
+        newBestSpots.push(nodeElement);
+        }
+    }
+
+    // 4. Apply the 'score-best' class to the new top 2
+    newBestSpots.forEach(node => {
+        node.classList.add('score-best');
+        });
+}
@@ -0,0 +1,659 @@
+// Board page: board building, number placement and the draft itself
+
+// --- Board & Draft JS ---
+
+function createHex(pos, index) {
+    const hex = document.createElement('div');
+    hex.className = 'hex';
+    hex.style.left = `${pos.x}px`;
+    hex.style.top = `${pos.y}px`;
+    hex.dataset.index = index;
+
+    const hexInner = document.createElement('div');
+    hexInner.className = `hex-inner resource-${tiles[index].resource}`;
+
+    hex.appendChild(hexInner);
+    hex.addEventListener('click', () => handleHexClick(hex, index));
+
+    return hex;
+}
+
+function createPort(pos, type) {
+    const port = document.createElement('div');
+    port.className = 'port';
+    port.style.left = `${pos.x}px`;
+    port.style.top = `${pos.y}px`;
+    port.style.transform = `rotate(${pos.r}deg)`;
+
+    port.textContent = portText[type] || '???';
+
+    return port;
+}
+
+function handleHexClick(hex, index) {
+    if (currentStep === 1) {
+        tiles[index].resourceIndex = (tiles[index].resourceIndex + 1) % resources.length;
+        tiles[index].resource = resources[tiles[index].resourceIndex];
+
+        const hexInner = hex.querySelector('.hex-inner');
+        hexInner.className = `hex-inner resource-${tiles[index].resource}`;
+    } else if (currentStep === 2) {
+        document.querySelectorAll('.hex').forEach(h => h.classList.remove('start-position'));
+        hex.classList.add('start-position');
+        startingHexIndex = index;
+        document.getElementById('nextButton').disabled = false;
+    }
+}
+
+function getPips(number) {
+    const pipCounts = { 2: 1, 3: 2, 4: 3, 5: 4, 6: 5, 8: 5, 9: 4, 10: 3, 11: 2, 12: 1 };
+    return pipCounts[number] || 0;
+}
+
+function addNumberToken(hex, number) {
+    const token = document.createElement('div');
+    token.className = 'number-token';
+
+    const value = document.createElement('div');
+    value.className = `number-value ${number === 6 || number === 8 ? 'red' : ''}`;
+    value.textContent = number;
+    token.appendChild(value);
+
+    const pipsContainer = document.createElement('div');
+    pipsContainer.className = 'number-pips';
+    const pipCount = getPips(number);
+    for (let i = 0; i < pipCount; i++) {
+        const pip = document.createElement('div');
+        pip.className = `pip ${number === 6 || number === 8 ? 'red' : ''}`;
+        pipsContainer.appendChild(pip);
+    }
+    token.appendChild(pipsContainer);
+
+    const hexInner = hex.querySelector('.hex-inner');
+    if (hexInner) {
+        hexInner.appendChild(token);
+    } else {
+        hex.appendChild(token);
+    }
+}
+
+function createNode(pos, id) {
+    const node = document.createElement('div');
+    node.className = 'settlement-node';
+    node.id = `node-${id}`;
+    node.style.left = `${pos.x}px`;
+    node.style.top = `${pos.y}px`;
+    node.title = `Settlement Node ${id}`;
+
+    // Different behavior for mobile vs desktop
+    const isMobile = () => window.innerWidth <= 768;
+
+    if (isMobile()) {
+        // Mobile: click shows tooltip
+        node.addEventListener('click', (e) => showNodeTooltip(e, id));
+    } else {
+        // Desktop: click places, hover shows tooltip
+        node.addEventListener('click', () => handleNodeClick(node, id));
+        node.addEventListener('mouseenter', (e) => showNodeTooltip(e, id));
+        node.addEventListener('mouseleave', hideNodeTooltip);
+    }
+
+    return node;
+}
+let selectedNodeId = null; // Track selected node on mobile
+
+function showNodeTooltip(event, nodeId) {
+    if (currentStep !== 3) return;
+
+    const node = event.target;
+    if (node.classList.contains('placed') || node.classList.contains('disabled')) return;
+
+    const isMobile = window.innerWidth <= 768;
+
+    // On mobile, clicking selects the node
+    if (isMobile) {
+        selectedNodeId = nodeId;
+    }
+
+    const tooltip = document.getElementById('nodeTooltip');
+    const scoreValueEl = document.getElementById('tooltipScoreValue');
+    const scoreBarEl = document.getElementById('tooltipScoreBar');
+    const resourcesEl = document.getElementById('tooltipResources');
+    const analysisEl = document.getElementById('tooltipAnalysis');
+    const fitEl = document.getElementById('tooltipFit');
+
+    resourcesEl.innerHTML = '';
+    analysisEl.innerHTML = '';
+    fitEl.innerHTML = '';
+    fitEl.style.display = 'none';
+
+    const algorithmNodeId = nodeId - 1;
+
+    if (nodeScores && nodeScores[algorithmNodeId]) {
+        const nodeData = nodeScores[algorithmNodeId];
+
+        const MAX_SCORE = 18;
+        const score = nodeData.score;
+        scoreValueEl.textContent = score;
+        const scorePercent = Math.min((score / MAX_SCORE) * 100, 100);
+        scoreBarEl.style.width = `${scorePercent}%`;
+
+        const resourceParts = nodeData.resources.split(', ');
+        if (resourceParts[0] !== 'Desert location') {
+            resourceParts.forEach(part => {
+                const details = part.split(' (');
+                const resourceName = details[0].toLowerCase();
+                const count = details[1] ? parseInt(details[1].replace(/\D/g, '')) : 1;
+
+                for (let i = 0; i < count; i++) {
+                    const pip = document.createElement('div');
+                    pip.className = `resource-pip ${resourceName}`;
+                    let initial = resourceName.substring(0, 1).toUpperCase();
+                    if (resourceName === 'brick') initial = 'B';
+                    if (resourceName === 'sheep') initial = 'S';
+
+                    pip.textContent = initial;
+                    resourcesEl.appendChild(pip);
+                }
+            });
+        }
+
+        const description = nodeData.description;
+        const sentences = description.split('. ');
+        let fitText = '';
+
+        sentences.forEach(sentence => {
+            const item = document.createElement('span');
+            item.className = 'analysis-item';
+
+            if (sentence.startsWith('PRO:')) {
+                item.classList.add('pro');
+                item.textContent = sentence.substring(5);
+                analysisEl.appendChild(item);
+            } else if (sentence.startsWith('CON:')) {
+                item.classList.add('con');
+                item.textContent = sentence.substring(5);
+                analysisEl.appendChild(item);
+            } else if (sentence.startsWith('STRATEGIC FIT:')) {
+                fitText = sentence.substring(15);
+            } else if (sentence.length > 1) {
+                item.classList.add('info');
+                item.textContent = sentence.endsWith('.') ? sentence : sentence + '.';
+                analysisEl.appendChild(item);
+            }
+        });
+
+        if (fitText) {
+            fitEl.textContent = fitText;
+            fitEl.style.display = 'block';
+        }
+    } else {
+        scoreValueEl.textContent = '...';
+        scoreBarEl.style.width = '0%';
+        analysisEl.textContent = 'Loading...';
+    }
+
+    // Add confirm button on mobile
+    if (isMobile) {
+        // Remove existing button if any
+        const existingBtn = tooltip.querySelector('.mobile-confirm-btn');
+        if (existingBtn) existingBtn.remove();
+
+        const confirmBtn = document.createElement('button');
+        confirmBtn.className = 'mobile-confirm-btn';
+        confirmBtn.textContent = 'Place Settlement Here';
+        confirmBtn.onclick = () => {
+            handleNodeClick(node, nodeId);
+            tooltip.classList.remove('visible');
+            selectedNodeId = null;
+        };
+        tooltip.appendChild(confirmBtn);
+    }
+
+    tooltip.classList.add('visible');
+}
+
+
+function hideNodeTooltip() {
+    const tooltip = document.getElementById('nodeTooltip');
+    tooltip.classList.remove('visible');
+}
+
+async function handleNodeClick(node, id) {
+    if (node.classList.contains('placed') || node.classList.contains('disabled')) {
+        console.log('Node unavailable');
+        return;
+    }
+    if (currentPlacementTurn >= placementOrder.length) {
+        console.log('Draft is complete');
+        return;
+    }
+
+    const isMobile = window.innerWidth <= 768;
+
+    // On mobile, don't place immediately - wait for confirm button
+    if (isMobile && selectedNodeId !== id) {
+        return; // Just show tooltip, don't place
+    }
+
+    const playerIndex = placementOrder[currentPlacementTurn];
+    const player = players[playerIndex];
+    console.log(`Node ${id} clicked by ${player.name}`);
+
+    const algorithmNodeId = id - 1;
+    if (!playerResourceMap[playerIndex]) {
+        playerResourceMap[playerIndex] = nodeScores[algorithmNodeId].resource_set.slice();
+        console.log(`Player ${playerIndex} first pick resources:`, playerResourceMap[playerIndex]);
+    }
+
+    const house = document.createElement('div');
+    house.className = 'settlement-house';
+    house.style.color = player.color;
+
+    const roof = document.createElement('div');
+    roof.className = 'house-roof';
+
+    const base = document.createElement('div');
+    base.className = 'house-base';
+
+    house.appendChild(roof);
+    house.appendChild(base);
+    node.appendChild(house);
+
+    node.classList.add('placed');
+    node.classList.remove('score-high', 'score-mid', 'score-low', 'score-best');
+    node.dataset.owner = playerIndex;
+    node.style.pointerEvents = 'none';
+
+    disableAdjacentNodes(id - 1);
+    currentPlacementTurn++;
+    selectedNodeId = null;
+    await updateTurnIndicator();
+}
+
+function populateSidebar() {
+    const playerList = document.getElementById('player-list');
+    playerList.innerHTML = '';
+
+    players.forEach((player, index) => {
+        const card = document.createElement('div');
+        card.className = 'player-card';
+        card.id = `player-card-${index}`;
+
+        const swatch = document.createElement('div');
+        swatch.className = 'player-color-swatch';
+        swatch.style.background = player.color;
+
+        const name = document.createElement('div');
+        name.className = 'player-name';
+        name.textContent = player.name;
+
+        card.appendChild(swatch);
+        card.appendChild(name);
+        playerList.appendChild(card);
+    });
+}
+
+async function updateTurnIndicator() {
+    const instructions = document.getElementById('instructions');
+    document.querySelectorAll('.player-card').forEach(card => {
+        card.classList.remove('active');
+    });
+
+    if (currentPlacementTurn >= placementOrder.length) {
+        instructions.innerHTML = 'Settlement draft complete!';
+        confetti({ particleCount: 100, spread: 70, origin: { y: 0.6 } });
+        setTimeout(() => {
+            document.getElementById('game-screen').style.display = 'none';
+            generateDraftSummary();
+            document.getElementById('draft-summary-screen').style.display = 'flex';
+        }, 1000);
+
+        return;
+    }
+
+    const nextPlayerIndex = placementOrder[currentPlacementTurn];
+    const nextPlayer = players[nextPlayerIndex];
+
+    const isSecondPick = !!playerResourceMap[nextPlayerIndex];
+    if (isSecondPick && !playerSecondPickCalculated[nextPlayerIndex]) {
+        console.log(`Calculating 2nd pick scores for ${nextPlayer.name}...`);
+        nodeScores = rescoreForPlayer(playerResourceMap[nextPlayerIndex]);
+        // Mark as calculated so we don't re-fetch again
+        playerSecondPickCalculated[nextPlayerIndex] = true;
+        // Re-apply all node colors based on new scores
+        applyNodeScoreColors();
+    }
+
+    document.getElementById(`player-card-${nextPlayerIndex}`).classList.add('active');
+    instructions.innerHTML = `<span style="color:${nextPlayer.color}; text-shadow: 0 0 2px #000;">${nextPlayer.name}</span>, place your settlement.`;
+
+    updateBestSpots();
+}
+
+function generateDraftSummary() {
+    const container = document.getElementById('summary-cards-container');
+    container.innerHTML = '';
+
+    // Calculate total score for all placed settlements
+    let totalPlacedScore = 0;
+    const allPlacedNodes = document.querySelectorAll('.settlement-node.placed');
+
+    allPlacedNodes.forEach(node => {
+        const algorithmNodeId = parseInt(node.id.split('-')[1]) - 1;
+        if (initialNodeScores[algorithmNodeId]) {
+            totalPlacedScore += initialNodeScores[algorithmNodeId].score;
+        }
+    });
+
+    // Loop through each player in original order (no sorting)
+    players.forEach((player, playerIndex) => {
+        const playerNodes = document.querySelectorAll(`.settlement-node.placed[data-owner="${playerIndex}"]`);
+
+        let playerRawScore = 0;
+        const resourceSet = new Set();
+        const resourceProduction = { wood: 0, brick: 0, sheep: 0, wheat: 0, ore: 0 };
+
+        // Resource tracking for strategy algorithm
+        const resourceDotScores = { wood: 0, brick: 0, sheep: 0, wheat: 0, ore: 0 };
+        const resourceCounts = { wood: 0, brick: 0, sheep: 0, wheat: 0, ore: 0 };
+
+        playerNodes.forEach(node => {
+            const algorithmNodeId = parseInt(node.id.split('-')[1]) - 1;
+            if (initialNodeScores[algorithmNodeId]) {
+                const nodeData = initialNodeScores[algorithmNodeId];
+                playerRawScore += nodeData.score;
+
+                // Get adjacent hexes and calculate production + strategy scores
+                const adjacentHexes = getAdjacentHexesForNode(algorithmNodeId);
+                adjacentHexes.forEach(hexIdx => {
+                    if (hexIdx !== null && tiles[hexIdx]) {
+                        const resource = tiles[hexIdx].resource;
+                        const roll = tiles[hexIdx].number;
+                        if (resource !== 'desert' && roll) {
+                            const dotValue = {2: 1, 3: 2, 4: 3, 5: 4, 6: 5, 8: 5, 9: 4, 10: 3, 11: 2, 12: 1}[roll] || 0;
+                            const probability = {2: 1/36, 3: 2/36, 4: 3/36, 5: 4/36, 6: 5/36,
+                                            8: 5/36, 9: 4/36, 10: 3/36, 11: 2/36, 12: 1/36}[roll] || 0;
+
+                            resourceProduction[resource] += probability;
+                            resourceSet.add(resource);
+                            resourceCounts[resource]++;
+
+                            // Track highest dot value for each resource
+                            if (dotValue > resourceDotScores[resource]) {
+                                resourceDotScores[resource] = dotValue;
+                            }
+                        }
+                    }
+                });
+            }
+        });
+
+        // Calculate strategy scores: highest dot value + 1 for each extra instance
+        const strategyScores = {};
+        Object.keys(resourceDotScores).forEach(resource => {
+            if (resourceCounts[resource] > 0) {
+                strategyScores[resource] = resourceDotScores[resource] + (resourceCounts[resource] - 1);
+            } else {
+                strategyScores[resource] = 0;
+            }
+        });
+
+        console.log(`${player.name} strategy scores:`, strategyScores);
+
+        // Determine recommended strategy
+        let recommendedStrategy = "";
+
+        if (strategyScores.ore >= 4 && strategyScores.wheat >= 4) {
+            recommendedStrategy = "🏙️ City Development - Focus on upgrading settlements to cities early. Your strong ore and wheat production will fuel rapid development.";
+        } else if (strategyScores.wood >= 3 && strategyScores.brick >= 3) {
+            recommendedStrategy = "🛤️ Longest Road - Build roads aggressively to claim the longest road bonus. Your wood and brick give you a clear advantage.";
+        } else if (strategyScores.sheep >= 3 && strategyScores.wheat >= 3 && strategyScores.ore >= 3) {
+            recommendedStrategy = "🎴 Development Cards - Buy development cards frequently. Your balanced sheep/wheat/ore access lets you control the game through knights and progress cards.";
+        } else if (Object.values(strategyScores).every(score => score >= 3)) {
+            recommendedStrategy = "🏘️ Settlement Expansion - Your balanced resource production allows flexible expansion. Build new settlements to dominate multiple areas of the board.";
+        } else {
+            // Fallback: recommend trading
+            const strongestResource = Object.entries(strategyScores).sort((a, b) => b[1] - a[1])[0];
+            recommendedStrategy = `🤝 Trade Strategy - Focus on trading your surplus ${strongestResource[0]} for resources you lack. Build a trading network with other players.`;
+        }
+
+        // Calculate stats
+        const totalPips = playerRawScore.toFixed(1);
+        const resourceAccess = `${resourceSet.size}/5`;
+        const winPercentage = (totalPlacedScore > 0)
+            ? Math.round((playerRawScore / totalPlacedScore) * 100)
+            : 0;
+
+        // Create card element (no animation delay, no ranking)
+        const card = document.createElement('div');
+        card.className = 'summary-card';
+        card.style.animationDelay = `${playerIndex * 0.15}s`;
+
+        // Resource breakdown
+        const resourceBreakdownHTML = `
+            <div class="resource-breakdown">
+                <h4>Resources/Turn (Expected)</h4>
+                ${Object.entries(resourceProduction)
+                    .filter(([res, val]) => val > 0)
+                    .sort((a, b) => b[1] - a[1])
+                    .map(([res, val]) => `
+                        <div class="resource-row">
+                            <div class="resource-label">
+                                <div class="resource-icon-small resource-pip ${res}">
+                                    ${res[0].toUpperCase()}
+                                </div>
+                                <span>${res.charAt(0).toUpperCase() + res.slice(1)}</span>
+                            </div>
+                            <span class="resource-value">${val.toFixed(2)}</span>
+                        </div>
+                    `).join('')}
+            </div>
+        `;
+
+        // Strategy recommendation
+        const strategyHTML = `
+            <div class="strategy-recommendation">
+                <h4>Recommended Strategy</h4>
+                <div class="strategy-text">${recommendedStrategy}</div>
+            </div>
+        `;
+
+        card.innerHTML = `
+            <div class="summary-card-header">
+                <div class="player-color-swatch" style="background: ${player.color};"></div>
+                <div class="player-name">${player.name}</div>
+            </div>
+            ${resourceBreakdownHTML}
+            ${strategyHTML}
+            <div class="summary-stats">
+                <div class="stat-item">
+                    <span class="stat-label">Total Production</span>
+                    <span class="stat-value">${totalPips}</span>
+                </div>
+                <div class="stat-item">
+                    <span class="stat-label">Resource Access</span>
+                    <span class="stat-value">${resourceAccess}</span>
+                </div>
+            </div>
+            <div class="win-percentage">
+                <div class="stat-label">Share of Production</div>
+                <div class="stat-value">${winPercentage}%</div>
+            </div>
+        `;
+
+        container.appendChild(card);
+    });
+}
+// Helper function to get adjacent hexes for a node
+function getAdjacentHexesForNode(nodeId) {
+    // This maps each node to its adjacent hex indices
+    const nodeToHexMap = {
+        // Row 1
+        0: [3, null, null], 1: [0, null, null], 2: [0, 3, null], 3: [1, 0, null],
+        4: [1, 4, null], 5: [2, 1, null], 6: [2, null, null],
+        // Row 2
+        7: [3, null, null], 8: [3, 0, null], 9: [3, 4, 0], 10: [0, 4, 1],
+        11: [4, 1, 5], 12: [1, 5, 2], 13: [5, 2, 6], 14: [2, 6, null], 15: [6, null, null],
+        // Row 3
+        16: [7, null, null], 17: [7, 3, null], 18: [7, 3, 8], 19: [3, 8, 4],
+        20: [8, 4, 9], 21: [4, 9, 5], 22: [9, 5, 10], 23: [5, 10, 6],
+        24: [10, 6, 11], 25: [6, 11, null], 26: [11, null, null],
+        // Row 4
+        27: [7, null, null], 28: [7, 12, null], 29: [7, 8, 12], 30: [8, 12, 13],
+        31: [8, 9, 13], 32: [9, 13, 14], 33: [9, 10, 14], 34: [10, 14, 15],
+        35: [10, 11, 15], 36: [11, 15, null], 37: [11, null, null],
+        // Row 5
+        38: [12, null, null], 39: [12, 16, null], 40: [12, 13, 16], 41: [13, 16, 17],
+        42: [13, 14, 17], 43: [14, 17, 18], 44: [14, 15, 18], 45: [15, 18, null],
+        46: [15, null, null],
+        // Row 6
+        47: [16, null, null], 48: [16, null, null], 49: [16, 17, null], 50: [17, null, null],
+        51: [17, 18, null], 52: [18, null, null], 53: [18, null, null]
+    };
+
+    return nodeToHexMap[nodeId] || [];
+}
+
+
+function randomizeBoard() {
+    const resourcePool = [
+        'wood', 'wood', 'wood', 'wood',
+        'sheep', 'sheep', 'sheep', 'sheep',
+        'wheat', 'wheat', 'wheat', 'wheat',
+        'brick', 'brick', 'brick',
+        'ore', 'ore', 'ore',
+        'desert'
+    ];
+
+    for (let i = resourcePool.length - 1; i > 0; i--) {
+        const j = Math.floor(Math.random() * (i + 1));
+        [resourcePool[i], resourcePool[j]] = [resourcePool[j], resourcePool[i]];
+    }
+
+    tiles.forEach((tile, index) => {
+        tile.resource = resourcePool[index];
+        tile.resourceIndex = resources.indexOf(tile.resource);
+
+        const hex = document.querySelector(`[data-index="${index}"]`);
+        const hexInner = hex.querySelector('.hex-inner');
+        hexInner.className = `hex-inner resource-${tile.resource}`;
+    });
+}
+
+function nextStep() {
+    if (currentStep === 1) {
+        currentStep = 2;
+        document.getElementById('step-1').classList.remove('active');
+        document.getElementById('step-1').classList.add('completed');
+        document.getElementById('step-2').classList.add('active');
+
+        document.getElementById('instructions').innerHTML =
+            '<span class="instruction-highlight">Click a hex</span> to choose where the number spiral should start (typically a corner hex)';
+
+        document.getElementById('nextButton').textContent = 'Place Numbers in Spiral →';
+        document.getElementById('nextButton').disabled = true;
+
+        document.getElementById('randomizeButton').style.display = 'none';
+
+    } else if (currentStep === 2) {
+        if (startingHexIndex === null) return;
+
+        const pattern = spiralPatterns[startingHexIndex] || spiralPatterns[0];
+        let numberIndex = 0;
+
+        // First remove any existing tokens
+        pattern.forEach(hexIndex => {
+            const hex = document.querySelector(`[data-index="${hexIndex}"]`);
+            const existingToken = hex.querySelector('.number-token');
+            if (existingToken) {
+                existingToken.remove();
+            }
+        });
+
+        // Animate them dropping in spiral order
+        let delay = 0;
+        pattern.forEach(hexIndex => {
+            const hex = document.querySelector(`[data-index="${hexIndex}"]`);
+
+            if (tiles[hexIndex].resource !== 'desert') {
+                tiles[hexIndex].number = numberSequence[numberIndex];
+                const currentNumber = numberSequence[numberIndex];
+
+                setTimeout(() => {
+                    addNumberToken(hex, currentNumber);
+
+                    // Use requestAnimationFrame to ensure DOM is updated before animating
+                    requestAnimationFrame(() => {
+                        const token = hex.querySelector('.number-token');
+                        if (token) {
+                            token.classList.add('dropping');
+                        }
+                    });
+                }, delay);
+
+                numberIndex++;
+                delay += 150;
+
+            } else {
+                tiles[hexIndex].number = null;
+            }
+        });
+
+        // Wait for all animations before moving to next step
+        setTimeout(() => {
+            currentStep = 3;
+            document.getElementById('step-2').classList.remove('active');
+            document.getElementById('step-2').classList.add('completed');
+            document.getElementById('step-3').classList.add('active');
+
+            document.querySelectorAll('.hex').forEach(h => h.classList.remove('start-position'));
+            document.querySelector('.controls').style.display = 'none';
+
+            startAlgorithm();
+        }, delay + 500);
+    }
+    }
+
+async function startAlgorithm() {
+    globalBoardData = tiles.map((tile, index) => ({
+        index: index,
+        resource: tile.resource,
+        roll: tile.number, // Changed from 'number' to 'roll'
+        position: hexPositions[index]
+    }));
+
+    console.log('Board configuration:', globalBoardData);
+
+    // Fetch node scores from the algorithm
+    await fetchNodeScores();
+    initialNodeScores = JSON.parse(JSON.stringify(nodeScores));
+
+    // Create nodes FIRST
+    nodePositions.forEach((pos, i) => {
+        board.appendChild(createNode(pos, i + 1));
+    });
+    console.log(`Created ${nodePositions.length} settlement nodes`);
+
+    // THEN apply colors (after nodes exist in DOM)
+    applyNodeScoreColors();
+
+    document.getElementById('player-sidebar').style.display = 'flex';
+    populateSidebar();
+    updateTurnIndicator();
+
+    document.querySelector('.controls').style.display = 'none';
+}
+
+function initializeBoard() {
+    hexPositions.forEach((pos, i) => {
+        board.appendChild(createHex(pos, i));
+    });
+
+    portPositions.forEach((pos, i) => {
+        board.appendChild(createPort(pos, portTypes[i]));
+    });
+    randomizeBoard();
+
+    console.log('Settler Board Setup initialized');
+}
@@ -0,0 +1,106 @@
+// Board page: player setup, draft summary and restart screens
+
+// --- Setup Screen JS ---
+document.getElementById('view-board-btn').addEventListener('click', () => {
+    document.getElementById('draft-summary-screen').style.display = 'none';
+    document.getElementById('game-screen').style.display = 'flex';
+    document.getElementById('instructions').innerHTML = 'Final board state - settlements placed!';
+    document.querySelector('.controls').style.display = 'none';
+});
+document.addEventListener('DOMContentLoaded', () => {
+    const setupScreen = document.getElementById('player-setup-screen');
+    const gameScreen = document.getElementById('game-screen');
+    const summaryScreen = document.getElementById('draft-summary-screen');
+    const playerSelect = document.getElementById('player-count-select');
+    const inputsContainer = document.getElementById('player-inputs-container');
+    const startGameBtn = document.getElementById('start-game-btn');
+    const playAgainBtn = document.getElementById('play-again-btn');
+
+function generatePlayerInputs() {
+    const count = playerSelect.value;
+    inputsContainer.innerHTML = '';
+
+    const catanColors = [
+        { name: 'Red', value: '#EF4444' },
+        { name: 'Blue', value: '#3B82F6' },
+        { name: 'White', value: '#FFFFFF' },
+        { name: 'Orange', value: '#F97316' }
+    ];
+
+    for (let i = 1; i <= count; i++) {
+        const playerRow = document.createElement('div');
+        playerRow.style.display = 'flex';
+        playerRow.style.gap = '10px';
+        playerRow.style.alignItems = 'center';
+        playerRow.style.marginBottom = '10px';
+
+        const input = document.createElement('input');
+        input.type = 'text';
+        input.placeholder = `Player ${i} Name`;
+        input.className = 'player-name-input';
+        input.value = `Player ${i}`;
+        input.style.flex = '1';
+
+        const colorSelect = document.createElement('select');
+        colorSelect.className = 'player-color-select';
+        colorSelect.style.width = '100px';
+        colorSelect.style.padding = '12px';
+        colorSelect.style.borderRadius = '8px';
+        colorSelect.style.border = '2px solid #8B6F47';
+        colorSelect.style.background = 'linear-gradient(180deg, #FFFEF7 0%, #F5F2E8 100%)';
+        colorSelect.style.color = '#3E2723';
+        colorSelect.style.fontSize = '14px';
+        colorSelect.style.fontFamily = 'Georgia, serif';
+        colorSelect.style.cursor = 'pointer';
+
+        catanColors.forEach((color, idx) => {
+            const option = document.createElement('option');
+            option.value = color.value;
+            option.textContent = color.name;
+            if (idx === (i - 1) % 4) {
+                option.selected = true;
+            }
+            colorSelect.appendChild(option);
+        });
+
+        playerRow.appendChild(input);
+        playerRow.appendChild(colorSelect);
+        inputsContainer.appendChild(playerRow);
+    }
+}
+
+    function initializeGame() {
+        const nameInputs = document.querySelectorAll('.player-name-input');
+        const colorSelects = document.querySelectorAll('.player-color-select');
+        players = [];
+        nameInputs.forEach((input, index) => {
+            players.push({
+                name: input.value || `Player ${index + 1}`,
+                color: colorSelects[index].value // Use selected color from dropdown
+            });
+        });
+
+        placementOrder = [];
+        for (let i = 0; i < players.length; i++) {
+            placementOrder.push(i);
+        }
+        for (let i = players.length - 1; i >= 0; i--) {
+            placementOrder.push(i);
+        }
+
+        setupScreen.style.display = 'none';
+        gameScreen.style.display = 'flex';
+        document.title = 'Settler - Board Setup';
+        initializeBoard();
+    }
+
+    function restartGame() {
+        window.location.reload();
+    }
+
+    playerSelect.addEventListener('change', generatePlayerInputs);
+    startGameBtn.addEventListener('click', initializeGame);
+    playAgainBtn.addEventListener('click', restartGame);
+
+    generatePlayerInputs();
+});
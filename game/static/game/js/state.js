@@ -0,0 +1,196 @@
+// Board page: game state, board geometry and tile state shared by the other scripts
+
+// Game state
+let currentStep = 1;
+let startingHexIndex = null;
+
+let players = [];
+let placementOrder = [];
+let currentPlacementTurn = 0;
+
+let nodeScores = {};
+let globalBoardData = []; // To send back to the API
+let playerResourceMap = {}; // Stores first-pick resources, e.g., {0: ['ore', 'wheat']}
+let playerSecondPickCalculated = {};
+let initialNodeScores = {}; // Player-independent scores from the first fetch
+let diversityBonus = 0; // Added per needed resource when re-scoring for a player
+// Store node scores from algorithm
+
+const playerColors = [
+    "#EF4444", // Red
+    "#3B82F6", // Blue
+    "#FFFFFF", // White
+    "#F97316", // Orange
+    "#22C55E", // Green
+    "#EAB308"  // Yellow
+];
+
+const resources = ['wood', 'brick', 'sheep', 'wheat', 'ore', 'desert'];
+const numberSequence = [5, 2, 6, 3, 8, 10, 9, 12, 11, 4, 8, 10, 9, 4, 5, 6, 3, 11];
+const hexPositions = [
+    { x: 105, y: 0 }, { x: 242, y: 0 }, { x: 378, y: 0 },
+    { x: 36, y: 105 }, { x: 174, y: 105 }, { x: 309, y: 105 }, { x: 447, y: 105 },
+    { x: -32, y: 210 }, { x: 105, y: 210 }, { x: 242, y: 210 }, { x: 378, y: 210 }, { x: 514, y: 210 },
+    { x: 36, y: 315 }, { x: 174, y: 315 }, { x: 309, y: 315 }, { x: 447, y: 315 },
+    { x: 105, y: 420 }, { x: 242, y: 420 }, { x: 378, y: 420 }
+];
+
+const nodePositions = [
+    // Row 1 (n0-n6): 7 nodes - Top edge
+    { x: 105, y: 35 }, { x: 174, y: 0 }, { x: 242, y: 35 }, { x: 312, y: 0 },
+    { x: 378, y: 35 }, { x: 448, y: 0 }, { x: 519, y: 35 },
+
+    // Row 2 (n7-n15): 9 nodes
+    { x: 36, y: 140 }, { x: 105, y: 105 }, { x: 174, y: 140 }, { x: 242, y: 105 },
+    { x: 309, y: 140 }, { x: 378, y: 105 }, { x: 447, y: 140 }, { x: 519, y: 105 },
+    { x: 588, y: 140 },
+
+    // Row 3 (n16-n26): 11 nodes
+    { x: -32, y: 245 }, { x: 36, y: 210 }, { x: 105, y: 245 }, { x: 174, y: 210 },
+    { x: 242, y: 245 }, { x: 309, y: 210 }, { x: 378, y: 245 }, { x: 447, y: 210 },
+    { x: 519, y: 245 }, { x: 588, y: 210 }, { x: 655, y: 245 },
+
+    // Row 4 (n27-n37): 11 nodes
+    { x: -32, y: 315 }, { x: 36, y: 350 }, { x: 105, y: 315 }, { x: 174, y: 350 },
+    { x: 242, y: 315 }, { x: 309, y: 350 }, { x: 378, y: 315 }, { x: 447, y: 350 },
+    { x: 519, y: 315 }, { x: 588, y: 350 }, { x: 655, y: 315 },
+
+    // Row 5 (n38-n46): 9 nodes
+    { x: 36, y: 420 }, { x: 105, y: 455 }, { x: 174, y: 420 }, { x: 242, y: 455 },
+    { x: 309, y: 420 }, { x: 378, y: 455 }, { x: 447, y: 420 }, { x: 519, y: 455 },
+    { x: 588, y: 420 },
+
+    // Row 6 (n47-n53): 7 nodes - Bottom edge
+    { x: 105, y: 525 }, { x: 174, y: 560 }, { x: 242, y: 525 }, { x: 309, y: 560 },
+    { x: 378, y: 525 }, { x: 447, y: 560 }, { x: 519, y: 525 }
+];
+
+const nodeAdjacency = {
+    // Row 1 (Top Edge)
+    0: [1, 8],
+    1: [0, 2],
+    2: [1, 3, 10],
+    3: [2, 4],
+    4: [3, 5, 12],
+    5: [4, 6],
+    6: [5, 14],
+
+    // Row 2
+    7: [8, 17],
+    8: [0, 7, 9],
+    9: [8, 10, 19],
+    10: [2, 9, 11],
+    11: [10, 12, 21],
+    12: [4, 11, 13],
+    13: [12, 14, 23],
+    14: [6, 13, 15],
+    15: [14, 25],
+
+    // Row 3
+    16: [17, 27],
+    17: [7, 16, 18],
+    18: [17, 19, 29],
+    19: [9, 18, 20],
+    20: [19, 21, 31],
+    21: [11, 20, 22],
+    22: [21, 23, 33],
+    23: [13, 22, 24],
+    24: [23, 25, 35],
+    25: [15, 24, 26],
+    26: [25, 37],
+
+    // Row 4
+    27: [16, 28],
+    28: [27, 29, 38],
+    29: [18, 28, 30],
+    30: [29, 31, 40],
+    31: [20, 30, 32],
+    32: [31, 33, 42],
+    33: [22, 32, 34],
+    34: [33, 35, 44],
+    35: [24, 34, 36],
+    36: [35, 37, 46],
+    37: [26, 36],
+
+    // Row 5
+    38: [28, 39],
+    39: [38, 40, 47],
+    40: [30, 39, 41],
+    41: [40, 42, 49],
+    42: [32, 41, 43],
+    43: [42, 44, 51],
+    44: [34, 43, 45],
+    45: [44, 46, 53],
+    46: [36, 45],
+
+    // Row 6 (Bottom Edge)
+    47: [39, 48],
+    48: [47, 49],
+    49: [41, 48, 50],
+    50: [49, 51],
+    51: [43, 50, 52],
+    52: [51, 53],
+    53: [45, 52]
+};
+
+const portPositions = [
+    { x: 230, y: -28, r: -27 },
+    { x: 470, y: -23, r: 27 },
+    { x: 590, y: 160, r: 0 },
+    { x: 590, y: 370, r: 0 },
+    { x: 470, y: 545, r: -27 },
+    { x: 240, y: 550, r: 25 },
+    { x: 100, y: 550, r: 25 },
+    { x: -30, y: 370, r: 0 },
+    { x: -30, y: 160, r: 0 }
+];
+
+const portTypes = [
+    '3:1', '3:1', 'field', 'forest', '3:1', 'pasture', '3:1', 'hill', 'mountain'
+];
+
+const portText = {
+    'forest': 'Wood',
+    'hill': 'Brick',
+    'pasture': 'Sheep',
+    'field': 'Wheat',
+    'mountain': 'Ore',
+    '3:1': '3:1'
+};
+
+const spiralPatterns = {
+    // Corner hexes - spiral from corner
+    0: [0, 1, 2, 6, 11, 15, 18, 17, 16, 12, 7, 3, 4, 5, 10, 14, 13, 8, 9],
+    2: [2, 6, 11, 15, 18, 17, 16, 12, 7, 3, 0, 1, 5, 10, 14, 13, 8, 4, 9],
+    7: [7, 3, 0, 1, 2, 6, 11, 15, 18, 17, 16, 12, 8, 4, 5, 10, 14, 13, 9],
+    11: [11, 15, 18, 17, 16, 12, 7, 3, 0, 1, 2, 6, 10, 14, 13, 8, 4, 5, 9],
+    16: [16, 12, 7, 3, 0, 1, 2, 6, 11, 15, 18, 17, 13, 8, 4, 5, 10, 14, 9],
+    18: [18, 17, 16, 12, 7, 3, 0, 1, 2, 6, 11, 15, 14, 13, 8, 4, 5, 10, 9],
+
+    // Edge hexes - spiral from edge
+    1: [1, 2, 6, 11, 15, 18, 17, 16, 12, 7, 3, 0, 4, 5, 10, 14, 13, 8, 9],
+    3: [3, 0, 1, 2, 6, 11, 15, 18, 17, 16, 12, 7, 8, 4, 5, 10, 14, 13, 9],
+    6: [6, 11, 15, 18, 17, 16, 12, 7, 3, 0, 1, 2, 5, 10, 14, 13, 8, 4, 9],
+    12: [12, 7, 3, 0, 1, 2, 6, 11, 15, 18, 17, 16, 13, 8, 4, 5, 10, 14, 9],
+    15: [15, 18, 17, 16, 12, 7, 3, 0, 1, 2, 6, 11, 10, 14, 13, 8, 4, 5, 9],
+    17: [17, 16, 12, 7, 3, 0, 1, 2, 6, 11, 15, 18, 14, 13, 8, 4, 5, 10, 9],
+
+    // Inner ring hexes - spiral outward from inner position
+    4: [4, 8, 9, 13, 3, 5, 12, 14, 7, 10, 16, 15, 0, 1, 17, 11, 2, 18, 6],
+    5: [5, 4, 9, 10, 1, 14, 8, 13, 0, 6, 2, 15, 3, 11, 12, 18, 7, 17, 16],
+    8: [8, 4, 13, 9, 3, 12, 7, 14, 5, 16, 0, 17, 1, 10, 15, 2, 11, 18, 6],
+    10: [10, 5, 9, 14, 6, 15, 4, 11, 1, 18, 2, 13, 0, 17, 8, 12, 3, 16, 7],
+    13: [13, 8, 14, 12, 9, 16, 4, 17, 7, 3, 10, 18, 5, 15, 0, 1, 11, 2, 6],
+    14: [14, 13, 10, 17, 9, 15, 8, 18, 12, 5, 16, 11, 4, 6, 7, 1, 2, 3, 0],
+
+    // Center hex - spiral outward
+    9: [9, 4, 5, 8, 10, 13, 14, 3, 1, 12, 6, 15, 17, 0, 7, 2, 16, 11, 18]
+};
+
+const tiles = hexPositions.map(() => ({
+    resource: 'wood',
+    resourceIndex: 0,
+    number: null
+}));
+
+const board = document.getElementById('board');
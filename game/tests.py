@@ -1,3 +1,961 @@
-from django.test import TestCase
+import asyncio
+import gzip
+import json
+import os
+import random
+import re
+import tempfile
+import time
+from unittest import mock
 
-# Create your tests here.
+import numpy as np
+from asgiref.sync import sync_to_async
+
+from django.core.handlers.wsgi import WSGIHandler
+from django.core.management import call_command
+from django.test import LiveServerTestCase, SimpleTestCase, TestCase, override_settings
+
+from . import metrics
+from .async_views import session_events
+from .algorithm import (
+    BOARD_ROLLS, DEFAULT_WEIGHTS, DESERT, EXPANSION_LAYOUT, NODE_COUNT, ROLL_DOTS_ARRAY, STANDARD_LAYOUT, SYMMETRIES,
+    ScoringWeights, active_weights, calculate_node_components, calculate_node_scores, decode_board_code,
+    encode_board, encode_board_code, encode_boards, iter_batch_scores, layout_of, node_number_masks, parse_fields,
+    rescore_nodes, score_boards, set_active_weights,
+)
+from .benchmark import GOLDEN_PLAYER_RESOURCES, compare_results, golden_entry, random_board
+from .cache import ScoreCache, score_cache
+from .draft import PAIR_NUMBER_BONUS, DraftSearch, recommend_pairs
+from .expansion import EXPANSION_ROAD_DISCOUNT, ExpansionScorer
+from .generator import FairnessConstraints, generate_boards
+from .loadtest import draft_session, percentile, run_load
+from .middleware import ScoringWeightsMiddleware
+from .models import Board, DraftSnapshot, Game, Placement
+from .probability import node_set_distribution, node_signature, signature_distribution
+from .robber import hex_impact
+from .sessions import SessionStore
+from .simulation import simulate_production
+from .tuning import OutcomeDataset, WeightsFile, tune, weights_file, write_weights_file
+from .warmup import warm_up, wsgi_request
+from .workers import scoring_pool
+
+GOLDEN_PATH = os.path.join(os.path.dirname(__file__), 'testdata', 'golden_scores.json')
+
+
+def load_golden():
+    with open(GOLDEN_PATH) as f:
+        return json.load(f)
+
+
+def use_default_weights(test):
+    """Score with DEFAULT_WEIGHTS during `test`, whatever SCORING_WEIGHTS_PATH points at."""
+    path = weights_file.path
+    weights_file.configure(None)
+    test.addCleanup(weights_file.configure, path)
+    set_active_weights(None)
+
+
+class GoldenScoreTests(SimpleTestCase):
+    """
+    Pin today's outputs for the seeded boards in testdata/golden_scores.json.
+    After an intended scoring change, regenerate the file with
+    `python manage.py benchmark --write-golden game/testdata/golden_scores.json`.
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.golden = load_golden()
+
+    def setUp(self):
+        use_default_weights(self)
+
+    def test_scores_match_golden(self):
+        for expected in self.golden:
+            with self.subTest(seed=expected['seed']):
+                self.assertEqual(golden_entry(expected['seed']), expected)
+
+    def test_node_22_is_scored_on_its_own_hexes(self):
+        # Until the symmetry cache, node 22 was scored on a copy of node 23's
+        # hexes (5, 6, 10). The golden scores pin the corrected node
+        self.assertEqual(STANDARD_LAYOUT.node_hexes[22], (5, 9, 10))
+        self.assertEqual(STANDARD_LAYOUT.node_hexes[23], (5, 6, 10))
+        for expected in self.golden:
+            self.assertNotEqual(expected['base'][22], expected['base'][23])
+
+    def test_cached_scores_match_golden(self):
+        cache = ScoreCache(max_size=64)
+        for expected in self.golden:
+            board_data = random_board(expected['seed'])
+            scores = calculate_node_scores(board_data, GOLDEN_PLAYER_RESOURCES, cache)
+            self.assertEqual([scores[i]['score'] for i in range(NODE_COUNT)], expected['player_scores'])
+
+    def test_rescore_matches_golden(self):
+        for expected in self.golden:
+            rescored = rescore_nodes(random_board(expected['seed']), GOLDEN_PLAYER_RESOURCES)
+            self.assertEqual([rescored[i] for i in range(NODE_COUNT)], expected['player_scores'])
+
+    def test_batch_matches_golden(self):
+        entries = [{'board_data': random_board(expected['seed'])} for expected in self.golden]
+        for (index, scores, error), expected in zip(iter_batch_scores(entries, chunk_size=16), self.golden):
+            self.assertIsNone(error)
+            self.assertEqual(scores, expected['scores'])
+
+    def test_board_code_round_trip(self):
+        for expected in self.golden:
+            board_data = decode_board_code(expected['code'])
+            self.assertEqual(encode_board_code(board_data), expected['code'])
+            self.assertEqual(rescore_nodes(board_data, []), rescore_nodes(random_board(expected['seed']), []))
+
+    def test_invalid_board_codes(self):
+        for code in ('', 'A' * 19, 'A' * 19 + '!', '_' * 20):
+            with self.assertRaises(ValueError):
+                decode_board_code(code)
+
+
+class ScoreViewTests(SimpleTestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.expected = load_golden()[0]
+        cls.board_data = random_board(cls.expected['seed'])
+
+    def setUp(self):
+        use_default_weights(self)
+
+    def post(self, url, payload):
+        return self.client.post(url, json.dumps(payload), content_type='application/json')
+
+    def test_get_node_scores(self):
+        response = self.post('/api/calculate-scores/', {
+            'board_data': self.board_data,
+            'player_resources': GOLDEN_PLAYER_RESOURCES,
+        })
+        self.assertEqual(response.status_code, 200)
+        scores = response.json()['scores']
+        self.assertEqual([scores[str(i)]['score'] for i in range(NODE_COUNT)], self.expected['player_scores'])
+
+    def test_rescore_mode(self):
+        response = self.post('/api/calculate-scores/', {
+            'board_data': self.board_data,
+            'player_resources': GOLDEN_PLAYER_RESOURCES,
+            'mode': 'rescore',
+        })
+        scores = response.json()['scores']
+        self.assertEqual([scores[str(i)] for i in range(NODE_COUNT)], self.expected['player_scores'])
+
+    def test_field_selection(self):
+        response = self.post('/api/calculate-scores/', {'board_data': self.board_data, 'fields': ['score', 'base']})
+        scores = response.json()['scores']
+        self.assertEqual(scores['0'], {'score': self.expected['scores'][0], 'base': self.expected['base'][0]})
+
+        rows = calculate_node_scores(self.board_data, GOLDEN_PLAYER_RESOURCES)
+        for fields in ('description', 'resources,score'):
+            selected = calculate_node_scores(self.board_data, GOLDEN_PLAYER_RESOURCES, fields=parse_fields(fields))
+            for i in range(NODE_COUNT):
+                self.assertEqual(selected[i], {f: v for f, v in rows[i].items() if f in fields.split(',')})
+
+    def test_columnar_format(self):
+        response = self.post('/api/calculate-scores/', {
+            'board_data': self.board_data,
+            'player_resources': GOLDEN_PLAYER_RESOURCES,
+            'format': 'columnar',
+            'fields': 'score,resource_set',
+        })
+        body = response.json()
+        self.assertEqual(set(body['columns']), {'score', 'resource_set'})
+        self.assertEqual(body['columns']['score'], self.expected['player_scores'])
+        rows = calculate_node_scores(self.board_data)
+        for i, mask in enumerate(body['columns']['resource_set']):
+            self.assertEqual([r for bit, r in enumerate(body['resource_bits']) if mask >> bit & 1],
+                             rows[i]['resource_set'])
+
+    def test_get_node_scores_errors(self):
+        self.assertEqual(self.client.get('/api/calculate-scores/').status_code, 405)
+        self.assertEqual(self.post('/api/calculate-scores/', {}).status_code, 400)
+        for option in ({'fields': 'score,bogus'}, {'fields': []}, {'fields': ''}, {'format': 'xml'}):
+            response = self.post('/api/calculate-scores/', dict(option, board_data=self.board_data))
+            self.assertEqual(response.status_code, 400)
+        self.assertEqual(self.client.get(f"/api/scores/{self.expected['code']}/", {'fields': ','}).status_code, 400)
+
+    def test_board_code_scores_are_cacheable(self):
+        url = f"/api/scores/{self.expected['code']}/"
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('must-revalidate', response['Cache-Control'])
+        self.assertNotIn('immutable', response['Cache-Control'])
+        scores = response.json()['scores']
+        self.assertEqual([scores[str(i)]['score'] for i in range(NODE_COUNT)], self.expected['scores'])
+
+        revalidated = self.client.get(url, HTTP_IF_NONE_MATCH=response['ETag'])
+        self.assertEqual(revalidated.status_code, 304)
+
+        for_player = self.client.get(url, {'player_resources': ','.join(GOLDEN_PLAYER_RESOURCES)})
+        self.assertNotEqual(for_player['ETag'], response['ETag'])
+
+    def test_board_code_scores_errors(self):
+        self.assertEqual(self.client.get('/api/scores/not-a-code/').status_code, 400)
+        self.assertEqual(self.client.post(f"/api/scores/{self.expected['code']}/").status_code, 405)
+
+    def test_batch_scores(self):
+        response = self.post('/api/calculate-scores/batch/', {
+            'boards': [{'board_data': self.board_data}, {'board_data': 'bad'}],
+        })
+        rows = [json.loads(line) for line in b''.join(response.streaming_content).decode().splitlines()]
+        self.assertEqual(rows[0], {'index': 0, 'scores': self.expected['scores']})
+        self.assertEqual(rows[1]['index'], 1)
+        self.assertIn('error', rows[1])
+
+
+class AsyncScoreViewTests(SimpleTestCase):
+    def setUp(self):
+        use_default_weights(self)
+        max_pending = scoring_pool.max_pending
+        self.addCleanup(setattr, scoring_pool, 'max_pending', max_pending)
+        self.pending = scoring_pool.pending
+        scoring_pool.max_pending = self.pending + 1
+
+    async def post_batch(self):
+        body = json.dumps({'boards': [{'board_data': random_board(0)}]})
+        return await self.async_client.post('/api/async/calculate-scores/batch/', body,
+                                            content_type='application/json')
+
+    async def test_node_scores_match_the_sync_view(self):
+        body = json.dumps({'board_data': random_board(0), 'player_resources': GOLDEN_PLAYER_RESOURCES,
+                           'robber': True})
+        response = await self.async_client.post('/api/async/calculate-scores/', body, content_type='application/json')
+        expected = await sync_to_async(self.client.post)('/api/calculate-scores/', body,
+                                                         content_type='application/json')
+        self.assertEqual(response.json(), expected.json())
+
+    async def test_batch_slot_is_released_when_the_stream_never_starts(self):
+        response = await self.post_batch()
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual((await self.post_batch()).status_code, 503)
+
+        response.close()
+        self.assertEqual(scoring_pool.pending, self.pending)
+        response.close()
+        self.assertEqual(scoring_pool.pending, self.pending)
+
+        response = await self.post_batch()
+        lines = [chunk async for chunk in response.streaming_content]
+        self.assertEqual(json.loads(lines[0])['index'], 0)
+        response.close()
+        self.assertEqual(scoring_pool.pending, self.pending)
+
+
+def transformed_board(board_data, symmetry):
+    """board_data rotated/reflected by SYMMETRIES[symmetry]."""
+    hex_perm = SYMMETRIES[symmetry][0]
+    moved = [None] * len(board_data)
+    for h, cell in enumerate(board_data):
+        moved[hex_perm[h]] = dict(cell, index=int(hex_perm[h]))
+    return moved
+
+
+class ProductionDistributionTests(SimpleTestCase):
+    def test_exact_distribution(self):
+        board_data = random_board(3)
+        for nodes in ([4], [4, 17, 30]):
+            distribution = node_set_distribution(board_data, nodes, turns=10)
+            self.assertAlmostEqual(sum(distribution['total']['pmf']), 1.0, places=5)
+            for resource in distribution['resources'].values():
+                self.assertAlmostEqual(sum(resource['pmf']), 1.0, places=5)
+
+        # Mean production is the dot count of the node's numbered hexes / 36
+        for turns in (0, -1):
+            with self.assertRaises(ValueError):
+                node_set_distribution(board_data, [4], turns=turns)
+
+        dots = sum(ROLL_DOTS_ARRAY[board_data[h]['roll'] or 0] for h in STANDARD_LAYOUT.node_hexes[4])
+        self.assertAlmostEqual(node_set_distribution(board_data, [4])['total']['mean'], dots / 36, places=5)
+
+    def test_equal_signatures_share_the_memo(self):
+        board_data = random_board(3)
+        resources, rolls = encode_board(board_data)
+        signatures = {}
+        for node in range(NODE_COUNT):
+            signatures.setdefault(node_signature(resources, rolls, (node,)), []).append(node)
+        first, second = next(nodes for nodes in signatures.values() if len(nodes) > 1)[:2]
+
+        node_set_distribution(board_data, [first])
+        hits = signature_distribution.cache_info().hits
+        self.assertEqual(node_set_distribution(board_data, [second]), node_set_distribution(board_data, [first]))
+        self.assertEqual(signature_distribution.cache_info().hits, hits + 2)
+
+    def test_distribution_endpoint(self):
+        payload = {'board_data': random_board(3), 'nodes': [4, 17], 'turns': 20}
+        response = self.client.post('/api/distribution/', json.dumps(payload), content_type='application/json')
+        self.assertEqual(response.json()['distribution'], node_set_distribution(payload['board_data'], [4, 17], 20))
+        self.assertEqual(response.json()['distribution']['horizon']['turns'], 20)
+        for bad in ({'nodes': []}, {'nodes': [99]}, {'turns': -1}, {'turns': 0}):
+            response = self.client.post('/api/distribution/', json.dumps(dict(payload, **bad)),
+                                        content_type='application/json')
+            self.assertEqual(response.status_code, 400)
+
+
+class SimulationTests(SimpleTestCase):
+    def post(self, payload):
+        payload = dict({'board_data': random_board(0), 'nodes': [0, 10]}, **payload)
+        return self.client.post('/api/simulate/', json.dumps(payload), content_type='application/json')
+
+    def test_simulation_endpoint_limits(self):
+        with mock.patch('game.views.MAX_SYNC_SIM_ROLLS', 6000):
+            response = self.post({'games': 5000000, 'turns': 60, 'seed': 1})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['simulation']['games'], 100)
+        for seed in ('x', -1, True):
+            self.assertEqual(self.post({'games': 10, 'seed': seed}).status_code, 400)
+        for robber in ('false', 0, None):
+            self.assertEqual(self.post({'games': 10, 'robber': robber}).status_code, 400)
+
+    def test_mean_matches_exact_distribution(self):
+        board_data, nodes = random_board(3), [4, 17, 30]
+        summary = simulate_production(board_data, nodes, games=20000, turns=60, robber=False, seed=5, workers=1)
+        exact = node_set_distribution(board_data, nodes)['total']['mean']
+        self.assertAlmostEqual(summary['resources_per_turn']['mean'], exact, delta=0.01)
+
+    def test_pooled_run_matches_single_worker(self):
+        board_data, nodes = random_board(3), [4, 17]
+        with mock.patch('game.simulation.SIM_GAMES_PER_TASK', 1000):
+            single = simulate_production(board_data, nodes, games=3000, turns=20, seed=9, workers=1)
+            pooled = simulate_production(board_data, nodes, games=3000, turns=20, seed=9, workers=2)
+        self.assertEqual(pooled, single)
+
+
+def exhaustive_draft(search, turn, blocked, needs):
+    """Max-n value of the rest of the draft, trying every open node on every ply."""
+    if turn >= len(search.order):
+        return [0.0] * search.players
+    player = search.order[turn]
+    scores = search._node_scores(needs[player] or 0)
+    best = None
+    for node in range(search.layout.node_count):
+        if blocked >> node & 1:
+            continue
+        value = exhaustive_draft(search, turn + 1, blocked | search.block_masks[node],
+                                 search._needs_after(needs, player, node))
+        value[player] += scores[node]
+        if best is None or value[player] > best[player]:
+            best = value
+    return best or [0.0] * search.players
+
+
+class DraftSearchTests(SimpleTestCase):
+    def setUp(self):
+        self.board_data = random_board(7)
+        self.base, self.masks = calculate_node_components(self.board_data)
+
+    def search(self, **kwargs):
+        return DraftSearch(self.base, self.masks, **dict({'players': 2, 'time_budget': 30}, **kwargs))
+
+    def test_full_width_search_matches_exhaustive_search(self):
+        first = int(np.argmax(self.base))
+        search = self.search(beam_width=NODE_COUNT)
+        result = search.recommend([first])
+        self.assertTrue(result['complete'])
+        self.assertEqual([move['player'] for move in result['principal_variation']], [1, 1, 0])
+
+        needs = search._needs_after((None, None), 0, first)
+        expected = exhaustive_draft(search, 1, STANDARD_LAYOUT.node_block_masks[first], needs)
+        self.assertAlmostEqual(result['expected_totals'][1], expected[1], delta=0.1)
+
+    def test_transposition_table_is_reused(self):
+        search = self.search(players=4, max_depth=3)
+        result = search.recommend()
+        searched = search.nodes_searched
+
+        # The same position again is answered from the table, one lookup per depth
+        again = search.recommend()
+        self.assertEqual(search.nodes_searched - searched, 3)
+        self.assertEqual(dict(again, nodes_searched=0), dict(result, nodes_searched=0))
+
+    def test_illegal_picks(self):
+        search = self.search()
+        with self.assertRaisesMessage(ValueError, 'Draft is already complete'):
+            search.recommend([0, 10, 20, 30])
+        neighbour = next(n for n in range(NODE_COUNT) if n != 0 and STANDARD_LAYOUT.node_block_masks[0] >> n & 1)
+        for picks in ([0, neighbour], [NODE_COUNT]):
+            with self.assertRaisesMessage(ValueError, 'is not available'):
+                search.recommend(picks)
+
+        response = self.client.post('/api/draft/recommend/', json.dumps({
+            'board_data': self.board_data, 'players': 2, 'picks': [0, 0],
+        }), content_type='application/json')
+        self.assertEqual(response.status_code, 400)
+
+    def test_time_budget_falls_back_to_greedy_picks(self):
+        result = self.search(players=4, time_budget=0).recommend()
+        self.assertFalse(result['complete'])
+        self.assertGreaterEqual(result['depth'], 1)
+        self.assertLess(result['depth'], 8)
+        self.assertEqual(len(result['principal_variation']), 8)
+        self.assertEqual(result['recommended'], result['principal_variation'][0]['node'])
+
+
+class PairRecommendationTests(SimpleTestCase):
+    def post(self, payload):
+        payload = dict({'board_data': random_board(0)}, **payload)
+        return self.client.post('/api/draft/pairs/', json.dumps(payload), content_type='application/json')
+
+    def test_top_pairs_match_brute_force(self):
+        board_data = random_board(11)
+        base, masks = calculate_node_components(board_data)
+        resources, rolls = encode_board(board_data)
+        numbers = node_number_masks(resources[None], rolls[None])[0]
+        block = STANDARD_LAYOUT.node_block_masks
+        bonus = active_weights().diversity_bonus
+
+        def pair_score(a, b):
+            return (base[a] + base[b] + bin(int(masks[a] | masks[b])).count('1') * bonus
+                    + bin(int(numbers[a] | numbers[b])).count('1') * PAIR_NUMBER_BONUS)
+
+        for occupied, first in (((), None), ((3, 40), None), ((3,), 20)):
+            blocked = 0
+            for node in occupied:
+                blocked |= block[node]
+            legal = {
+                (a, b): pair_score(a, b)
+                for a in range(NODE_COUNT) for b in range(a + 1, NODE_COUNT)
+                if not (blocked >> a & 1 or blocked >> b & 1 or block[a] >> b & 1)
+                and first in (None, a, b)
+            }
+            expected = sorted(legal.values(), reverse=True)[:10]
+
+            pairs = recommend_pairs(board_data, occupied, first, top_k=10)
+            self.assertEqual(len(pairs), len(expected))
+            for pair, score in zip(pairs, expected):
+                self.assertAlmostEqual(pair['score'], score, delta=0.051)
+            for pair in pairs:
+                key = tuple(sorted((pair['first'], pair['second'])))
+                self.assertAlmostEqual(legal[key], pair['score'], delta=0.051)
+                if first is not None:
+                    self.assertEqual(pair['first'], first)
+
+    def test_unknown_nodes_are_rejected(self):
+        self.assertEqual(self.post({}).status_code, 200)
+        for occupied in ([99], [-1], [NODE_COUNT]):
+            response = self.post({'occupied': occupied})
+            self.assertEqual(response.status_code, 400)
+            self.assertIn('Unknown node', response.json()['error'])
+        self.assertEqual(self.post({'first': 99}).status_code, 400)
+
+
+class RobberImpactTests(SimpleTestCase):
+    def test_blocked_scores_match_rescoring(self):
+        rng = random.Random(3)
+        for seed in range(30):
+            board_data = random_board(seed, expansion=seed % 3 == 0)
+            layout = layout_of(board_data)
+            resources, rolls = encode_board(board_data, layout)
+            impact = hex_impact(board_data)
+            hexes = rng.sample(range(layout.hex_count), rng.randint(1, 6))
+            needed = rng.randrange(32)
+            blocked_resources, blocked_rolls = resources.copy(), rolls.copy()
+            blocked_resources[hexes] = DESERT
+            blocked_rolls[hexes] = 0
+            expected = score_boards(blocked_resources[None], blocked_rolls[None], needed, layout=layout)[0]
+            np.testing.assert_allclose(impact.scores(hexes, needed), expected)
+
+            full = score_boards(resources[None], rolls[None], needed, layout=layout)[0]
+            loss, worst = impact.vulnerability(needed)
+            for node in range(layout.node_count):
+                if worst[node] is not None:
+                    self.assertIn(worst[node], layout.node_hexes[node])
+                    np.testing.assert_allclose(impact.scores([worst[node]], needed)[node], full[node] - loss[node])
+
+    def test_robber_option(self):
+        board_data = random_board(2)
+        response = self.client.post('/api/calculate-scores/', json.dumps({
+            'board_data': board_data, 'format': 'columnar', 'robber': True, 'blocked_hexes': [0, 1],
+        }), content_type='application/json')
+        columns = response.json()['columns']
+        self.assertEqual(len(columns['robber_loss']), NODE_COUNT)
+        self.assertEqual(columns['blocked_score'][30], columns['score'][30])
+        self.assertLess(columns['blocked_score'][0], columns['score'][0])
+
+        code = encode_board_code(board_data)
+        scores = self.client.get(f'/api/scores/{code}/', {'robber': '1'}).json()['scores']
+        self.assertEqual(scores['0']['robber_loss'], columns['robber_loss'][0])
+        self.assertEqual(self.client.get(f'/api/scores/{code}/', {'blocked_hexes': '19'}).status_code, 400)
+
+
+class ExpansionPotentialTests(SimpleTestCase):
+    def test_matches_breadth_first_search(self):
+        rng = random.Random(4)
+        for seed in range(10):
+            board_data = random_board(seed, expansion=seed % 2 == 1)
+            layout = layout_of(board_data)
+            base = calculate_node_components(board_data)[0].tolist()
+            occupied, blocked = [], 0
+            for _ in range(3):
+                node = rng.choice([n for n in range(layout.node_count) if not blocked >> n & 1])
+                occupied.append(node)
+                blocked |= layout.node_block_masks[node]
+
+            potential = ExpansionScorer(base, layout).potential(occupied)
+            for node in range(layout.node_count):
+                closed = blocked | layout.node_block_masks[node]
+                distance, frontier, best = {node: 0}, [node], 0.0
+                while frontier:
+                    current = frontier.pop(0)
+                    for m in layout.node_neighbors[current]:
+                        if m not in distance and distance[current] < 3:
+                            distance[m] = distance[current] + 1
+                            frontier.append(m)
+                            if not closed >> m & 1:
+                                best = max(best, EXPANSION_ROAD_DISCOUNT ** (distance[m] - 1) * base[m])
+                self.assertAlmostEqual(potential[node], best)
+
+    def test_expansion_option(self):
+        response = self.client.post('/api/calculate-scores/', json.dumps({
+            'board_data': random_board(8), 'format': 'columnar', 'fields': ['base'],
+            'expansion': True, 'occupied': [20],
+        }), content_type='application/json')
+        columns = response.json()['columns']
+        self.assertEqual(len(columns['expansion']), NODE_COUNT)
+        self.assertTrue(all(value > 0 for value in columns['expansion']))
+
+
+class BoardLibraryTests(TestCase):
+    def post(self, url, payload):
+        return self.client.post(url, json.dumps(payload), content_type='application/json')
+
+    def test_save_and_load_any_orientation(self):
+        board_data = random_board(3)
+        response = self.post('/api/boards/', {'board_data': board_data, 'name': 'Seed 3'})
+        self.assertEqual(response.status_code, 201)
+        code = response.json()['code']
+
+        for symmetry in range(len(SYMMETRIES)):
+            rotated = transformed_board(board_data, symmetry)
+            self.assertFalse(self.post('/api/boards/', {'board_data': rotated}).json()['created'])
+
+            body = self.client.get(f'/api/boards/{encode_board_code(rotated)}/').json()
+            self.assertEqual(body['code'], code)
+            expected = calculate_node_scores(rotated)
+            self.assertEqual(body['columns']['base'], [expected[i]['base'] for i in range(NODE_COUNT)])
+        self.assertEqual(Board.objects.count(), 1)
+
+    def test_unknown_board(self):
+        code = encode_board_code(random_board(4))
+        self.assertEqual(self.client.get(f'/api/boards/{code}/').status_code, 404)
+
+    def test_malformed_board_is_rejected(self):
+        board_data = random_board(4)
+        for bad in (board_data[:5], [dict(cell, resource='gold') for cell in board_data], ['x'] * 19):
+            response = self.post('/api/boards/', {'board_data': bad})
+            self.assertEqual(response.status_code, 400)
+            self.assertFalse(response.json()['success'])
+        self.assertEqual(Board.objects.count(), 0)
+
+    def test_bulk_import(self):
+        call_command('import_boards', '--random', '300', '--batch-size', '64', stdout=open(os.devnull, 'w'))
+        self.assertEqual(Board.objects.count(), 300)
+        call_command('import_boards', '--random', '10', stdout=open(os.devnull, 'w'))
+        self.assertEqual(Board.objects.count(), 300)
+
+        board, symmetry = Board.objects.find(random_board(7))
+        base, masks = board.node_components(symmetry)
+        expected = calculate_node_scores(random_board(7))
+        self.assertEqual([round(b, 1) for b in base.tolist()], [expected[i]['base'] for i in range(NODE_COUNT)])
+
+        listed = self.client.get('/api/boards/', {'order': '-max_production', 'limit': 5}).json()['boards']
+        self.assertEqual(len(listed), 5)
+        self.assertEqual(listed[0]['max_production'], max(b.max_production for b in Board.objects.all()))
+        self.assertEqual(len(self.client.get('/api/boards/', {'limit': -3}).json()['boards']), 1)
+        for limit in ('abc', ''):
+            response = self.client.get('/api/boards/', {'limit': limit})
+            self.assertEqual(response.status_code, 400)
+            self.assertFalse(response.json()['success'])
+
+
+class BoardLayoutTests(TestCase):
+    def post(self, url, payload):
+        return self.client.post(url, json.dumps(payload), content_type='application/json')
+
+    def test_compiled_topology(self):
+        self.assertEqual((STANDARD_LAYOUT.hex_count, STANDARD_LAYOUT.node_count), (19, 54))
+        self.assertEqual(len(STANDARD_LAYOUT.edges), 72)
+        self.assertEqual(len(STANDARD_LAYOUT.symmetries), 12)
+        self.assertEqual((EXPANSION_LAYOUT.hex_count, EXPANSION_LAYOUT.node_count), (30, 80))
+        self.assertEqual(len(EXPANSION_LAYOUT.symmetries), 4)
+        self.assertEqual(len(EXPANSION_LAYOUT.coast), 38)
+        # Coordinates that match a registered layout compile to that layout
+        coords = [{'resource': 'wood', 'roll': 6, 'q': q, 'r': r} for q, r in EXPANSION_LAYOUT.hex_coords]
+        self.assertIs(layout_of(coords), EXPANSION_LAYOUT)
+
+    def test_expansion_board(self):
+        board_data = random_board(5, expansion=True)
+        code = encode_board_code(board_data)
+        self.assertTrue(code.startswith('expansion.'))
+        self.assertEqual(rescore_nodes(decode_board_code(code), []), rescore_nodes(board_data, []))
+
+        scores = calculate_node_scores(board_data, GOLDEN_PLAYER_RESOURCES)
+        self.assertEqual(len(scores), 80)
+        cache = ScoreCache(max_size=8)
+        for hex_perm, _ in EXPANSION_LAYOUT.symmetries:
+            moved = [None] * 30
+            for h, cell in enumerate(board_data):
+                moved[hex_perm[h]] = dict(cell, index=int(hex_perm[h]))
+            self.assertEqual(rescore_nodes(moved, [], cache), rescore_nodes(moved, []))
+        self.assertEqual(cache.stats()['misses'], 1)
+
+        rows = list(iter_batch_scores([{'board_data': board_data}, {'board_data': random_board(5)}]))
+        self.assertEqual([len(scores) for _, scores, _ in rows], [80, 54])
+
+        body = self.post('/api/draft/recommend/', {'board_data': board_data, 'players': 6, 'picks': [0, 79]}).json()
+        self.assertNotIn(body['recommended'], (0, 1, 79))
+        saved = self.post('/api/boards/', {'board_data': board_data}).json()
+        self.assertEqual(self.client.get(f"/api/boards/{saved['code']}/").status_code, 200)
+
+    def test_custom_map(self):
+        # Two hexes side by side: 10 nodes, one shared edge
+        board_data = [{'resource': 'wood', 'roll': 6, 'q': 0, 'r': 0}, {'resource': 'ore', 'roll': 8, 'q': 1, 'r': 0}]
+        scores = self.post('/api/calculate-scores/', {'board_data': board_data}).json()['scores']
+        self.assertEqual(len(scores), 10)
+        self.assertEqual(max(node['base'] for node in scores.values()), 11.5)
+        with self.assertRaises(ValueError):
+            encode_board_code(board_data)
+
+
+class FairBoardGeneratorTests(TestCase):
+    def test_boards_meet_constraints(self):
+        constraints = FairnessConstraints(no_adjacent_equal=True, max_cluster=1, max_top_spread=1.5)
+        boards = generate_boards(40, constraints=constraints, seed=1)
+        self.assertEqual(generate_boards(40, constraints=constraints, seed=1), boards)
+        resources, rolls = encode_boards([board['board_data'] for board in boards])
+        neighbors = STANDARD_LAYOUT.hex_neighbors
+        for board, row, numbers in zip(boards, resources.tolist(), rolls.tolist()):
+            self.assertEqual(sorted(numbers), sorted(BOARD_ROLLS + [0]))
+            for h in range(19):
+                for n in neighbors[h]:
+                    self.assertFalse(numbers[h] and numbers[h] == numbers[n])
+                    self.assertFalse(numbers[h] in (6, 8) and numbers[n] in (6, 8))
+                    self.assertFalse(row[h] == row[n])
+            top = sorted((node['base'] for node in calculate_node_scores(board['board_data']).values()), reverse=True)
+            self.assertLessEqual(top[0] - top[4], 1.5 + 0.1)
+
+    def test_generate_api(self):
+        body = self.client.get('/api/boards/generate/', {'count': 3, 'layout': 'expansion', 'seed': 4}).json()
+        self.assertEqual(len(body['boards']), 3)
+        self.assertTrue(body['boards'][0]['code'].startswith('expansion.'))
+        self.assertEqual(body['constraints']['max_top_spread'], 2.0)
+
+        response = self.client.get('/api/boards/generate/', {'count': 5, 'format': 'ndjson', 'max_top_spread': 'none'})
+        self.assertEqual(len(b''.join(response.streaming_content).splitlines()), 5)
+        self.assertEqual(self.client.get('/api/boards/generate/', {'max_cluster': 0}).status_code, 400)
+        self.assertEqual(self.client.get('/api/boards/generate/', {'top_nodes': 'none'}).status_code, 400)
+        self.assertEqual(self.client.get('/api/boards/generate/', {'layout': 'moon'}).status_code, 400)
+
+    def test_impossible_constraints_fail_fast(self):
+        start = time.perf_counter()
+        for params in ({'count': 1000, 'max_top_spread': 0}, {'count': 1000, 'max_top_spread': 0, 'format': 'ndjson'}):
+            response = self.client.get('/api/boards/generate/', params)
+            self.assertEqual(response.status_code, 400)
+            self.assertIn('too strict', response.json()['error'])
+        self.assertLess(time.perf_counter() - start, 10)
+
+    def test_generate_then_import(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'boards.txt')
+            call_command('generate_boards', '25', '--output', path, '--seed', '2', stderr=open(os.devnull, 'w'))
+            call_command('import_boards', path, stdout=open(os.devnull, 'w'))
+        self.assertEqual(Board.objects.count(), 25)
+
+
+def best_open_node(session):
+    scores = session.state()['scores']
+    return max((n for n, score in enumerate(scores) if score is not None), key=scores.__getitem__)
+
+
+class DraftSessionTests(TestCase):
+    def test_picks_carry_only_changes(self):
+        board_data = random_board(5)
+        session = SessionStore().create(board_data, players=2)
+        expected = calculate_node_scores(board_data)
+        scores = session.state()['scores']
+        expansion = session.state()['expansion']
+        self.assertEqual(scores, [expected[n]['score'] for n in range(NODE_COUNT)])
+
+        for _ in range(4):
+            event = session.pick(best_open_node(session))
+            for n in event['blocked']:
+                scores[n] = expansion[n] = None
+            for n, score in event['scores'].items():
+                scores[n] = score
+            for n, value in event['expansion'].items():
+                expansion[n] = value
+            self.assertEqual(scores, session.state()['scores'])
+            self.assertEqual(expansion, session.state()['expansion'])
+        self.assertTrue(event['complete'])
+        with self.assertRaises(ValueError):
+            session.pick(0)
+
+    def test_events_reach_subscribers(self):
+        session = SessionStore().create(random_board(6), players=3)
+        session.pick(0)
+
+        async def follow():
+            loop = asyncio.get_running_loop()
+            stream = session_events(session, after=0, keepalive=0.05)
+            chunks = [await anext(stream), await anext(stream)]
+            for _ in range(5):
+                await loop.run_in_executor(None, lambda: session.pick(best_open_node(session)))
+            return chunks + [chunk async for chunk in stream]
+
+        chunks = [chunk for chunk in asyncio.run(follow()) if not chunk.startswith(':')]
+        self.assertEqual([chunk.split('\n')[0] for chunk in chunks], [f'id: {v}' for v in range(1, 7)])
+        self.assertIn('"complete":true', chunks[-1])
+        self.assertEqual(session.subscribers, 0)
+
+    def test_session_api_and_snapshots(self):
+        board_data = random_board(7)
+        session_id = self.client.post('/api/drafts/', {'board_data': board_data, 'players': 2},
+                                      content_type='application/json').json()['session']['id']
+        pick = self.client.post(f'/api/drafts/{session_id}/picks/', {'node': 3, 'player': 1},
+                                content_type='application/json')
+        self.assertEqual(pick.status_code, 400)
+        pick = self.client.post(f'/api/drafts/{session_id}/picks/', {'node': 3, 'player': 0},
+                                content_type='application/json').json()
+        self.assertEqual(pick['event']['next_player'], 1)
+        self.assertEqual(self.client.get(f'/api/drafts/{session_id}/').json()['session']['picks'], [3])
+        self.assertEqual(self.client.get('/api/drafts/missing/').status_code, 404)
+
+        store = SessionStore(max_sessions=1, snapshots=True)
+        session = store.create(board_data, players=2)
+        store.pick(session, 3)
+        store.create(board_data)
+        restored = store.get(session.id)
+        self.assertIsNot(restored, session)
+        self.assertEqual(restored.state(), session.state())
+        self.assertEqual(DraftSnapshot.objects.get(session_id=session.id).picks, [3])
+
+
+class StaticAssetTests(SimpleTestCase):
+    def test_collected_assets_are_fingerprinted_and_precompressed(self):
+        with tempfile.TemporaryDirectory() as static_root, override_settings(STATIC_ROOT=static_root):
+            call_command('collectstatic', interactive=False, verbosity=0)
+            page = self.client.get('/').content.decode()
+            css_url = re.search(r'href="(/static/game/css/board\.\w+\.css)"', page).group(1)
+
+            response = self.client.get(css_url, HTTP_ACCEPT_ENCODING='gzip, deflate')
+            self.assertEqual(response['Content-Encoding'], 'gzip')
+            self.assertIn('immutable', response['Cache-Control'])
+            css = gzip.decompress(b''.join(response.streaming_content)).decode()
+            self.assertRegex(css, r'url\("\.\./images/forest\.\w+\.png"\)')
+
+            response = self.client.get('/static/game/css/board.css')
+            self.assertNotIn('Content-Encoding', response)
+            self.assertNotIn('immutable', response['Cache-Control'])
+            response.close()
+            self.assertEqual(self.client.get('/static/../manage.py').status_code, 404)
+
+    def test_page_links_plain_names_before_collectstatic(self):
+        with tempfile.TemporaryDirectory() as static_root, override_settings(STATIC_ROOT=static_root):
+            response = self.client.get('/')
+            self.assertEqual(response.status_code, 200)
+            self.assertContains(response, 'href="/static/game/css/board.css"')
+
+
+class GameLogAnalyticsTests(TestCase):
+    def write_log(self, lines):
+        fd, path = tempfile.mkstemp(suffix='.jsonl')
+        self.addCleanup(os.remove, path)
+        with os.fdopen(fd, 'w') as f:
+            f.write('\n'.join(lines) + '\n')
+        return path
+
+    def test_ingest_and_query(self):
+        board_data = random_board(5)
+        scores = calculate_node_scores(board_data)
+        picks = [0, 10, 20, 30, 40, 50, 44, 5]
+        games = [
+            {'game_id': 'g1', 'board': encode_board_code(board_data), 'picks': picks, 'final_vp': [10, 7, 6, 8]},
+            {'game_id': 'g2', 'board_data': board_data, 'picks': ' '.join(map(str, picks)), 'final_vp': '5;10;9;6'},
+        ]
+        path = self.write_log([json.dumps(game) for game in games] + ['not json', json.dumps(games[0])])
+        call_command('ingest_games', path, '--chunk-size', '2', stdout=open(os.devnull, 'w'),
+                     stderr=open(os.devnull, 'w'))
+        call_command('ingest_games', path, stdout=open(os.devnull, 'w'), stderr=open(os.devnull, 'w'))
+        self.assertEqual(Game.objects.count(), 2)
+        self.assertEqual(Placement.objects.count(), 16)
+
+        first = Placement.objects.get(game_id='g1', pick=0)
+        self.assertEqual((first.player, first.round, first.score, first.won), (0, 1, scores[0]['base'], True))
+
+        everything = self.client.get('/api/analytics/placements/').json()
+        self.assertEqual((everything['placements'], everything['wins']), (16, 4))
+        self.assertEqual(everything['mean_vp'], 7.625)
+
+        threshold = sorted(Placement.objects.values_list('score', flat=True))[8]
+        above = self.client.get('/api/analytics/placements/', {'min_score': threshold, 'round': 1}).json()
+        expected = Placement.objects.filter(score__gte=threshold, round=1)
+        self.assertEqual(above['placements'], expected.count())
+        self.assertEqual(above['wins'], expected.filter(won=True).count())
+
+        nodes = self.client.get('/api/analytics/nodes/', {'round': 2}).json()['nodes']
+        self.assertEqual(nodes['5'], {'placements': 2, 'wins': 1, 'win_rate': 0.5, 'mean_vp': 7.5})
+        self.assertEqual(self.client.get('/api/analytics/nodes/', {'round': 3}).status_code, 400)
+
+
+class ScoringWeightsTests(SimpleTestCase):
+    def setUp(self):
+        use_default_weights(self)
+        self.addCleanup(set_active_weights, None)
+        self.addCleanup(score_cache.clear)
+
+    def test_weights_round_trip(self):
+        weights = ScoringWeights.from_dict({'diversity_bonus': 4.0, 'resource_values': {'ore': 1.5}})
+        self.assertEqual(ScoringWeights.from_dict(weights.to_dict()), weights)
+        self.assertEqual(ScoringWeights.from_vector(weights.as_vector()), weights)
+        self.assertEqual(weights.resource_values[2], 1.5)
+        self.assertEqual(ScoringWeights.from_dict(DEFAULT_WEIGHTS.to_dict()).fingerprint, DEFAULT_WEIGHTS.fingerprint)
+        with self.assertRaises(ValueError):
+            ScoringWeights.from_dict({'bogus': 1})
+
+    def test_weights_per_call(self):
+        board_data = random_board(2)
+        doubled = ScoringWeights.from_dict({'diversity_bonus': 5.0})
+        default = rescore_nodes(board_data, ['brick'])
+        base = calculate_node_scores(board_data, fields=('base', 'resource_set'))
+        rescored = rescore_nodes(board_data, ['brick'], weights=doubled)
+        for i in range(NODE_COUNT):
+            new = len(set(base[i]['resource_set']) - {'brick'})
+            self.assertAlmostEqual(rescored[i], round(default[i] + 2.5 * new, 1), delta=0.11)
+
+        heavy = ScoringWeights.from_dict({'resource_values': {'sheep': 3.0}})
+        cached = rescore_nodes(board_data, [], cache=score_cache)
+        self.assertEqual(rescore_nodes(board_data, [], cache=score_cache, weights=heavy),
+                         rescore_nodes(board_data, [], weights=heavy))
+        self.assertEqual(rescore_nodes(board_data, [], cache=score_cache), cached)
+
+    def test_hot_load(self):
+        code = load_golden()[0]['code']
+        before = self.client.get(f'/api/scores/{code}/')
+        with tempfile.TemporaryDirectory() as tmp:
+            watcher = WeightsFile(os.path.join(tmp, 'weights.json'))
+            self.assertFalse(watcher.refresh(force=True))
+            write_weights_file(watcher.path, {'weights': {'port_increase': 2.0}})
+            self.assertTrue(watcher.refresh(force=True))
+            self.assertEqual(active_weights().port_increase, 2.0)
+            # A client revalidating its copy gets the new scores, not a 304
+            after = self.client.get(f'/api/scores/{code}/', HTTP_IF_NONE_MATCH=before['ETag'])
+            self.assertEqual(after.status_code, 200)
+            self.assertNotEqual(after['ETag'], before['ETag'])
+            self.assertNotEqual(after.json()['scores'], before.json()['scores'])
+            self.assertEqual(self.client.get('/api/weights/').json()['fingerprint'], active_weights().fingerprint)
+
+            os.remove(watcher.path)
+            self.assertTrue(watcher.refresh(force=True))
+            self.assertIs(active_weights(), DEFAULT_WEIGHTS)
+
+    def test_middleware_refreshes_in_async_mode(self):
+        async def get_response(request):
+            return request
+
+        middleware = ScoringWeightsMiddleware(get_response)
+        with mock.patch.object(weights_file, 'refresh') as refresh:
+            pending = middleware('request')
+            # The refresh runs in __acall__, once the request is awaited
+            refresh.assert_not_called()
+            self.assertEqual(asyncio.run(pending), 'request')
+        refresh.assert_called_once_with()
+
+    def test_tuner_recovers_weights(self):
+        true = ScoringWeights.from_dict({'diversity_bonus': 5.0})
+        games = [(random_board(seed), random.Random(seed).sample(range(NODE_COUNT), 8), [0] * 4) for seed in range(300)]
+        unlabelled = OutcomeDataset(games)
+        values = np.bincount(unlabelled.slot, weights=unlabelled.placement_scores(true)).reshape(-1, 4).tolist()
+        games = [(board, picks, [sorted(v).index(x) + 2 for x in v]) for (board, picks, _), v in zip(games, values)]
+        dataset = OutcomeDataset(games)
+        self.assertEqual(dataset.concordance(true), 1.0)
+
+        report = tune(dataset, 'coordinate', folds=2, params=('diversity_bonus',), steps=7)
+        self.assertEqual(report['weights']['diversity_bonus'], 5.0)
+        self.assertEqual(report['score'], 1.0)
+        self.assertLess(report['baseline_score'], 1.0)
+        self.assertEqual(report['cross_validation']['mean'], 1.0)
+
+
+class MetricsTests(SimpleTestCase):
+    def setUp(self):
+        metrics.histograms.clear()
+        metrics.configure(True)
+        self.addCleanup(metrics.configure, False)
+        self.addCleanup(metrics.histograms.clear)
+
+    def test_server_timing_and_histograms(self):
+        response = self.client.post('/api/calculate-scores/', json.dumps({'board_data': random_board(0)}),
+                                    content_type='application/json')
+        stages = [part.split(';')[0] for part in response['Server-Timing'].split(', ')]
+        self.assertEqual(stages, ['json', 'score', 'cells', 'describe', 'serialize', 'total'])
+
+        page = self.client.get('/api/metrics/').content.decode()
+        self.assertIn('settler_request_stage_seconds_count{view="get_node_scores",stage="describe"} 1', page)
+        self.assertIn('settler_request_stage_seconds_bucket{view="get_node_scores",stage="total",le="+Inf"} 1', page)
+        self.assertIn('settler_score_cache_hits', page)
+
+    def test_disabled_is_a_no_op(self):
+        metrics.configure(False)
+        response = self.client.post('/api/calculate-scores/', json.dumps({'board_data': random_board(0)}),
+                                    content_type='application/json')
+        self.assertNotIn('Server-Timing', response)
+        self.assertIs(metrics.stage('score'), metrics.stage('describe'))
+
+    def test_metrics_endpoint_is_local_only(self):
+        self.assertEqual(self.client.get('/api/metrics/', REMOTE_ADDR='203.0.113.9').status_code, 403)
+
+
+class BenchmarkTests(SimpleTestCase):
+    def test_compare_results_flags_regressions(self):
+        baseline = {'cases': {'a': {'median_us': 100.0}, 'b': {'median_us': 100.0}}}
+        current = {'cases': {'a': {'median_us': 110.0}, 'b': {'median_us': 200.0}, 'c': {'median_us': 5.0}}}
+        regressions = compare_results(current, baseline, threshold=1.25)
+        self.assertEqual([r['name'] for r in regressions], ['b'])
+        self.assertEqual(regressions[0]['ratio'], 2.0)
+
+    def test_benchmark_command_writes_results(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            output = os.path.join(tmp, 'results.json')
+            call_command('benchmark', 'rescore', '--repeat', '1', '--output', output, stdout=open(os.devnull, 'w'))
+            with open(output) as f:
+                results = json.load(f)
+        self.assertEqual(list(results['cases']), ['rescore'])
+        self.assertGreater(results['cases']['rescore']['median_us'], 0)
+
+    def test_warm_up_leaves_no_trace(self):
+        application = WSGIHandler()
+        self.assertGreater(warm_up(application, boards=2), 0)
+        self.assertEqual(score_cache.stats()['size'], 0)
+        self.assertEqual(score_cache.stats()['hits'], 0)
+        status, body = wsgi_request(application, 'GET', '/api/cache-stats/')
+        self.assertEqual(status, '200 OK')
+        self.assertEqual(json.loads(body)['misses'], 0)
+
+
+class LoadTestTests(LiveServerTestCase):
+    def test_draft_sessions_are_seeded_and_grow_player_resources(self):
+        requests = draft_session(3, players=4)
+        self.assertEqual(requests, draft_session(3, players=4))
+        self.assertEqual([r[0] for r in requests[:2]], ['page', 'board_scores'])
+        rescores = [json.loads(body)['player_resources'] for endpoint, _, _, body in requests if endpoint == 'rescore']
+        self.assertEqual(len(rescores), 8)
+        self.assertEqual(rescores[:4], [[]] * 4)
+        self.assertTrue(all(rescores[4:]))
+        self.assertEqual(len(json.loads(draft_session(3, players=6)[-1][3])['board_data']), 30)
+
+    def test_percentile(self):
+        ordered = list(range(1, 101))
+        self.assertEqual([percentile(ordered, q) for q in (50, 95, 99, 100)], [50, 95, 99, 100])
+        self.assertEqual(percentile([], 50), 0.0)
+
+    def test_replay_reports_every_endpoint(self):
+        report = run_load(self.live_server_url, sessions=3, concurrency=2)
+        self.assertEqual(report['total']['requests'], 3 * 10)
+        self.assertEqual(report['total']['errors'], 0)
+        self.assertEqual(report['endpoints']['rescore']['requests'], 24)
+        for result in report['endpoints'].values():
+            self.assertLessEqual(result['p50_ms'], result['p95_ms'])
+            self.assertLessEqual(result['p95_ms'], result['p99_ms'])
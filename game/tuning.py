@@ -0,0 +1,401 @@
+"""
+Fitting the scoring weights to historical outcomes, and hot-loading them.
+
+Every opening placement of every game is reduced once to the weight-free
+parts of its score: the (resource, dots) pairs of its three hexes, whether
+it has a port, whether it produces the port's resource and how many
+resources it adds to the player's first pick. Scoring a whole dataset under
+a candidate ScoringWeights is then one node_production() call plus a few
+array operations. That is what makes grid, random and coordinate-descent
+searches over thousands of candidates practical.
+
+The objective is VP concordance. Each player's opening value is the sum of
+their two placement scores. For every pair of players in a game with
+different final VP, a pair counts 1 when the player with the higher opening
+value also finished with more VP (0.5 on a tie). A score of 0.5 means the
+weights say nothing about who does well, and 1.0 means they always order
+the players correctly.
+
+Tuned weights are written as JSON (see write_weights_file). A server picks
+them up from SCORING_WEIGHTS_PATH without a restart: WeightsFile checks the
+file's mtime at most once a second and swaps the active weights.
+"""
+import itertools
+import json
+import logging
+import os
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timezone
+
+import numpy as np
+
+from .algorithm import (
+    DEFAULT_WEIGHTS, DESERT, NODE_HAS_PORT, NODE_HEX_INDEX, NODE_PORT_BITS, POPCOUNT, ROLL_DOTS_ARRAY,
+    WEIGHT_PARAMETERS, ScoringWeights, decode_board_code, encode_boards, node_resource_masks, node_production,
+    set_active_weights,
+)
+from .analytics import iter_game_logs, parse_game
+from .draft import ALL_RESOURCE_BITS, snake_order
+
+logger = logging.getLogger(__name__)
+
+# (low, high) range searched for every parameter
+SEARCH_SPACE = {
+    "brick": (0.5, 2.0),
+    "wood": (0.5, 2.0),
+    "ore": (0.5, 2.0),
+    "wheat": (0.5, 2.0),
+    "sheep": (0.5, 2.0),
+    "diversity_bonus": (0.0, 6.0),
+    "double_r_dim": (0.5, 1.0),
+    "triple_r_dim": (0.25, 1.0),
+    "port_increase": (0.0, 3.0),
+    "same_resource_bonus": (0.0, 3.0),
+}
+SEARCH_METHODS = ("grid", "random", "coordinate")
+OBJECTIVE = "vp_concordance"
+
+
+# --- Dataset ---
+
+def games_from_log(stream, log_format: str = "jsonl") -> tuple:
+    """([(board_data, picks, final_vp)], rejected line count) from a game log (see game.analytics)."""
+    games, rejected = [], 0
+    for _, record in iter_game_logs(stream, log_format):
+        try:
+            if isinstance(record, Exception):
+                raise record
+            _, board_data, picks, final_vp = parse_game(record)
+        except (ValueError, KeyError, TypeError):
+            rejected += 1
+            continue
+        games.append((board_data, picks, final_vp))
+    return games, rejected
+
+
+def games_from_database() -> list:
+    """[(board_data, picks, final_vp)] for every game ingested with `manage.py ingest_games`."""
+    from .models import Placement
+
+    games = []
+    rows = Placement.objects.order_by("game_id", "pick").values_list(
+        "game_id", "game__board_code", "game__players", "player", "node", "vp",
+    )
+    for _, group in itertools.groupby(rows.iterator(chunk_size=10000), key=lambda row: row[0]):
+        group = list(group)
+        final_vp = [0] * group[0][2]
+        for _, _, _, player, _, vp in group:
+            final_vp[player] = vp
+        games.append((decode_board_code(group[0][1]), [row[4] for row in group], final_vp))
+    return games
+
+
+class OutcomeDataset:
+    """
+    Weight-free placement features of a set of games, plus the (better,
+    worse) player pairs the objective is measured on.
+    """
+
+    def __init__(self, games: list):
+        resources, rolls = encode_boards([board_data for board_data, _, _ in games])
+        masks = node_resource_masks(resources).tolist()
+        padded_resources = np.pad(resources, ((0, 0), (0, 1)), constant_values=DESERT)
+        padded_dots = np.pad(ROLL_DOTS_ARRAY[rolls], ((0, 0), (0, 1)))
+
+        boards, nodes, new_resources, slots = [], [], [], []
+        better, worse, pair_games = [], [], []
+        slot_count = 0
+        for g, (_, picks, final_vp) in enumerate(games):
+            order = snake_order(len(final_vp))
+            game_slots, needs = {}, {}
+            for pick, node in enumerate(picks):
+                player = order[pick]
+                mask = masks[g][node]
+                if player not in needs:
+                    needs[player] = ALL_RESOURCE_BITS & ~mask if mask else 0
+                    new_resources.append(0)
+                    game_slots[player] = slot_count
+                    slot_count += 1
+                else:
+                    new_resources.append(int(POPCOUNT[mask & needs[player]]))
+                boards.append(g)
+                nodes.append(node)
+                slots.append(game_slots[player])
+            for a, b in itertools.permutations(game_slots, 2):
+                if final_vp[a] > final_vp[b]:
+                    better.append(game_slots[a])
+                    worse.append(game_slots[b])
+                    pair_games.append(g)
+
+        boards, nodes = np.array(boards, dtype=np.intp), np.array(nodes, dtype=np.intp)
+        hexes = NODE_HEX_INDEX[nodes]
+        self.games = len(games)
+        self.placements = len(nodes)
+        self.node_res = padded_resources[boards[:, None], hexes]
+        self.node_dots = padded_dots[boards[:, None], hexes]
+        self.has_port = NODE_HAS_PORT[nodes]
+        self.port_match = (np.array([masks[b][n] for b, n in zip(boards.tolist(), nodes.tolist())], dtype=np.int64)
+                           & NODE_PORT_BITS[nodes]) != 0
+        self.new_resources = np.array(new_resources, dtype=np.float64)
+        self.slot = np.array(slots, dtype=np.intp)
+        self.slots = slot_count
+        self.pair_better = np.array(better, dtype=np.intp)
+        self.pair_worse = np.array(worse, dtype=np.intp)
+        self.pair_game = np.array(pair_games, dtype=np.intp)
+
+    def placement_scores(self, weights: ScoringWeights) -> np.ndarray:
+        """Every placement's score as the draft tools would give it."""
+        return (node_production(self.node_res, self.node_dots, weights)
+                + self.has_port * weights.port_increase
+                + self.port_match * weights.same_resource_bonus
+                + self.new_resources * weights.diversity_bonus)
+
+    def concordance(self, weights: ScoringWeights, games: np.ndarray = None) -> float:
+        """
+        VP concordance of the opening values under `weights`, over all games
+        or only where the boolean (games,) mask `games` is set.
+        """
+        values = np.bincount(self.slot, weights=self.placement_scores(weights), minlength=self.slots)
+        better, worse = self.pair_better, self.pair_worse
+        if games is not None:
+            keep = games[self.pair_game]
+            better, worse = better[keep], worse[keep]
+        if not len(better):
+            return float("nan")
+        difference = values[better] - values[worse]
+        return float(((difference > 0) + 0.5 * (difference == 0)).mean())
+
+
+# --- Evaluation ---
+
+_worker_dataset = None
+
+
+def _init_worker(dataset: OutcomeDataset):
+    global _worker_dataset
+    _worker_dataset = dataset
+
+
+def _evaluate_chunk(vectors: list, games) -> list:
+    return [_worker_dataset.concordance(ScoringWeights.from_vector(v), games) for v in vectors]
+
+
+class Evaluator:
+    """
+    Scores batches of candidate weight vectors, fanned out over a process
+    pool when workers > 1. The dataset is sent to each worker once.
+    """
+
+    def __init__(self, dataset: OutcomeDataset, workers: int = 1):
+        self.dataset = dataset
+        self.workers = workers or os.cpu_count() or 1
+        self.evaluations = 0
+        self._pool = None
+        if self.workers > 1:
+            self._pool = ProcessPoolExecutor(self.workers, initializer=_init_worker, initargs=(dataset,))
+
+    def __call__(self, vectors: list, games: np.ndarray = None) -> list:
+        self.evaluations += len(vectors)
+        if self._pool is None or len(vectors) < 2:
+            return [self.dataset.concordance(ScoringWeights.from_vector(v), games) for v in vectors]
+        size = -(-len(vectors) // (self.workers * 4))
+        chunks = [vectors[i:i + size] for i in range(0, len(vectors), size)]
+        return [score for scores in self._pool.map(_evaluate_chunk, chunks, itertools.repeat(games))
+                for score in scores]
+
+    def close(self):
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
+
+
+# --- Search ---
+
+def _axis(name: str, steps: int) -> list:
+    low, high = SEARCH_SPACE[name]
+    return np.linspace(low, high, steps).round(4).tolist()
+
+
+def _best(candidates: list, scores: list) -> tuple:
+    index = max(range(len(candidates)), key=lambda i: (scores[i], -i))
+    return candidates[index], scores[index]
+
+
+def grid_search(evaluate, games, start: tuple, params: tuple, steps: int) -> tuple:
+    """Every combination of `steps` evenly spaced values of each parameter in `params`."""
+    positions = [WEIGHT_PARAMETERS.index(name) for name in params]
+    candidates = []
+    for values in itertools.product(*(_axis(name, steps) for name in params)):
+        vector = list(start)
+        for position, value in zip(positions, values):
+            vector[position] = value
+        candidates.append(tuple(vector))
+    return _best(candidates, evaluate(candidates, games))
+
+
+def random_search(evaluate, games, start: tuple, params: tuple, trials: int, seed: int = 0) -> tuple:
+    """`trials` uniform samples of the parameters in `params`; the start point is always a candidate."""
+    rng = np.random.default_rng(seed)
+    positions = [WEIGHT_PARAMETERS.index(name) for name in params]
+    candidates = [tuple(start)]
+    for _ in range(trials):
+        vector = list(start)
+        for position, name in zip(positions, params):
+            vector[position] = round(float(rng.uniform(*SEARCH_SPACE[name])), 4)
+        candidates.append(tuple(vector))
+    return _best(candidates, evaluate(candidates, games))
+
+
+def coordinate_search(evaluate, games, start: tuple, params: tuple, steps: int, rounds: int) -> tuple:
+    """
+    Line search over one parameter at a time (`steps` values across its
+    range, all scored in one batch), cycling through `params` until a full
+    round improves nothing or `rounds` is reached.
+    """
+    best = tuple(start)
+    best_score = evaluate([best], games)[0]
+    for _ in range(rounds):
+        improved = False
+        for name in params:
+            position = WEIGHT_PARAMETERS.index(name)
+            candidates = [best[:position] + (value,) + best[position + 1:] for value in _axis(name, steps)]
+            vector, score = _best(candidates, evaluate(candidates, games))
+            if score > best_score:
+                best, best_score, improved = vector, score, True
+        if not improved:
+            break
+    return best, best_score
+
+
+def search(evaluate, method: str, games=None, start: tuple = None, params: tuple = WEIGHT_PARAMETERS,
+           steps: int = 5, trials: int = 200, rounds: int = 3, seed: int = 0) -> tuple:
+    """(best weight vector, its score) for one search method over the games in the `games` mask."""
+    start = tuple(start or DEFAULT_WEIGHTS.as_vector())
+    if method == "grid":
+        return grid_search(evaluate, games, start, params, steps)
+    if method == "random":
+        return random_search(evaluate, games, start, params, trials, seed)
+    if method == "coordinate":
+        return coordinate_search(evaluate, games, start, params, steps, rounds)
+    raise ValueError(f"Unknown search method {method}")
+
+
+def tune(dataset: OutcomeDataset, method: str = "coordinate", folds: int = 5, workers: int = 1, seed: int = 0,
+         **options) -> dict:
+    """
+    Search for the best weights on every cross-validation training split,
+    score them on the held-out games, then search once more on all games.
+    Returns the report write_weights_file() stores.
+    """
+    evaluate = Evaluator(dataset, workers)
+    try:
+        fold_of = np.random.default_rng(seed).permutation(dataset.games) % folds if folds > 1 else None
+        held_out, baseline = [], []
+        for fold in range(folds if fold_of is not None else 0):
+            train, test = fold_of != fold, fold_of == fold
+            vector, _ = search(evaluate, method, train, seed=seed + fold, **options)
+            held_out.append(dataset.concordance(ScoringWeights.from_vector(vector), test))
+            baseline.append(dataset.concordance(DEFAULT_WEIGHTS, test))
+
+        vector, score = search(evaluate, method, seed=seed, **options)
+    finally:
+        evaluate.close()
+
+    weights = ScoringWeights.from_vector(vector)
+    return {
+        "weights": weights.to_dict(),
+        "fingerprint": weights.fingerprint,
+        "objective": OBJECTIVE,
+        "method": method,
+        "games": dataset.games,
+        "placements": dataset.placements,
+        "score": round(score, 6),
+        "baseline_score": round(dataset.concordance(DEFAULT_WEIGHTS), 6),
+        "cross_validation": {
+            "folds": len(held_out),
+            "scores": [round(s, 6) for s in held_out],
+            "mean": round(float(np.nanmean(held_out)), 6) if held_out else None,
+            "baseline_scores": [round(s, 6) for s in baseline],
+            "baseline_mean": round(float(np.nanmean(baseline)), 6) if baseline else None,
+        },
+        "evaluations": evaluate.evaluations,
+        "created_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+    }
+
+
+# --- Weights Files ---
+
+def write_weights_file(path, report: dict):
+    """Write a tune() report atomically, so a server polling the file never reads half of it."""
+    temporary = f"{path}.tmp"
+    with open(temporary, "w") as f:
+        json.dump(report, f, indent=2)
+    os.replace(temporary, path)
+
+
+def read_weights_file(path) -> ScoringWeights:
+    """ScoringWeights from a tune() report or a bare ScoringWeights.to_dict() object."""
+    with open(path) as f:
+        data = json.load(f)
+    return ScoringWeights.from_dict(data.get("weights", data))
+
+
+# Seconds between checks of the weights file
+WEIGHTS_POLL_INTERVAL = 1.0
+
+
+class WeightsFile:
+    """
+    Keeps the process's active weights in step with a JSON weights file.
+    refresh() is cheap enough to call on every request: it stats the file at
+    most once per `interval` and only parses it when it changed. A missing
+    file means DEFAULT_WEIGHTS; an unreadable one keeps the current weights.
+    """
+
+    def __init__(self, path=None, interval: float = WEIGHTS_POLL_INTERVAL):
+        self.path = path
+        self.interval = interval
+        self._signature = None
+        self._checked = None
+        self._lock = threading.Lock()
+
+    def configure(self, path):
+        with self._lock:
+            self.path = path
+            self._signature = None
+            self._checked = None
+
+    def refresh(self, force: bool = False) -> bool:
+        """Reload the weights if the file changed; returns whether they were swapped."""
+        if not self.path:
+            return False
+        now = time.monotonic()
+        if not force and self._checked is not None and now - self._checked < self.interval:
+            return False
+        if not self._lock.acquire(blocking=force):
+            return False  # Another thread is already checking
+        try:
+            self._checked = now
+            try:
+                stat = os.stat(self.path)
+                signature = (stat.st_mtime_ns, stat.st_size)
+            except FileNotFoundError:
+                signature = None
+            if signature == self._signature:
+                return False
+            try:
+                weights = read_weights_file(self.path) if signature else DEFAULT_WEIGHTS
+            except (OSError, ValueError, TypeError) as e:
+                logger.warning("Keeping the current scoring weights, %s is unreadable: %s", self.path, e)
+                return False
+            self._signature = signature
+            set_active_weights(weights)
+            logger.info("Scoring weights %s loaded from %s", weights.fingerprint, self.path)
+            return True
+        finally:
+            self._lock.release()
+
+
+weights_file = WeightsFile()
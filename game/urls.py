@@ -1,9 +1,32 @@
 
 
 from django.urls import path
-from . import views
+from . import async_views, views
 
 urlpatterns = [
     path('', views.catan_board, name='catan_board'),
     path('api/calculate-scores/', views.get_node_scores, name='get_node_scores'),
+    path('api/scores/<str:code>/', views.get_board_code_scores, name='get_board_code_scores'),
+    path('api/calculate-scores/batch/', views.get_batch_node_scores, name='get_batch_node_scores'),
+    path('api/draft/recommend/', views.get_draft_recommendation, name='get_draft_recommendation'),
+    path('api/draft/pairs/', views.get_pair_recommendations, name='get_pair_recommendations'),
+    path('api/drafts/', views.create_draft_session, name='create_draft_session'),
+    path('api/drafts/<str:session_id>/', views.get_draft_session, name='get_draft_session'),
+    path('api/drafts/<str:session_id>/picks/', views.make_draft_pick, name='make_draft_pick'),
+    path('api/drafts/<str:session_id>/events/', async_views.get_draft_session_events,
+         name='get_draft_session_events'),
+    path('api/simulate/', views.get_production_simulation, name='get_production_simulation'),
+    path('api/distribution/', views.get_production_distribution, name='get_production_distribution'),
+    path('api/boards/', views.board_library, name='board_library'),
+    path('api/boards/generate/', views.generate_fair_boards, name='generate_fair_boards'),
+    path('api/boards/<str:code>/', views.get_saved_board, name='get_saved_board'),
+    path('api/analytics/placements/', views.get_placement_outcomes, name='get_placement_outcomes'),
+    path('api/analytics/nodes/', views.get_node_outcomes, name='get_node_outcomes'),
+    path('api/cache-stats/', views.get_cache_stats, name='get_cache_stats'),
+    path('api/metrics/', views.get_metrics, name='get_metrics'),
+    path('api/weights/', views.get_scoring_weights, name='get_scoring_weights'),
+    path('api/async/calculate-scores/', async_views.get_node_scores, name='async_get_node_scores'),
+    path('api/async/calculate-scores/batch/', async_views.get_batch_node_scores, name='async_get_batch_node_scores'),
+    path('api/async/draft/recommend/', async_views.get_draft_recommendation, name='async_get_draft_recommendation'),
+    path('api/async/simulate/', async_views.get_production_simulation, name='async_get_production_simulation'),
 ]
\ No newline at end of file
@@ -1,33 +1,669 @@
 from django.shortcuts import render
-from django.http import JsonResponse
+from django.http import HttpResponse, JsonResponse, StreamingHttpResponse
+from django.conf import settings
 from django.views.decorators.csrf import csrf_exempt
+from django.views.decorators.http import condition
+from django.db.models import Sum
+import hashlib
 import json
-from .algorithm import calculate_node_scores
+import itertools
+from .algorithm import (
+    DEFAULT_WEIGHTS, DESERT, RESOURCES, active_weights, calculate_node_columns, calculate_node_scores,
+    decode_board_code, iter_batch_scores, needed_resource_bits, parse_fields, rescore_nodes, scoring_fingerprint,
+)
+from .cache import score_cache
+from .draft import DEFAULT_TOP_K, recommend_pairs, recommend_pick
+from .expansion import expansion_potential
+from .generator import FairnessConstraints, iter_generated_boards
+from .metrics import render_metrics, stage
+from .analytics import outcome_summary, score_bucket
+from .models import Board, NodeOutcome, ScoreOutcome
+from .probability import node_risk, node_set_distribution
+from .robber import robber_columns
+from .sessions import session_store
+from .simulation import DEFAULT_TURNS
+from .workers import PoolBusy, scoring_pool, simulation_task
 
 def catan_board(request):
     """View to render the Catan board interface"""
     return render(request, 'game/board.html')
 
+def _id_list(value):
+    """Sorted unique ints from a list or a comma-separated string (None stays None)."""
+    if isinstance(value, str):
+        value = [item for item in value.split(',') if item]
+    return None if value is None else tuple(sorted({int(item) for item in value}))
+
+def _flag(value):
+    return value not in (None, False, '', '0', 'false')
+
+def score_options(source):
+    """
+    Validated response options from a scoring request body or query string:
+    mode ("rescore"), fields (list or comma-separated), format ("columnar"),
+    variance, robber, blocked_hexes (hex ids), expansion and occupied (node
+    ids); id lists are lists or comma-separated. Raises ValueError for
+    unknown fields or formats.
+    """
+    response_format = source.get('format') or 'rows'
+    if response_format not in ('rows', 'columnar'):
+        raise ValueError(f'Unknown format {response_format}')
+    return {
+        'rescore': source.get('mode') == 'rescore',
+        'fields': parse_fields(source.get('fields')),
+        'columnar': response_format == 'columnar',
+        'variance': _flag(source.get('variance')),
+        'robber': _flag(source.get('robber')),
+        'blocked_hexes': _id_list(source.get('blocked_hexes')),
+        'expansion': _flag(source.get('expansion')),
+        'occupied': _id_list(source.get('occupied')) or (),
+    }
+
+def node_scores_payload(board_data, player_resources, options):
+    """Response body shared by get_node_scores and its GET and async twins."""
+    weights = active_weights()
+    if options['rescore']:
+        scores = rescore_nodes(board_data, player_resources, cache=score_cache, weights=weights)
+        return {'scores': scores, 'diversity_bonus': weights.diversity_bonus, 'success': True}
+
+    risks = node_risk(board_data) if options['variance'] else None
+    # Optional per-node columns beyond NODE_FIELDS
+    extra = {}
+    if options['robber'] or options['blocked_hexes'] is not None:
+        extra.update(robber_columns(board_data, player_resources, options['blocked_hexes'], weights))
+    if options['expansion']:
+        extra['expansion'] = expansion_potential(board_data, options['occupied'], score_cache, weights)
+
+    if options['columnar']:
+        columns = calculate_node_columns(board_data, player_resources, score_cache, options['fields'], weights)
+        if risks:
+            columns['variance'] = [variance for variance, _ in risks]
+            columns['risk'] = [risk for _, risk in risks]
+        columns.update(extra)
+        return {
+            'columns': columns,
+            'resource_bits': list(RESOURCES[:DESERT]),
+            'diversity_bonus': weights.diversity_bonus,
+            'success': True
+        }
+
+    scores = calculate_node_scores(board_data, player_resources, score_cache, options['fields'], weights)
+    if risks:
+        for node_id, (variance, risk) in enumerate(risks):
+            scores[node_id]['variance'] = variance
+            scores[node_id]['risk'] = risk
+    for field, values in extra.items():
+        for node_id, value in enumerate(values):
+            scores[node_id][field] = value
+    return {'scores': scores, 'diversity_bonus': weights.diversity_bonus, 'success': True}
+
 @csrf_exempt  # Temporary - add CSRF token handling in production
 def get_node_scores(request):
+    """
+    Score every node of one board.
+
+    Each node carries its player-independent "base" score and "resource_set",
+    so clients can apply diversity_bonus for any player_resources themselves.
+    With "mode": "rescore" only the scores for player_resources are returned,
+    reusing the cached base vector and skipping the description layer.
+    With "variance": true each node also gets the variance and risk of its
+    per-turn production. With "robber": true each node gets robber_loss, the
+    most a robber on one hex takes from its score, and robber_hex, that hex.
+    "blocked_hexes": [hex ids] adds blocked_score, the score while those
+    hexes are blocked. With "expansion": true each node gets its expansion
+    potential, the discounted score of the best spot it can build roads to,
+    given settlements on "occupied": [node ids].
+    "fields" limits each node to a subset of score, base, resource_set,
+    description and resources; the description layer only runs for the last
+    two. "format": "columnar" returns parallel per-node arrays instead, with
+    resource_set as bitmasks over "resource_bits".
+    """
     if request.method != 'POST':
         return JsonResponse({'error': 'POST required'}, status=405)
     
     try:
-        data = json.loads(request.body)
+        with stage('json'):
+            data = json.loads(request.body)
         board_data = data.get('board_data', [])
         
         if not board_data:
             return JsonResponse({'error': 'No board data provided'}, status=400)
         
-        scores = calculate_node_scores(board_data)
+        player_resources = data.get('player_resources') or []
+
+        try:
+            options = score_options(data)
+        except ValueError as e:
+            return JsonResponse({'error': str(e), 'success': False}, status=400)
+
+        payload = node_scores_payload(board_data, player_resources, options)
         
-        return JsonResponse({
-            'scores': scores,
-            'success': True
-        })
+        with stage('serialize'):
+            return JsonResponse(payload)
+    except ValueError as e:
+        return JsonResponse({'error': str(e), 'success': False}, status=400)
     except Exception as e:
         return JsonResponse({
             'error': str(e),
             'success': False
-        }, status=500)
\ No newline at end of file
+        }, status=500)
+
+def _board_code_player_resources(request):
+    return [r for r in request.GET.get('player_resources', '').split(',') if r]
+
+def _board_code_etag(request, code):
+    """Strong ETag from the code, the response options, the player's needed resources and the scoring weights."""
+    try:
+        options = score_options(request.GET)
+    except ValueError:
+        return None
+    needed = needed_resource_bits(_board_code_player_resources(request))
+    key = f'{scoring_fingerprint()}:{code}:{needed}:{sorted(options.items())}'
+    return hashlib.sha256(key.encode()).hexdigest()[:32]
+
+@condition(etag_func=_board_code_etag)
+def get_board_code_scores(request, code):
+    """
+    GET twin of get_node_scores for a board code (see algorithm.encode_board_code),
+    e.g. /api/scores/<code>/?player_resources=brick,wood&fields=score,base.
+    The other options (mode, fields, format, variance, robber, ...) work as
+    in the POST body. The response for a URL only changes with the scoring
+    weights, so it carries a strong ETag of them. Browsers and reverse
+    proxies may reuse it for SCORES_HTTP_MAX_AGE and must then revalidate,
+    which costs a 304 until the weights change.
+    """
+    if request.method not in ('GET', 'HEAD'):
+        return JsonResponse({'error': 'GET required'}, status=405)
+
+    try:
+        board_data = decode_board_code(code)
+        options = score_options(request.GET)
+    except ValueError as e:
+        return JsonResponse({'error': str(e), 'success': False}, status=400)
+
+    try:
+        payload = node_scores_payload(board_data, _board_code_player_resources(request), options)
+    except ValueError as e:
+        return JsonResponse({'error': str(e), 'success': False}, status=400)
+    except Exception as e:
+        return JsonResponse({'error': str(e), 'success': False}, status=500)
+
+    with stage('serialize'):
+        response = JsonResponse(payload)
+    response['Cache-Control'] = f'public, max-age={settings.SCORES_HTTP_MAX_AGE}, must-revalidate'
+    return response
+
+def iter_ndjson_boards(request):
+    """
+    Read one {board_data, player_resources} object per line without buffering
+    the body. A malformed line is passed on as its exception so it gets an
+    error row instead of aborting the stream.
+    """
+    for line in request:
+        if not line.strip():
+            continue
+        try:
+            yield json.loads(line)
+        except ValueError as e:
+            yield e
+
+def ndjson_score_row(index, scores, error):
+    """One NDJSON line of batch output."""
+    if error is None:
+        row = {'index': index, 'scores': scores}
+    else:
+        row = {'index': index, 'error': error}
+    return json.dumps(row, separators=(',', ':')) + '\n'
+
+def _stream_batch_scores(entries):
+    """Render iter_batch_scores() output as NDJSON lines."""
+    for index, scores, error in iter_batch_scores(entries):
+        yield ndjson_score_row(index, scores, error)
+
+@csrf_exempt  # Temporary - add CSRF token handling in production
+def get_batch_node_scores(request):
+    """
+    Score many boards in one request.
+
+    Accepts either a JSON body {"boards": [{board_data, player_resources}, ...]}
+    or an application/x-ndjson body with one such object per line, and streams
+    back one {"index", "scores"} (or {"index", "error"}) line per board.
+    """
+    if request.method != 'POST':
+        return JsonResponse({'error': 'POST required'}, status=405)
+
+    if request.content_type == 'application/x-ndjson':
+        entries = iter_ndjson_boards(request)
+    else:
+        try:
+            entries = json.loads(request.body).get('boards', [])
+        except Exception as e:
+            return JsonResponse({'error': str(e), 'success': False}, status=400)
+
+        if not entries:
+            return JsonResponse({'error': 'No boards provided'}, status=400)
+
+    return StreamingHttpResponse(_stream_batch_scores(entries), content_type='application/x-ndjson')
+
+# Upper bounds so one request cannot pin a worker indefinitely
+MAX_DRAFT_TIME_BUDGET_MS = 5000
+MAX_DRAFT_BEAM_WIDTH = 16
+
+def draft_arguments(data):
+    """recommend_pick() keyword arguments from a draft request, clamped to the limits above."""
+    time_budget_ms = min(int(data.get('time_budget_ms', 500)), MAX_DRAFT_TIME_BUDGET_MS)
+    beam_width = min(int(data.get('beam_width', 6)), MAX_DRAFT_BEAM_WIDTH)
+    return {
+        'picks': [int(node) for node in data.get('picks', [])],
+        'players': int(data.get('players', 4)),
+        'beam_width': max(beam_width, 1),
+        'time_budget': max(time_budget_ms, 1) / 1000,
+        'max_depth': int(data['depth']) if data.get('depth') else None,
+    }
+
+@csrf_exempt  # Temporary - add CSRF token handling in production
+def get_draft_recommendation(request):
+    """
+    Recommend the next pick of the snake draft.
+
+    Expects {board_data, players, picks: [node ids in draft order],
+    time_budget_ms, beam_width, depth} and returns the recommended node plus
+    the responses the search expects from the other players.
+    """
+    if request.method != 'POST':
+        return JsonResponse({'error': 'POST required'}, status=405)
+
+    try:
+        data = json.loads(request.body)
+        board_data = data.get('board_data', [])
+
+        if not board_data:
+            return JsonResponse({'error': 'No board data provided'}, status=400)
+
+        result = recommend_pick(board_data, cache=score_cache, **draft_arguments(data))
+    except ValueError as e:
+        return JsonResponse({'error': str(e), 'success': False}, status=400)
+    except Exception as e:
+        return JsonResponse({'error': str(e), 'success': False}, status=500)
+
+    result['success'] = True
+    return JsonResponse(result)
+
+@csrf_exempt  # Temporary - add CSRF token handling in production
+def get_pair_recommendations(request):
+    """
+    Rank the best legal settlement pairs for one player.
+
+    Expects {board_data, occupied: [node ids settled by anyone], first
+    (optional node id of the player's first settlement), top_k}.
+    """
+    if request.method != 'POST':
+        return JsonResponse({'error': 'POST required'}, status=405)
+
+    try:
+        data = json.loads(request.body)
+        board_data = data.get('board_data', [])
+
+        if not board_data:
+            return JsonResponse({'error': 'No board data provided'}, status=400)
+
+        first = data.get('first')
+        pairs = recommend_pairs(
+            board_data,
+            occupied=[int(node) for node in data.get('occupied', [])],
+            first=int(first) if first is not None else None,
+            top_k=max(int(data.get('top_k', DEFAULT_TOP_K)), 1),
+            cache=score_cache,
+        )
+    except ValueError as e:
+        return JsonResponse({'error': str(e), 'success': False}, status=400)
+    except Exception as e:
+        return JsonResponse({'error': str(e), 'success': False}, status=500)
+
+    return JsonResponse({'pairs': pairs, 'success': True})
+
+MAX_SIM_GAMES = 5000000
+MAX_SIM_TURNS = 200
+# games × turns for the sync endpoint, which holds a server thread meanwhile
+# (about a second per 6M rolls on one core)
+MAX_SYNC_SIM_ROLLS = 10000000
+
+def busy_response():
+    response = JsonResponse({'error': 'Scoring workers are busy, retry shortly', 'success': False}, status=503)
+    response['Retry-After'] = '1'
+    return response
+
+def simulation_arguments(data, max_rolls=None):
+    """
+    simulate_production() keyword arguments from a simulation request,
+    clamped to the limits above and, given max_rolls, to games × turns.
+    robber must be a JSON boolean.
+    """
+    turns = min(int(data.get('turns', DEFAULT_TURNS)), MAX_SIM_TURNS)
+    games = min(int(data.get('games', 100000)), MAX_SIM_GAMES)
+    if max_rolls is not None and turns > 0:
+        games = min(games, max_rolls // turns)
+    robber = data.get('robber', True)
+    if not isinstance(robber, bool):
+        raise ValueError('robber must be true or false')
+    return {'games': games, 'turns': turns, 'robber': robber, 'seed': data.get('seed')}
+
+@csrf_exempt  # Temporary - add CSRF token handling in production
+def get_production_simulation(request):
+    """
+    Monte Carlo production distribution for a set of settlements.
+
+    Expects {board_data, nodes: [node ids], games, turns, robber, seed} and
+    returns percentile summaries of resources per turn, turns until a city
+    is affordable and drought streaks. The run goes to the shared scoring
+    pool, capped at MAX_SYNC_SIM_ROLLS games × turns.
+    """
+    if request.method != 'POST':
+        return JsonResponse({'error': 'POST required'}, status=405)
+
+    try:
+        data = json.loads(request.body)
+        board_data = data.get('board_data', [])
+        nodes = [int(node) for node in data.get('nodes', [])]
+
+        if not board_data or not nodes:
+            return JsonResponse({'error': 'board_data and nodes are required'}, status=400)
+
+        summary = scoring_pool.call(simulation_task, board_data, nodes, simulation_arguments(data, MAX_SYNC_SIM_ROLLS))
+    except PoolBusy:
+        return busy_response()
+    except ValueError as e:
+        return JsonResponse({'error': str(e), 'success': False}, status=400)
+    except Exception as e:
+        return JsonResponse({'error': str(e), 'success': False}, status=500)
+
+    return JsonResponse({'simulation': summary, 'success': True})
+
+@csrf_exempt  # Temporary - add CSRF token handling in production
+def get_production_distribution(request):
+    """
+    Exact per-turn production distribution for a set of settlements.
+
+    Expects {board_data, nodes: [node ids], turns (optional)} and returns the
+    mean, variance and pmf of each resource and of the total.
+    """
+    if request.method != 'POST':
+        return JsonResponse({'error': 'POST required'}, status=405)
+
+    try:
+        data = json.loads(request.body)
+        board_data = data.get('board_data', [])
+        nodes = [int(node) for node in data.get('nodes', [])]
+
+        if not board_data or not nodes:
+            return JsonResponse({'error': 'board_data and nodes are required'}, status=400)
+
+        turns = data.get('turns')
+        if turns is not None:
+            turns = int(turns)
+            if turns < 1:
+                return JsonResponse({'error': 'turns must be at least 1', 'success': False}, status=400)
+            turns = min(turns, MAX_SIM_TURNS)
+        distribution = node_set_distribution(board_data, nodes, turns=turns)
+    except ValueError as e:
+        return JsonResponse({'error': str(e), 'success': False}, status=400)
+    except Exception as e:
+        return JsonResponse({'error': str(e), 'success': False}, status=500)
+
+    return JsonResponse({'distribution': distribution, 'success': True})
+
+def get_cache_stats(request):
+    """Hit/miss/eviction counters of the scoring cache"""
+    return JsonResponse(score_cache.stats())
+
+def get_metrics(request):
+    """Stage latency histograms and cache counters in the Prometheus text format"""
+    if request.META.get('REMOTE_ADDR') not in settings.METRICS_ALLOWED_IPS:
+        return JsonResponse({'error': 'Forbidden'}, status=403)
+
+    cache_stats = score_cache.stats()
+    gauges = {f'settler_score_cache_{key}': value for key, value in cache_stats.items()}
+    return HttpResponse(render_metrics(gauges), content_type='text/plain; version=0.0.4')
+
+def get_scoring_weights(request):
+    """The scoring weights this process is using, and where tuned weights are loaded from"""
+    weights = active_weights()
+    return JsonResponse({
+        'weights': weights.to_dict(),
+        'fingerprint': weights.fingerprint,
+        'source': settings.SCORING_WEIGHTS_PATH if weights != DEFAULT_WEIGHTS else None,
+    })
+
+MAX_BOARD_LIST = 100
+BOARD_ORDERINGS = ('max_production', '-max_production', 'resource_spread', '-resource_spread', '-created_at')
+
+@csrf_exempt  # Temporary - add CSRF token handling in production
+def board_library(request):
+    """
+    GET: list saved boards, e.g. ?order=-max_production&limit=20.
+    POST {board_data, name}: save a board with its precomputed scores.
+    """
+    if request.method == 'GET':
+        order = request.GET.get('order', '-created_at')
+        if order not in BOARD_ORDERINGS:
+            return JsonResponse({'error': f'order must be one of {", ".join(BOARD_ORDERINGS)}', 'success': False},
+                                status=400)
+        try:
+            limit = min(max(int(request.GET.get('limit', 20)), 1), MAX_BOARD_LIST)
+        except ValueError as e:
+            return JsonResponse({'error': str(e), 'success': False}, status=400)
+        boards = Board.objects.order_by(order).values('code', 'name', 'max_production', 'resource_spread')[:limit]
+        return JsonResponse({'boards': list(boards), 'success': True})
+
+    if request.method != 'POST':
+        return JsonResponse({'error': 'GET or POST required'}, status=405)
+
+    try:
+        data = json.loads(request.body)
+        board_data = data.get('board_data', [])
+
+        if not board_data:
+            return JsonResponse({'error': 'No board data provided'}, status=400)
+
+        board, created = Board.objects.save_board(board_data, name=data.get('name', ''), cache=score_cache)
+    except ValueError as e:
+        return JsonResponse({'error': str(e), 'success': False}, status=400)
+    except KeyError as e:
+        return JsonResponse({'error': f'Unknown resource {e.args[0]!r}', 'success': False}, status=400)
+    except (TypeError, AttributeError):
+        return JsonResponse({'error': 'board_data must be a list of hexes', 'success': False}, status=400)
+    except Exception as e:
+        return JsonResponse({'error': str(e), 'success': False}, status=500)
+
+    return JsonResponse({'code': board.code, 'created': created, 'success': True}, status=201 if created else 200)
+
+def get_saved_board(request, code):
+    """
+    A saved board by board code, in the orientation of that code (any
+    rotation or reflection of a saved board finds it). The stored node
+    vectors are returned as base scores and resource bitmasks, so loading
+    never rescores the board.
+    """
+    if request.method != 'GET':
+        return JsonResponse({'error': 'GET required'}, status=405)
+
+    try:
+        board_data = decode_board_code(code)
+    except ValueError as e:
+        return JsonResponse({'error': str(e), 'success': False}, status=400)
+
+    board, symmetry = Board.objects.find(board_data)
+    if board is None:
+        return JsonResponse({'error': 'Board not found', 'success': False}, status=404)
+
+    weights = active_weights()
+    base, masks = board.node_components(symmetry, weights)
+    return JsonResponse({
+        'code': board.code,
+        'name': board.name,
+        'board_data': board_data,
+        'columns': {'base': [round(score, 1) for score in base.tolist()], 'resource_set': masks.tolist()},
+        'resource_bits': list(RESOURCES[:DESERT]),
+        'diversity_bonus': weights.diversity_bonus,
+        'success': True
+    })
+
+MAX_GENERATED_BOARDS = 1000
+MAX_STREAMED_BOARDS = 100000
+# Candidate boards one request may build, whatever its count (about 30 s of work)
+MAX_GENERATE_CANDIDATES = 300000
+
+def _stream_generated_boards(boards):
+    """Render iter_generated_boards() output as NDJSON lines, ending in an error line if it gives up."""
+    try:
+        for board in boards:
+            yield json.dumps(board, separators=(',', ':')) + '\n'
+    except ValueError as e:
+        yield json.dumps({'error': str(e)}) + '\n'
+
+def generate_fair_boards(request):
+    """
+    Random boards that meet fairness constraints (see game.generator), e.g.
+    ?count=20&layout=expansion&seed=7&max_top_spread=1.5&no_adjacent_equal=1.
+    With format=ndjson, up to MAX_STREAMED_BOARDS boards are streamed one
+    {code, board_data} object per line. Constraints too strict to meet
+    within MAX_GENERATE_CANDIDATES candidates are answered with 400.
+    """
+    if request.method != 'GET':
+        return JsonResponse({'error': 'GET required'}, status=405)
+
+    try:
+        constraints = FairnessConstraints.from_dict(request.GET)
+        streamed = request.GET.get('format') == 'ndjson'
+        limit = MAX_STREAMED_BOARDS if streamed else MAX_GENERATED_BOARDS
+        count = min(max(int(request.GET.get('count', 1)), 1), limit)
+        seed = int(request.GET['seed']) if request.GET.get('seed') else None
+        boards = iter_generated_boards(count, request.GET.get('layout', 'standard'), constraints, seed,
+                                       max_candidates=MAX_GENERATE_CANDIDATES)
+        if streamed:
+            # The first board comes after the acceptance sample, so hopeless constraints fail here
+            boards = itertools.chain([next(boards)], boards)
+            return StreamingHttpResponse(_stream_generated_boards(boards), content_type='application/x-ndjson')
+        boards = list(boards)
+    except ValueError as e:
+        return JsonResponse({'error': str(e), 'success': False}, status=400)
+
+    return JsonResponse({'boards': boards, 'constraints': constraints.to_dict(), 'success': True})
+
+def _analytics_round(request):
+    """The ?round= filter (1 or 2), or None for both draft rounds"""
+    draft_round = request.GET.get('round')
+    if draft_round in (None, ''):
+        return None
+    if draft_round not in ('1', '2'):
+        raise ValueError('round must be 1 or 2')
+    return int(draft_round)
+
+def get_placement_outcomes(request):
+    """
+    Win rate and mean VP of ingested opening placements in a score range,
+    e.g. ?min_score=20&max_score=30&round=1 (bounds inclusive, both
+    optional). Answered from the per-score aggregates, not the raw logs.
+    """
+    if request.method != 'GET':
+        return JsonResponse({'error': 'GET required'}, status=405)
+
+    try:
+        draft_round = _analytics_round(request)
+        outcomes = ScoreOutcome.objects.all()
+        if draft_round is not None:
+            outcomes = outcomes.filter(round=draft_round)
+        if request.GET.get('min_score'):
+            outcomes = outcomes.filter(score_tenths__gte=score_bucket(float(request.GET['min_score'])))
+        if request.GET.get('max_score'):
+            outcomes = outcomes.filter(score_tenths__lte=score_bucket(float(request.GET['max_score'])))
+    except ValueError as e:
+        return JsonResponse({'error': str(e), 'success': False}, status=400)
+
+    totals = outcomes.aggregate(placements=Sum('placements'), wins=Sum('wins'), vp_total=Sum('vp_total'))
+    summary = outcome_summary(*(totals[key] or 0 for key in ('placements', 'wins', 'vp_total')))
+    return JsonResponse(dict(summary, success=True))
+
+def get_node_outcomes(request):
+    """Per-node win rate and mean VP of ingested opening placements, e.g. ?round=2"""
+    if request.method != 'GET':
+        return JsonResponse({'error': 'GET required'}, status=405)
+
+    try:
+        draft_round = _analytics_round(request)
+    except ValueError as e:
+        return JsonResponse({'error': str(e), 'success': False}, status=400)
+
+    outcomes = NodeOutcome.objects.all()
+    if draft_round is not None:
+        outcomes = outcomes.filter(round=draft_round)
+    rows = outcomes.values('node').annotate(placements=Sum('placements'), wins=Sum('wins'), vp_total=Sum('vp_total'))
+    nodes = {
+        row['node']: outcome_summary(row['placements'], row['wins'], row['vp_total'])
+        for row in rows.order_by('node')
+    }
+    return JsonResponse({'nodes': nodes, 'success': True})
+
+@csrf_exempt  # Temporary - add CSRF token handling in production
+def create_draft_session(request):
+    """
+    Start a multiplayer draft held on the server (see game.sessions).
+
+    Expects {board_data, players} and returns the session state, whose id
+    the participants share. Picks go to picks/ and arrive at every
+    participant through the events/ stream.
+    """
+    if request.method != 'POST':
+        return JsonResponse({'error': 'POST required'}, status=405)
+
+    try:
+        data = json.loads(request.body)
+        board_data = data.get('board_data', [])
+
+        if not board_data:
+            return JsonResponse({'error': 'No board data provided'}, status=400)
+
+        session = session_store.create(board_data, int(data.get('players', 4)))
+    except ValueError as e:
+        return JsonResponse({'error': str(e), 'success': False}, status=400)
+    except Exception as e:
+        return JsonResponse({'error': str(e), 'success': False}, status=500)
+
+    return JsonResponse({'session': session.state(), 'success': True}, status=201)
+
+def get_draft_session(request, session_id):
+    """The full state of a draft session, for a participant who joins or reloads."""
+    if request.method != 'GET':
+        return JsonResponse({'error': 'GET required'}, status=405)
+
+    session = session_store.get(session_id)
+    if session is None:
+        return JsonResponse({'error': 'Draft session not found', 'success': False}, status=404)
+
+    return JsonResponse({'session': session.state(), 'success': True})
+
+@csrf_exempt  # Temporary - add CSRF token handling in production
+def make_draft_pick(request, session_id):
+    """
+    Settle a node in a draft session. Expects {node, player} (player is
+    optional and checked against the turn order) and returns the event that
+    is pushed to every participant.
+    """
+    if request.method != 'POST':
+        return JsonResponse({'error': 'POST required'}, status=405)
+
+    session = session_store.get(session_id)
+    if session is None:
+        return JsonResponse({'error': 'Draft session not found', 'success': False}, status=404)
+
+    try:
+        data = json.loads(request.body)
+        if data.get('node') is None:
+            return JsonResponse({'error': 'node is required', 'success': False}, status=400)
+
+        player = data.get('player')
+        event = session_store.pick(session, int(data['node']), None if player is None else int(player))
+    except ValueError as e:
+        return JsonResponse({'error': str(e), 'success': False}, status=400)
+
+    return JsonResponse({'event': event, 'success': True})
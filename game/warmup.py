@@ -0,0 +1,84 @@
+"""
+Warm-up for freshly started API processes.
+
+The first scoring request in a process pays one-off costs: numpy's first
+calls, compiling the layout tables, filling the description memos and
+resolving the URLconf and middleware. warm_up() pays them at startup
+instead. It scores a few boards of every layout through the engine, then
+sends real requests through the WSGI application. Under gunicorn --preload
+this runs once in the master, and every worker forks with the result.
+
+The warm-up boards are then dropped from the score cache, and the counters
+and histograms are reset, so /api/cache-stats/ and /api/metrics/ only count
+real traffic.
+"""
+import io
+import json
+import time
+
+from django.conf import settings
+
+WARM_UP_BOARDS = 8
+
+
+def wsgi_request(application, method: str, path: str, body: bytes = b"", content_type: str = "application/json"):
+    """Call a WSGI application directly; returns (status line, body bytes)."""
+    hosts = [host for host in settings.ALLOWED_HOSTS if host not in ("*", "")]
+    path, _, query = path.partition("?")
+    environ = {
+        "REQUEST_METHOD": method,
+        "PATH_INFO": path,
+        "QUERY_STRING": query,
+        "SERVER_NAME": "localhost",
+        "SERVER_PORT": "80",
+        "SERVER_PROTOCOL": "HTTP/1.1",
+        "HTTP_HOST": hosts[0].lstrip(".") if hosts else "localhost",
+        "REMOTE_ADDR": "127.0.0.1",
+        "CONTENT_TYPE": content_type,
+        "CONTENT_LENGTH": str(len(body)),
+        "wsgi.input": io.BytesIO(body),
+        "wsgi.errors": io.StringIO(),
+        "wsgi.url_scheme": "http",
+        "wsgi.version": (1, 0),
+        "wsgi.multithread": False,
+        "wsgi.multiprocess": True,
+        "wsgi.run_once": False,
+    }
+    status = []
+    chunks = application(environ, lambda line, headers, exc_info=None: status.append(line))
+    try:
+        content = b"".join(chunks)
+    finally:
+        if hasattr(chunks, "close"):
+            chunks.close()
+    return status[0], content
+
+
+def warm_up(application=None, boards: int = WARM_UP_BOARDS) -> float:
+    """Pay the first-call costs now; returns the seconds it took."""
+    from . import metrics
+    from .algorithm import calculate_node_scores, encode_board_code, iter_batch_scores, rescore_nodes
+    from .benchmark import GOLDEN_PLAYER_RESOURCES, random_board
+    from .cache import score_cache
+    from .robber import hex_impact
+
+    start = time.perf_counter()
+    for seed in range(boards):
+        for expansion in (False, True):
+            board_data = random_board(seed, expansion)
+            calculate_node_scores(board_data, GOLDEN_PLAYER_RESOURCES, score_cache)
+            rescore_nodes(board_data, GOLDEN_PLAYER_RESOURCES, score_cache)
+            hex_impact(board_data)
+    entries = [{"board_data": random_board(seed)} for seed in range(boards)]
+    for _ in iter_batch_scores(entries):
+        pass
+
+    if application is not None:
+        board_data = random_board(0)
+        body = json.dumps({"board_data": board_data, "player_resources": GOLDEN_PLAYER_RESOURCES}).encode()
+        wsgi_request(application, "POST", "/api/calculate-scores/", body)
+        wsgi_request(application, "GET", f"/api/scores/{encode_board_code(board_data)}/")
+
+    score_cache.clear()
+    metrics.histograms.clear()
+    return time.perf_counter() - start
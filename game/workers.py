@@ -0,0 +1,133 @@
+"""
+Bounded process pool for the CPU-heavy work behind the async API.
+
+Batch scoring, draft search and simulation run in worker processes, so a slow
+request never blocks the event loop that serves cheap (cached) scoring. The
+pool admits at most SCORING_POOL_QUEUE requests at once. Past that, callers
+get PoolBusy and the view answers 503 instead of queueing without bound.
+"""
+import asyncio
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+from django.conf import settings
+
+from .algorithm import HEX_COUNT, iter_batch_scores, score_boards
+from .draft import recommend_pick
+from .simulation import simulate_production
+
+
+class PoolBusy(Exception):
+    """The pool already has its maximum number of requests in flight."""
+
+
+# --- Worker-side entry points (must be importable, picklable functions) ---
+
+def _warm_worker():
+    """Run one scoring pass at worker start so the first real task is not the slow one."""
+    score_boards(np.zeros((1, HEX_COUNT), dtype=np.int64), np.zeros((1, HEX_COUNT), dtype=np.int64))
+
+
+# Scoring tasks take the caller's ScoringWeights, so workers always score with
+# the weights the server had when the request came in.
+
+def batch_task(entries: list, weights) -> list:
+    """Score one chunk of batch entries; indices are relative to the chunk."""
+    return list(iter_batch_scores(entries, weights=weights))
+
+
+def draft_task(board_data, kwargs: dict, weights) -> dict:
+    return recommend_pick(board_data, weights=weights, **kwargs)
+
+
+def simulation_task(board_data, nodes: list, kwargs: dict) -> dict:
+    # Already inside a worker: don't fan out into a nested pool
+    return simulate_production(board_data, nodes, workers=1, **kwargs)
+
+
+# --- Event-loop side ---
+
+class Reservation:
+    """One claimed request slot; release() gives it back, and later calls do nothing."""
+
+    def __init__(self, pool):
+        self._pool = pool
+        self._released = False
+        self._lock = threading.Lock()
+
+    def release(self):
+        with self._lock:
+            if self._released:
+                return
+            self._released = True
+        self._pool.release()
+
+
+class ScoringPool:
+    def __init__(self, workers: int = None, max_pending: int = None):
+        self.workers = workers or os.cpu_count() or 1
+        self.max_pending = max_pending or self.workers * 2
+        self._executor = None
+        self._lock = threading.Lock()
+        self._pending = 0
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(max_workers=self.workers, initializer=_warm_worker)
+            return self._executor
+
+    def reserve(self):
+        """Claim a request slot, or raise PoolBusy when all are taken."""
+        with self._lock:
+            if self._pending >= self.max_pending:
+                raise PoolBusy()
+            self._pending += 1
+
+    def release(self):
+        with self._lock:
+            self._pending -= 1
+
+    def reservation(self) -> Reservation:
+        """reserve(), as a Reservation that is safe to release from several places."""
+        self.reserve()
+        return Reservation(self)
+
+    @property
+    def pending(self) -> int:
+        return self._pending
+
+    async def submit(self, func, *args):
+        """Run func(*args) in a worker process (the caller must hold a slot)."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._get_executor(), func, *args)
+
+    async def run(self, func, *args):
+        """Reserve a slot, run func(*args) in a worker and release the slot."""
+        self.reserve()
+        try:
+            return await self.submit(func, *args)
+        finally:
+            self.release()
+
+    def call(self, func, *args):
+        """run() for synchronous views: blocks the calling thread, not an event loop."""
+        self.reserve()
+        try:
+            return self._get_executor().submit(func, *args).result()
+        finally:
+            self.release()
+
+    def shutdown(self):
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=False, cancel_futures=True)
+                self._executor = None
+
+
+scoring_pool = ScoringPool(
+    workers=getattr(settings, "SCORING_POOL_WORKERS", None),
+    max_pending=getattr(settings, "SCORING_POOL_QUEUE", None),
+)